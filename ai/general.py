@@ -1,6 +1,8 @@
 # ai/general.py
 from core.map import Map
 from core.unit import Unit
+from core.lanchester import evaluate_engagement
+from core.rng import get_rng
 from typing import Optional
 import abc # (Utilisation de classes abstraites, sec 27)
 
@@ -11,9 +13,31 @@ class General(abc.ABC):
     """
     Classe de base abstraite pour une IA.
     """
+    # True si decide_actions fait jouer le moteur puis le restaure (general a
+    # recherche): il ne peut pas decider en meme temps qu'un autre general qui
+    # lit ce moteur (voir ai/parallel.py, mode "thread").
+    SIMULATES_ENGINE = False
+
     def __init__(self, army_id: int):
         self.army_id = army_id
+        # Source d'aleatoire du general (epsilon, dispersion...). Le moteur la
+        # remplace par un generateur derive de sa graine (Engine(seed=...)).
+        self.rng = get_rng("generals")
     
+    def bind_engine(self, engine) -> None:
+        """
+        Appele par le moteur a sa creation. Permet a un general de s'abonner
+        aux evenements (engine.add_listener) pour maintenir un etat incremental.
+        Par defaut: rien.
+        """
+
+    def should_decide(self, turn: int) -> bool:
+        """
+        Le moteur appelle decide_actions seulement si True; sinon il re-execute
+        les dernieres actions de ce general. Par defaut: decision a chaque tick.
+        """
+        return True
+
     @abc.abstractmethod
     def decide_actions(self, current_map: Map, my_units: list[Unit], enemy_units: list[Unit]) -> list[Action]:
         """Retourne une liste d'actions pour les unites."""
@@ -39,4 +63,11 @@ class General(abc.ABC):
                 min_dist_sq = dist_sq
                 closest_enemy = enemy
 
-        return closest_enemy
\ No newline at end of file
+        return closest_enemy
+
+    def estimate_engagement(self, my_units: list[Unit], enemy_units: list[Unit]) -> float:
+        """
+        Estimation rapide (modele de Lanchester) de l'issue d'un engagement.
+        Retourne un score dans [-1, 1], positif si favorable.
+        """
+        return evaluate_engagement(my_units, enemy_units)
@@ -1,9 +1,11 @@
 # ai/generals_impl.py
 from ai.general import General, Action
 from core.map import Map
-from core.unit import Unit
+from core.unit import Unit, UC_BUILDING
+from typing import Optional
 import random
 import math
+import time
 
 # IA de base
 class CaptainBRAINDEAD(General):
@@ -89,6 +91,15 @@ class ColonelKAISER(General):
         self.target_memory: dict[int, int] = {}
         self.waiting_units: set[int] = set()  # IDs des unités actuellement en attente
 
+    def snapshot_state(self):
+        """Etat interne pour Engine.snapshot/restore (recherche en avance)."""
+        return dict(self.target_memory), set(self.waiting_units)
+
+    def restore_state(self, state):
+        target_memory, waiting_units = state
+        self.target_memory = dict(target_memory)
+        self.waiting_units = set(waiting_units)
+
     def _is_unit_in_combat(self, unit: Unit, enemy_units: list[Unit]) -> bool:
         """Verifie si une unite est en combat."""
         for enemy in enemy_units:
@@ -268,4 +279,221 @@ class ColonelKAISER(General):
         pos_x = army_centroid[0] + (dir_x / dist) * (dist - self.RANGED_FORMATION_OFFSET)
         pos_y = army_centroid[1] + (dir_y / dist) * (dist - self.RANGED_FORMATION_OFFSET)
 
-        return (pos_x, pos_y)
\ No newline at end of file
+        return (pos_x, pos_y)
+
+class MarshalCARLO(General):
+    """
+    IA a recherche Monte-Carlo: au lieu de regles fixes, elle choisit un plan
+    d'escouade (engager, kiter, viser un batiment, se regrouper) en simulant
+    quelques secondes de bataille pour chaque plan candidat.
+
+    Tous les REPLAN_INTERVAL ticks, le moteur est capture (Engine.snapshot),
+    chaque simulation joue PLAN_HORIZON ticks headless (sans listeners, replay,
+    decideur parallele ni vue; l'adversaire est modelise par `opponent_model`),
+    le resultat est note puis l'etat est restaure (Engine.restore). Le plan a
+    simuler est choisi par UCB1, pour max_rollouts simulations.
+
+    Par defaut le nombre de simulations est fixe: avec Engine(seed=...), la
+    partie est reproductible quelle que soit la machine. time_budget (en
+    secondes) ajoute une limite de temps par decision, qui rend le nombre de
+    simulations dependant de la machine.
+    """
+    SIMULATES_ENGINE = True
+    PLANS = ("engage", "kite", "focus_building", "regroup")
+    REPLAN_INTERVAL = 15  # Ticks entre deux recherches (le plan choisi est garde entre-temps)
+    PLAN_HORIZON = 12  # Ticks simules par rollout
+    ROLLOUT_DT = 2 / 60.0  # dt d'un tick simule (celui de run_game par defaut)
+    UCB_EXPLORATION = 1.4
+    MELEE_ATTACK_RANGE = 2
+    KITING_RANGE_PERCENTAGE = 0.5
+    REGROUP_RADIUS = 4  # Les unites plus loin que ca du centre rejoignent le groupe
+    WIN_BONUS = 1.0
+
+    def __init__(self, army_id: int, time_budget: Optional[float] = None, max_rollouts: int = 16,
+                 opponent_model: type[General] = MajorDAFT):
+        super().__init__(army_id)
+        self.time_budget = time_budget
+        self.max_rollouts = max_rollouts
+        self.opponent_model = opponent_model
+        self.engine = None
+        self.plan: str = "engage"
+        self.plan_stats: dict[str, tuple[int, float]] = {}
+        self._next_search: int = 0
+        self._rollout_plan: Optional[str] = None
+        self._token = None
+
+    def bind_engine(self, engine) -> None:
+        self.engine = engine
+
+    def snapshot_state(self):
+        return self.plan, self._next_search
+
+    def restore_state(self, state):
+        self.plan, self._next_search = state
+
+    def decide_actions(self, current_map: Map, my_units: list[Unit], enemy_units: list[Unit]) -> list[Action]:
+        if not enemy_units or not my_units:
+            return []
+        if self._rollout_plan is not None:
+            # Pendant une simulation: appliquer le plan evalue, sans recherche
+            return self._plan_actions(self._rollout_plan, current_map, my_units, enemy_units)
+
+        engine = self.engine
+        if engine is not None and engine.turn_count >= self._next_search:
+            self.plan = self._search(engine)
+            self._next_search = engine.turn_count + self.REPLAN_INTERVAL
+        return self._plan_actions(self.plan, current_map, my_units, enemy_units)
+
+    # --- Recherche ---
+
+    def _search(self, engine) -> str:
+        """UCB1 sur les plans, chaque essai etant un rollout de PLAN_HORIZON ticks."""
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        stats = {plan: [0, 0.0] for plan in self.PLANS}
+        total = 0
+
+        self._token = engine.snapshot(self._token)
+        saved = (engine.listeners, engine.replay_recorder, engine.decider,
+                 getattr(engine, 'view_present', False), [army.general for army in engine.armies])
+        engine.listeners = []
+        engine.replay_recorder = None
+        engine.decider = None  # Les ticks simules decident sur place, pas via les workers
+        engine.view_present = False
+        for army in engine.armies:
+            if army.general is not self:
+                army.general = self.opponent_model(army.army_id)
+        try:
+            while total < self.max_rollouts:
+                plan = self._select_plan(stats, total)
+                value = self._rollout(engine, plan, deadline)
+                engine.restore(self._token)
+                if value is None:
+                    break  # Budget epuise en cours de simulation: essai ignore
+                stats[plan][0] += 1
+                stats[plan][1] += value
+                total += 1
+        finally:
+            self._rollout_plan = None
+            engine.listeners, engine.replay_recorder, engine.decider, engine.view_present, generals = saved
+            for army, general in zip(engine.armies, generals):
+                army.general = general
+
+        self.plan_stats = {plan: (n, w / n if n else 0.0) for plan, (n, w) in stats.items()}
+        if total == 0:
+            return self.plan
+        # Plan le plus visite (critere robuste), departage par la valeur moyenne
+        return max(self.PLANS, key=lambda p: (stats[p][0], self.plan_stats[p][1]))
+
+    def _select_plan(self, stats: dict, total: int) -> str:
+        untried = [plan for plan in self.PLANS if stats[plan][0] == 0]
+        if untried:
+            return self.rng.choice(untried)
+        log_total = math.log(total)
+        return max(self.PLANS, key=lambda p: stats[p][1] / stats[p][0]
+                   + self.UCB_EXPLORATION * math.sqrt(log_total / stats[p][0]))
+
+    def _rollout(self, engine, plan: str, deadline: Optional[float]) -> Optional[float]:
+        """Joue le plan PLAN_HORIZON ticks; valeur dans [0, 1], None si hors budget."""
+        # Unites presentes au depart: une unite tuee est retiree des armees en cours de simulation
+        start = [(u, u.current_hp, u.army_id == self.army_id) for u in engine.units_by_id.values()]
+        self._rollout_plan = plan
+        for _ in range(self.PLAN_HORIZON):
+            if deadline is not None and time.perf_counter() > deadline:
+                return None
+            if not engine.step(self.ROLLOUT_DT):
+                break
+        self._rollout_plan = None
+        return self._evaluate(engine, start)
+
+    def _evaluate(self, engine, start: list[tuple[Unit, int, bool]]) -> float:
+        """
+        Pertes relatives (HP perdus / HP max, moyennes par unite) de l'ennemi
+        moins les notres, sur les unites presentes au debut de la simulation
+        (unite, HP de depart, dans mon camp): une unite tuee (meme deja
+        retiree du moteur) ou convertie perd tous ses HP de depart. Chaque
+        batiment pese autant qu'une unite.
+        """
+        losses = {}
+        counts = {}
+        units_by_id = engine.units_by_id
+        for unit, before, side in start:
+            kept = (unit.is_alive and units_by_id.get(unit.unit_id) is unit
+                    and (unit.army_id == self.army_id) == side)
+            lost = before - max(0, unit.current_hp) if kept else before
+            losses[side] = losses.get(side, 0.0) + lost / unit.max_hp
+            counts[side] = counts.get(side, 0) + 1
+        enemy = losses.get(False, 0.0) / max(1, counts.get(False, 0))
+        mine = losses.get(True, 0.0) / max(1, counts.get(True, 0))
+        score = enemy - mine
+        if engine.game_over and engine.winner is not None:
+            score += self.WIN_BONUS if engine.winner == self.army_id else -self.WIN_BONUS
+        return (score + 1 + self.WIN_BONUS) / (2 * (1 + self.WIN_BONUS))
+
+    # --- Plans ---
+
+    def _plan_actions(self, plan: str, current_map: Map, my_units: list[Unit],
+                      enemy_units: list[Unit]) -> list[Action]:
+        if plan == "focus_building":
+            buildings = [e for e in enemy_units if UC_BUILDING in e.armor_classes]
+            if buildings:
+                return self._focus_actions(my_units, buildings)
+        elif plan == "kite":
+            return self._kite_actions(current_map, my_units, enemy_units)
+        elif plan == "regroup":
+            return self._regroup_actions(current_map, my_units, enemy_units)
+        return [self._engage(unit, current_map, enemy_units) for unit in my_units]
+
+    def _closest_visible(self, unit: Unit, current_map: Map, enemy_units: list[Unit]) -> Optional[Unit]:
+        nearby_enemies = [e for e in current_map.get_units_in_radius(unit.pos, unit.line_of_sight)
+                          if e.army_id != self.army_id]
+        return self.find_closest_enemy(unit, nearby_enemies or enemy_units)
+
+    def _engage(self, unit: Unit, current_map: Map, enemy_units: list[Unit],
+                target: Optional[Unit] = None) -> Action:
+        if target is None:
+            target = self._closest_visible(unit, current_map, enemy_units)
+        if target is None:
+            return ("move", unit.unit_id, unit.pos)
+        if unit.can_attack(target):
+            return ("attack", unit.unit_id, target.unit_id)
+        return ("move", unit.unit_id, target.pos)
+
+    def _focus_actions(self, my_units: list[Unit], buildings: list[Unit]) -> list[Action]:
+        """Toute l'escouade sur le batiment le plus proche de son centre."""
+        cx = sum(u.pos[0] for u in my_units) / len(my_units)
+        cy = sum(u.pos[1] for u in my_units) / len(my_units)
+        target = min(buildings, key=lambda b: (b.pos[0] - cx) ** 2 + (b.pos[1] - cy) ** 2)
+        return [("attack", u.unit_id, target.unit_id) if u.can_attack(target)
+                else ("move", u.unit_id, target.pos) for u in my_units]
+
+    def _kite_actions(self, current_map: Map, my_units: list[Unit], enemy_units: list[Unit]) -> list[Action]:
+        """Les tireurs reculent face a la melee trop proche; la melee engage."""
+        actions = []
+        for unit in my_units:
+            threat = self._closest_visible(unit, current_map, enemy_units)
+            if threat is not None and unit.attack_range > self.MELEE_ATTACK_RANGE:
+                dx = unit.pos[0] - threat.pos[0]
+                dy = unit.pos[1] - threat.pos[1]
+                dist = math.sqrt(dx * dx + dy * dy)
+                if dist < unit.attack_range * self.KITING_RANGE_PERCENTAGE and dist > 0:
+                    flee = (min(max(unit.pos[0] + dx / dist * unit.speed, 0), current_map.width - 1),
+                            min(max(unit.pos[1] + dy / dist * unit.speed, 0), current_map.height - 1))
+                    actions.append(("move", unit.unit_id, flee))
+                    continue
+            actions.append(self._engage(unit, current_map, enemy_units, threat))
+        return actions
+
+    def _regroup_actions(self, current_map: Map, my_units: list[Unit], enemy_units: list[Unit]) -> list[Action]:
+        """Les isoles rejoignent le centre du groupe; les autres ne tirent qu'a portee."""
+        cx = sum(u.pos[0] for u in my_units) / len(my_units)
+        cy = sum(u.pos[1] for u in my_units) / len(my_units)
+        radius_sq = self.REGROUP_RADIUS ** 2
+        actions = []
+        for unit in my_units:
+            if (unit.pos[0] - cx) ** 2 + (unit.pos[1] - cy) ** 2 > radius_sq:
+                actions.append(("move", unit.unit_id, (cx, cy)))
+                continue
+            target = self._closest_visible(unit, current_map, enemy_units)
+            if target is not None and unit.can_attack(target):
+                actions.append(("attack", unit.unit_id, target.unit_id))
+        return actions
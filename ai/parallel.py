@@ -0,0 +1,248 @@
+# ai/parallel.py
+"""
+Decisions des generaux en parallele (Engine.enable_parallel_decisions).
+
+Les deux generaux voient le meme monde d'avant-tick: leurs decide_actions
+sont independants et peuvent tourner en meme temps. Les listes d'actions
+sont toujours fusionnees dans l'ordre des armees (comme en sequentiel), la
+partie reste donc identique (meme flux de digests).
+
+Modes:
+    "thread"   un thread par armee, sur les objets du moteur (lecture
+               seule). Sans gain sous le GIL pour des generaux en pur
+               Python; utile pour des generaux qui relachent le GIL. Si un
+               general modifie le moteur pour decider (SIMULATES_ENGINE,
+               ex: MarshalCARLO), les armees decident l'une apres l'autre.
+    "process"  un processus par armee. Chaque tick, le moteur ecrit une
+               perception (positions, HP, vivants... en tableaux) dans une
+               memoire partagee; chaque worker recale sa copie miroir du
+               monde dessus et y fait decider son general.
+
+Limites du mode "process": le general du worker est une instance neuve de
+la meme classe (parametres par defaut, graine du moteur), il ne recoit pas
+les evenements du moteur (listeners) et n'est pas affecte par
+Engine.snapshot/restore.
+"""
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+
+class PerceptionSnapshot:
+    """
+    Perception immuable d'un tick dans un bloc de memoire partagee.
+
+    Le roster (unites des armees a la creation) est fige, indexe de 0 a N-1:
+        pos_x, pos_y, cooldown (f64) | hp, army_id, tile_slot (i64) | alive (i8)
+    plus l'ordre de units_by_id (`order`), l'ordre de chaque armee
+    (`members`) et l'en-tete (tick, temps, tailles). tile_slot est le rang de
+    l'unite dans sa tuile: les recherches de voisins des generaux parcourent
+    les tuiles dans cet ordre.
+    """
+
+    def __init__(self, size: int, army_count: int, name: Optional[str] = None):
+        self.size = size
+        self.army_count = army_count
+        n_float = 3 * size + 1
+        n_int = 4 * size + army_count * size + 2 + army_count
+        nbytes = 8 * (n_float + n_int) + size
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        buf = self.shm.buf
+        floats = buf[:8 * n_float].cast('d')
+        ints = buf[8 * n_float:8 * (n_float + n_int)].cast('q')
+        self.alive = buf[8 * (n_float + n_int):nbytes].cast('b')
+        self.pos_x = floats[:size]
+        self.pos_y = floats[size:2 * size]
+        self.cooldown = floats[2 * size:3 * size]
+        self.time_elapsed = floats[3 * size:]
+        self.hp = ints[:size]
+        self.army_id = ints[size:2 * size]
+        self.tile_slot = ints[2 * size:3 * size]
+        self.order = ints[3 * size:4 * size]
+        base = 4 * size
+        self.members = [ints[base + k * size:base + (k + 1) * size] for k in range(army_count)]
+        base += army_count * size
+        # En-tete: tick, nombre d'unites presentes, puis taille de chaque armee
+        self.header = ints[base:]
+        self._views = [floats, ints]
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def write(self, engine, roster: list, index: dict[int, int]) -> None:
+        """Cote moteur: ecrit l'etat du tick (index: id(unite) -> rang dans roster)."""
+        pos_x, pos_y, cooldown = self.pos_x, self.pos_y, self.cooldown
+        hp, army_id, alive, tile_slot = self.hp, self.army_id, self.alive, self.tile_slot
+        order = self.order
+        game_map = engine.map
+        seen = set()
+        count = 0
+        for unit in engine.units_by_id.values():
+            i = index[id(unit)]
+            order[count] = i
+            count += 1
+            tile = game_map.get_tile(int(unit.pos[0]), int(unit.pos[1]))
+            if tile is None:
+                tile_slot[i] = -1
+            elif id(tile) not in seen:
+                seen.add(id(tile))
+                for slot, other in enumerate(tile.units):
+                    tile_slot[index[id(other)]] = slot
+        for i, unit in enumerate(roster):
+            pos_x[i], pos_y[i] = unit.pos
+            cooldown[i] = unit.current_cooldown
+            hp[i] = unit.current_hp
+            army_id[i] = unit.army_id
+            alive[i] = unit.is_alive
+
+        header = self.header
+        header[0] = engine.turn_count
+        header[1] = count
+        for k, army in enumerate(engine.armies):
+            members = self.members[k]
+            for j, unit in enumerate(army.units):
+                members[j] = index[id(unit)]
+            header[2 + k] = len(army.units)
+        self.time_elapsed[0] = engine.time_elapsed
+
+    def apply(self, mirror, roster: list) -> None:
+        """Cote worker: recale le moteur miroir sur la perception."""
+        game_map = mirror.map
+        for unit in mirror.units_by_id.values():
+            tile = game_map.get_tile(int(unit.pos[0]), int(unit.pos[1]))
+            if tile is not None:
+                tile.units.clear()
+
+        for i, unit in enumerate(roster):
+            unit.pos = (self.pos_x[i], self.pos_y[i])
+            unit.current_cooldown = self.cooldown[i]
+            unit.current_hp = self.hp[i]
+            unit.army_id = self.army_id[i]
+            unit.is_alive = bool(self.alive[i])
+
+        header = self.header
+        units_by_id = {}
+        slots: dict[int, list] = {}
+        for i in self.order[:header[1]]:
+            unit = roster[i]
+            units_by_id[unit.unit_id] = unit
+            if self.tile_slot[i] >= 0:
+                tile = game_map.get_tile(int(unit.pos[0]), int(unit.pos[1]))
+                if tile is not None:
+                    slots.setdefault(id(tile), (tile, []))[1].append((self.tile_slot[i], unit))
+        mirror.units_by_id = units_by_id
+        for tile, entries in slots.values():
+            entries.sort(key=lambda entry: entry[0])
+            tile.units[:] = [unit for _, unit in entries]
+
+        for k, army in enumerate(mirror.armies):
+            army.units[:] = [roster[i] for i in self.members[k][:header[2 + k]]]
+        mirror.turn_count = header[0]
+        mirror.time_elapsed = self.time_elapsed[0]
+
+    def close(self, unlink: bool = False) -> None:
+        for view in (self.pos_x, self.pos_y, self.cooldown, self.time_elapsed, self.hp,
+                     self.army_id, self.tile_slot, self.order, self.header, self.alive, *self.members):
+            view.release()
+        for view in self._views:
+            view.release()
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _worker_main(conn, shm_name: str, size: int, state: dict, roster_ids: list[int], army_index: int):
+    """Boucle d'un worker: recale le miroir, fait decider son general, renvoie les actions."""
+    from engine import Engine
+
+    mirror = Engine.from_dict(state)
+    roster = [mirror.units_by_id[unit_id] for unit_id in roster_ids]
+    perception = PerceptionSnapshot(size, len(mirror.armies), name=shm_name)
+    army = mirror.armies[army_index]
+    try:
+        while conn.recv() is not None:
+            perception.apply(mirror, roster)
+            conn.send(mirror._army_actions(army))
+    except EOFError:
+        pass
+    finally:
+        perception.close()
+        conn.close()
+
+
+class ParallelDecider:
+    """Collecte des actions des armees en parallele (voir Engine._collect_actions)."""
+
+    def __init__(self, engine, mode: str = "process"):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Mode de decision inconnu: {mode} (attendu: thread, process)")
+        self.mode = mode
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._perception: Optional[PerceptionSnapshot] = None
+        self._workers: list = []
+        if mode == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=len(engine.armies))
+        else:
+            self._start_workers(engine)
+
+    def _start_workers(self, engine):
+        roster = self._roster = [unit for army in engine.armies for unit in army.units]
+        self._index = {id(unit): i for i, unit in enumerate(roster)}
+        self._perception = PerceptionSnapshot(len(roster), len(engine.armies))
+        state = engine.to_dict()
+        roster_ids = [unit.unit_id for unit in roster]
+        ctx = multiprocessing.get_context("spawn")
+        for army_index in range(len(engine.armies)):
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(target=_worker_main, daemon=True,
+                                  args=(child_conn, self._perception.name, len(roster),
+                                        state, roster_ids, army_index))
+            process.start()
+            child_conn.close()
+            self._workers.append((process, parent_conn))
+
+    def collect(self, engine) -> list:
+        """Actions de toutes les armees non vaincues, fusionnees dans l'ordre des armees."""
+        armies = [(k, army) for k, army in enumerate(engine.armies) if not army.is_defeated()]
+        if self.mode == "thread":
+            if any(getattr(army.general, 'SIMULATES_ENGINE', False) for _, army in armies):
+                # Simulations sur le moteur vivant: aucun autre general ne doit le lire pendant ce temps
+                results = [engine._army_actions(army) for _, army in armies]
+            else:
+                futures = [self._executor.submit(engine._army_actions, army) for _, army in armies]
+                results = [future.result() for future in futures]
+        else:
+            self._perception.write(engine, self._roster, self._index)
+            for k, _ in armies:
+                self._workers[k][1].send(engine.turn_count)
+            results = [self._workers[k][1].recv() for k, _ in armies]
+            for (_, army), actions in zip(armies, results):
+                engine._last_actions[army.army_id] = actions
+
+        all_actions = []
+        for actions in results:
+            all_actions.extend(actions)
+        return all_actions
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        for process, conn in self._workers:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+            conn.close()
+        self._workers = []
+        if self._perception is not None:
+            self._perception.close(unlink=True)
+            self._perception = None
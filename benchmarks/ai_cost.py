@@ -0,0 +1,237 @@
+# benchmarks/ai_cost.py
+"""
+Cout de decision de chaque general selon la taille des armees (commande
+`bench ai`).
+
+Pour chaque general et chaque taille d'armee, une bataille est figee (generee,
+ou tiree d'une sauvegarde/d'un scenario dont les armees sont tronquees a la
+taille voulue, apres `warmup` ticks eventuels), puis decide_actions est
+appele plusieurs fois sur exactement le meme etat: le moteur est restaure
+(Engine.snapshot/restore, etat du general compris) avant chaque appel.
+
+Mesures par point:
+    ms_per_decision, p99_ms   temps moyen et 99e centile d'un decide_actions
+    us_per_unit               temps moyen rapporte au nombre d'unites du general
+    actions                   actions emises par appel
+    map_queries               Map.get_units_in_radius + get_nearby_units par appel
+    closest_scans, scanned    appels a find_closest_enemy par appel, et
+                              ennemis parcourus par ces recherches lineaires
+
+Les requetes des ticks simules par un general a recherche (MarshalCARLO)
+comptent dans son cout. Generaux: ceux de GENERAL_CLASS_MAP, plus ceux de
+EXTRA_GENERALS (RLCommander, importe a la demande). L'armee adverse est
+toujours jouee par MajorDAFT.
+"""
+import sys
+import os
+import math
+import time
+import random
+import platform
+import importlib
+from datetime import datetime
+from typing import Callable, Optional
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(ROOT)
+
+from core.army import Army
+from core.map import Map
+from core.rng import seed_all
+from core.definitions import GENERAL_CLASS_MAP
+from engine import Engine
+
+DEFAULT_SEED = 1234
+DEFAULT_RESULTS = "benchmarks/ai_cost_results.json"
+SIZES = (10, 50, 100, 500, 1000, 5000)
+CALLS = 20
+MIN_CALLS = 3
+TIME_CAP = 10.0  # Secondes de decisions par point au-dela desquelles on arrete (apres MIN_CALLS)
+OPPONENT = "MajorDAFT"
+LOGIC_DT = 1 / 30.0
+MIX = {"Knight": 0.4, "Pikeman": 0.3, "Crossbowman": 0.3}
+
+# Generaux hors GENERAL_CLASS_MAP: nom -> (module, classe, arguments par armee)
+EXTRA_GENERALS: dict[str, tuple[str, str, Callable[[int], dict]]] = {
+    "RLCommander": ("rl_modules.commander", "RLCommander",
+                    lambda army_id: {"role_config": f"team{army_id + 1}", "learning": False}),
+}
+
+
+def available_generals() -> list[str]:
+    return list(GENERAL_CLASS_MAP) + list(EXTRA_GENERALS)
+
+
+def make_general(name: str, army_id: int):
+    """Instancie un general par son nom (GENERAL_CLASS_MAP ou EXTRA_GENERALS)."""
+    if name in GENERAL_CLASS_MAP:
+        return GENERAL_CLASS_MAP[name](army_id)
+    if name in EXTRA_GENERALS:
+        module, cls, kwargs = EXTRA_GENERALS[name]
+        return getattr(importlib.import_module(module), cls)(army_id, **kwargs(army_id))
+    raise ValueError(f"General inconnu: {name} (disponibles: {available_generals()})")
+
+
+def _mix_counts(size: int) -> dict[str, int]:
+    counts = {name: int(size * weight) for name, weight in MIX.items()}
+    counts[next(iter(MIX))] += size - sum(counts.values())
+    return counts
+
+
+def _generated(size: int, seed: int) -> tuple[Map, list, list]:
+    """Deux blocs de `size` unites face a face (meme placement que la suite)."""
+    from scripts.run_scenario import custom_battle_scenario
+    general = GENERAL_CLASS_MAP[OPPONENT]
+    side = int(2 * 2.5 * math.ceil(math.sqrt(2 * size))) + 30
+    army1, army2 = custom_battle_scenario(_mix_counts(size), _mix_counts(size), general, general,
+                                          (side, side), rng=random.Random(seed))
+    return Map(side, side), army1.units, army2.units
+
+
+def _from_source(path: str) -> tuple[Map, list, list]:
+    """Carte et unites d'une sauvegarde (.json, .bsav) ou d'un scenario (.scen, .bscen, .map)."""
+    if path.endswith((".json", ".bsav")):
+        from utils.serialization import load_game
+        engine = load_game(path)
+        return engine.map, engine.armies[0].units, engine.armies[1].units
+    from scripts.tournament import load_match
+    game_map, army1, army2 = load_match(path, OPPONENT, OPPONENT)
+    return game_map, army1.units, army2.units
+
+
+def frozen_battle(general_name: str, size: int, source: Optional[str] = None,
+                  seed: int = DEFAULT_SEED, warmup: int = 0) -> Optional[Engine]:
+    """
+    Moteur pret a mesurer: armee 0 jouee par `general_name`, armees d'au plus
+    `size` unites. None si la source a moins de `size` unites par armee.
+    """
+    seed_all(seed)
+    game_map, units1, units2 = _from_source(source) if source else _generated(size, seed)
+    if min(len(units1), len(units2)) < size:
+        return None
+    for unit in units1[size:] + units2[size:]:
+        game_map.remove_unit(unit)
+    engine = Engine(game_map,
+                    Army(0, list(units1[:size]), make_general(general_name, 0)),
+                    Army(1, list(units2[:size]), make_general(OPPONENT, 1)),
+                    seed=seed)
+    for _ in range(warmup):
+        if not engine.step(LOGIC_DT):
+            break
+    return engine
+
+
+def _instrument(engine: Engine, general) -> list:
+    """Compteurs [map_queries, closest_scans, scanned] sur la carte et le general (instances)."""
+    counts = [0, 0, 0]
+    game_map = engine.map
+    for method in ("get_units_in_radius", "get_nearby_units"):
+        query = getattr(game_map, method)
+
+        def counted(*args, query=query, **kwargs):
+            counts[0] += 1
+            return query(*args, **kwargs)
+        setattr(game_map, method, counted)
+
+    closest = general.find_closest_enemy
+
+    def counted_closest(unit, enemy_units):
+        counts[1] += 1
+        counts[2] += len(enemy_units)
+        return closest(unit, enemy_units)
+    general.find_closest_enemy = counted_closest
+    return counts
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    """Centile au rang le plus proche (valeurs deja triees)."""
+    return values[min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))]
+
+
+def measure(engine: Engine, calls: int = CALLS, time_cap: float = TIME_CAP) -> dict:
+    """Appelle decide_actions de l'armee 0 sur le meme etat, `calls` fois au plus."""
+    army = engine.armies[0]
+    general = army.general
+    counts = _instrument(engine, general)
+    my_units = [unit for unit in army.units if unit.is_alive]
+    enemy_units = engine.get_enemy_units(army.army_id)
+    token = engine.snapshot()
+
+    times, actions = [], 0
+    totals = [0, 0, 0]
+    while len(times) < calls and (len(times) < MIN_CALLS or sum(times) < time_cap * 1e9):
+        engine.restore(token)
+        counts[:] = [0, 0, 0]
+        start = time.perf_counter_ns()
+        emitted = general.decide_actions(engine.map, my_units, enemy_units)
+        times.append(time.perf_counter_ns() - start)
+        actions += len(emitted)
+        totals = [total + count for total, count in zip(totals, counts)]
+    engine.restore(token)
+
+    n = len(times)
+    mean_ms = sum(times) / n / 1e6
+    return {
+        "units": len(my_units),
+        "calls": n,
+        "ms_per_decision": round(mean_ms, 3),
+        "p99_ms": round(_percentile(sorted(times), 0.99) / 1e6, 3),
+        "us_per_unit": round(1000 * mean_ms / max(1, len(my_units)), 2),
+        "actions": round(actions / n, 1),
+        "map_queries": round(totals[0] / n, 1),
+        "closest_scans": round(totals[1] / n, 1),
+        "scanned": round(totals[2] / n, 1),
+    }
+
+
+def case_name(general: str, size: int) -> str:
+    return f"ai_{general}_{size}"
+
+
+def run_ai_cost(generals: Optional[list[str]] = None, sizes: tuple[int, ...] = SIZES,
+                source: Optional[str] = None, seed: int = DEFAULT_SEED, warmup: int = 0,
+                calls: int = CALLS, time_cap: float = TIME_CAP) -> dict:
+    """
+    Mesure chaque general a chaque taille. Resultats au format de
+    benchmarks/suite.py (comparables avec `bench compare`).
+    """
+    generals = generals or available_generals()
+    unknown = [name for name in generals if name not in GENERAL_CLASS_MAP and name not in EXTRA_GENERALS]
+    if unknown:
+        raise ValueError(f"Generaux inconnus: {unknown} (disponibles: {available_generals()})")
+
+    cases = {}
+    for name in generals:
+        for size in sizes:
+            print(f"  {name} x{size}... ", end="", flush=True)
+            engine = frozen_battle(name, size, source, seed, warmup)
+            if engine is None:
+                print("ignore (source trop petite)")
+                continue
+            metrics = measure(engine, calls, time_cap)
+            cases[case_name(name, size)] = {"general": name, "size": size, **metrics}
+            print(f"{metrics['ms_per_decision']} ms (p99 {metrics['p99_ms']}), "
+                  f"{metrics['map_queries']} requetes")
+
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "seed": seed,
+            "source": source,
+            "warmup": warmup,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "cases": cases,
+    }
+
+
+def format_ai_cost(results: dict) -> str:
+    lines = [f"{'general':<18}{'unites':>7}{'ms/dec':>10}{'p99 ms':>10}{'us/unite':>10}"
+             f"{'actions':>9}{'requetes':>10}{'scans':>8}{'parcourus':>12}"]
+    for metrics in results["cases"].values():
+        lines.append(f"{metrics['general']:<18}{metrics['units']:>7}{metrics['ms_per_decision']:>10.3f}"
+                     f"{metrics['p99_ms']:>10.3f}{metrics['us_per_unit']:>10.2f}{metrics['actions']:>9.1f}"
+                     f"{metrics['map_queries']:>10.1f}{metrics['closest_scans']:>8.1f}{metrics['scanned']:>12.1f}")
+    return "\n".join(lines)
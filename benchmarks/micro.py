@@ -0,0 +1,214 @@
+# benchmarks/micro.py
+"""
+Micro-benchmarks des requetes spatiales et des methodes chaudes des unites
+(commande `bench micro`).
+
+Chaque fonction est mesuree seule, hors bataille: une carte est remplie
+d'unites a positions aleatoires (graine fixe), puis la fonction est appelee
+sur une liste de requetes preparee a l'avance. Le temps retenu est le
+meilleur de plusieurs repetitions, en nanosecondes par appel (boucle
+d'appel comprise).
+
+Chaque benchmark fait varier un parametre a la fois autour d'un point de
+reference (courbe de passage a l'echelle):
+    density   unites par tuile
+    radius    rayon de recherche (tuiles)
+    size      cote de la carte (tuiles)
+
+Les resultats ont la meme forme que ceux de benchmarks/suite.py (cas ->
+metriques, metrique ns_per_call): `bench compare` les compare d'un commit
+a l'autre.
+"""
+import sys
+import os
+import gc
+import time
+import random
+import platform
+from datetime import datetime
+from typing import Callable, Optional
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(ROOT)
+
+from core.map import Map
+from core.definitions import GENERAL_CLASS_MAP, UNIT_CLASS_MAP
+
+DEFAULT_SEED = 1234
+DEFAULT_RESULTS = "benchmarks/micro_results.json"
+CALLS = 2000  # Requetes par repetition
+REPEATS = 5
+
+# Point de reference; chaque courbe fait varier un seul parametre
+REFERENCE = {"density": 0.2, "radius": 4.0, "size": 100}
+SWEEPS = {
+    "density": (0.05, 0.2, 0.5, 1.0, 2.0),
+    "radius": (1.0, 2.0, 4.0, 8.0, 16.0),
+    "size": (50, 100, 200, 400),
+}
+
+
+def _populate(size: int, density: float, rng: random.Random, army_count: int = 2) -> tuple[Map, list]:
+    """Carte size x size avec density unites par tuile (Knights), armees alternees."""
+    game_map = Map(size, size)
+    knight = UNIT_CLASS_MAP["Knight"]
+    units = []
+    for unit_id in range(max(1, int(size * size * density))):
+        unit = knight(unit_id, unit_id % army_count, (rng.uniform(0, size), rng.uniform(0, size)))
+        game_map.add_unit(unit)
+        units.append(unit)
+    return game_map, units
+
+
+def _time_calls(call: Callable, queries: list, repeats: int = REPEATS) -> float:
+    """
+    Meilleur temps par appel (ns) sur `repeats` passes de toutes les requetes,
+    ramasse-miettes coupe (comme timeit: les cartes peuplees sont de gros graphes).
+    """
+    best = float("inf")
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter_ns()
+            for args in queries:
+                call(*args)
+            best = min(best, (time.perf_counter_ns() - start) / len(queries))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best
+
+
+def bench_units_in_radius(size, density, radius, rng, calls) -> float:
+    game_map, _ = _populate(size, density, rng)
+    queries = [((rng.uniform(0, size), rng.uniform(0, size)), radius) for _ in range(calls)]
+    return _time_calls(game_map.get_units_in_radius, queries)
+
+
+def bench_nearby_units(size, density, radius, rng, calls) -> float:
+    game_map, units = _populate(size, density, rng)
+    queries = [(rng.choice(units), radius) for _ in range(calls)]
+    return _time_calls(game_map.get_nearby_units, queries)
+
+
+def bench_update_position(size, density, radius, rng, calls) -> float:
+    """Deplacements d'un pas de deplacement typique, aller puis retour (la carte reste stable)."""
+    game_map, units = _populate(size, density, rng)
+    step = 0.6  # ~ vitesse * dt de plusieurs ticks: une partie des pas change de tuile
+    queries = []
+    for unit in (rng.choice(units) for _ in range(calls // 2)):
+        x, y = unit.pos
+        moved = (min(size - 0.01, x + step), y)
+        queries.append((unit, (x, y), moved))
+        queries.append((unit, moved, (x, y)))
+    return _time_calls(game_map.update_unit_position, queries)
+
+
+def bench_can_attack(size, density, radius, rng, calls) -> float:
+    """Paires attaquant/cible voisines (environ la moitie a portee)."""
+    _, units = _populate(size, density, rng)
+    pairs = []
+    for _ in range(calls):
+        unit, other = rng.choice(units), rng.choice(units)
+        other.pos = (unit.pos[0] + rng.uniform(-2, 2), unit.pos[1] + rng.uniform(-2, 2))
+        pairs.append((unit, other))
+    return _time_calls(lambda unit, other: unit.can_attack(other), pairs)
+
+
+def bench_calculate_damage(size, density, radius, rng, calls) -> float:
+    """Toutes les paires de types d'unites de combat (bonus et armures varies)."""
+    types = [cls for name, cls in UNIT_CLASS_MAP.items() if name not in ("Castle", "Wonder")]
+    pairs = []
+    for _ in range(calls):
+        attacker = rng.choice(types)(0, 0, (0.0, 0.0))
+        target = rng.choice(types)(1, 1, (1.0, 0.0))
+        pairs.append((attacker, target))
+    return _time_calls(lambda attacker, target: attacker.calculate_damage(target), pairs)
+
+
+def bench_closest_enemy(size, density, radius, rng, calls) -> float:
+    """Recherche lineaire sur toute l'armee ennemie (density * size^2 / 2 unites)."""
+    _, units = _populate(size, density, rng)
+    general = GENERAL_CLASS_MAP["MajorDAFT"](0)
+    enemies = [unit for unit in units if unit.army_id == 1]
+    mine = [unit for unit in units if unit.army_id == 0] or units
+    # Cout proportionnel a la taille de l'armee ennemie: moins d'appels sur les grandes cartes
+    calls = max(20, min(calls, 2_000_000 // max(1, len(enemies))))
+    queries = [(rng.choice(mine), enemies) for _ in range(calls)]
+    return _time_calls(general.find_closest_enemy, queries)
+
+
+# nom -> (fonction, parametres qui influent sur son cout)
+BENCHES: dict[str, tuple[Callable, tuple[str, ...]]] = {
+    "map.get_units_in_radius": (bench_units_in_radius, ("density", "radius", "size")),
+    "map.get_nearby_units": (bench_nearby_units, ("density", "radius", "size")),
+    "map.update_unit_position": (bench_update_position, ("density", "size")),
+    "unit.can_attack": (bench_can_attack, ()),
+    "unit.calculate_damage": (bench_calculate_damage, ()),
+    "general.find_closest_enemy": (bench_closest_enemy, ("density", "size")),
+}
+
+
+def case_name(bench: str, param: Optional[str] = None, value=None) -> str:
+    return f"{bench}[{param}={value}]" if param else bench
+
+
+def run_micro(names: Optional[list[str]] = None, seed: int = DEFAULT_SEED, calls: int = CALLS) -> dict:
+    """
+    Joue les benchmarks demandes (tous par defaut), une courbe par parametre
+    pertinent. Retourne {"meta", "cases": {cas: {"ns_per_call": ...}},
+    "curves": {benchmark: {parametre: [[valeur, ns], ...]}}}.
+    """
+    names = names or list(BENCHES)
+    unknown = [name for name in names if name not in BENCHES]
+    if unknown:
+        raise ValueError(f"Benchmarks inconnus: {unknown} (disponibles: {list(BENCHES)})")
+
+    cases = {}
+    curves = {}
+    for name in names:
+        bench, params = BENCHES[name]
+        curves[name] = {}
+        points = [(param, value) for param in params for value in SWEEPS[param]] or [(None, None)]
+        for param, value in points:
+            settings = dict(REFERENCE)
+            if param:
+                settings[param] = value
+            # Meme graine par point: seul le parametre balaye change d'un point a l'autre
+            rng = random.Random(seed)
+            ns = bench(settings["size"], settings["density"], settings["radius"], rng, calls)
+            cases[case_name(name, param, value)] = {"ns_per_call": round(ns, 1)}
+            if param:
+                curves[name].setdefault(param, []).append([value, round(ns, 1)])
+
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "seed": seed,
+            "reference": REFERENCE,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "cases": cases,
+        "curves": curves,
+    }
+
+
+def format_micro(results: dict) -> str:
+    """Tableau par benchmark: ns/appel et facteur par rapport au premier point de chaque courbe."""
+    lines = []
+    for name in BENCHES:
+        curves = results["curves"].get(name)
+        if curves is None:
+            continue
+        if not curves:
+            lines.append(f"{name:<30}{results['cases'][name]['ns_per_call']:>12.1f} ns")
+            continue
+        lines.append(name)
+        for param, points in curves.items():
+            first = points[0][1] or 1.0
+            row = "  ".join(f"{value}: {ns:.0f} ns (x{ns / first:.2f})" for value, ns in points)
+            lines.append(f"  {param:<8}{row}")
+    return "\n".join(lines)
@@ -0,0 +1,317 @@
+# benchmarks/render.py
+"""
+Benchmark de rendu hors ecran (commande `bench render`).
+
+    pygame     PygameView sous le pilote video SDL "dummy" (aucune fenetre)
+    terminal   TerminalView sur un faux ecran curses (tampon en memoire)
+
+Les etats de bataille sont enregistres en jouant la partie (bataille
+generee, ou relecture d'un .replay): a chaque tick de STATE_TICKS, la
+partie est figee et la vue rend un parcours de camera fixe (ellipse autour
+du centre de la carte), pour chaque niveau de zoom (pygame) ou taille de
+terminal (terminal).
+
+Chaque frame reprend l'enchainement de display() sans les evenements ni la
+limitation a 60 FPS; les animations des unites avancent de 16 ms par frame
+(hors chronometre). Temps par phase: draw_map (effacement de l'ecran
+compris), draw_units, draw_ui, flip. Resultats au format de
+benchmarks/suite.py.
+"""
+import sys
+import os
+import gc
+import math
+import time
+import random
+import platform
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Optional
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(ROOT)
+
+from core.map import Map
+from core.rng import seed_all
+from core.definitions import GENERAL_CLASS_MAP
+from engine import Engine
+
+DEFAULT_SEED = 1234
+DEFAULT_RESULTS = "benchmarks/render_results.json"
+DEFAULT_UNITS = 1000
+STATE_TICKS = (0, 150, 300)
+FRAMES = 60  # Frames par parcours de camera
+ANIM_DELTA_MS = 16
+LOGIC_DT = 1 / 30.0
+PHASES = ("draw_map", "draw_units", "draw_ui", "flip")
+ZOOMS = (0.2, 0.5, 1.0, 2.0)
+TERMINAL_SIZES = ((80, 25), (160, 50), (240, 70))
+PERCENTILES = (50, 95, 99)
+
+
+# --- Etats de bataille ---
+
+def battle_states(units: int = DEFAULT_UNITS, replay: Optional[str] = None,
+                  seed: int = DEFAULT_SEED, ticks: tuple[int, ...] = STATE_TICKS):
+    """Genere (tick, moteur fige a ce tick): relecture d'un .replay ou bataille generee."""
+    if replay:
+        from core.replay import ReplayEngine
+        engine = ReplayEngine.load(replay)
+    else:
+        from scripts.run_scenario import custom_battle_scenario
+        seed_all(seed)
+        general = GENERAL_CLASS_MAP["MajorDAFT"]
+        per_army = max(1, units // 2)
+        side = int(2 * 2.5 * math.ceil(math.sqrt(2 * per_army))) + 30
+        comp = {"Knight": per_army - 2 * (per_army // 3), "Pikeman": per_army // 3, "Crossbowman": per_army // 3}
+        army1, army2 = custom_battle_scenario(comp, dict(comp), general, general, (side, side),
+                                              rng=random.Random(seed))
+        engine = Engine(Map(side, side), army1, army2, seed=seed)
+
+    for tick in ticks:
+        while engine.turn_count < tick and engine.step(LOGIC_DT):
+            pass
+        yield engine.turn_count, engine
+        if engine.game_over:
+            break
+
+
+def camera_path(width: int, height: int, frames: int = FRAMES) -> list[tuple[float, float]]:
+    """Ellipse autour du centre de la carte (coordonnees de grille), en `frames` points."""
+    cx, cy = width / 2, height / 2
+    return [(cx + 0.3 * width * math.cos(2 * math.pi * i / frames),
+             cy + 0.3 * height * math.sin(2 * math.pi * i / frames)) for i in range(frames)]
+
+
+def _animate(armies: list):
+    for army in armies:
+        for unit in army.units:
+            try:
+                unit.tick_animation(ANIM_DELTA_MS)
+            except Exception:
+                pass
+
+
+def _time_frame(phases: list, samples: list[list[int]]):
+    """Joue les phases d'un frame dans l'ordre; ajoute le temps de chacune a samples."""
+    for (_, draw), times in zip(phases, samples):
+        start = time.perf_counter_ns()
+        draw()
+        times.append(time.perf_counter_ns() - start)
+
+
+# --- Pygame (SDL dummy) ---
+
+def _pygame_view(engine: Engine):
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from view.gui_view import PygameView, BG_COLOR
+    view = PygameView(engine.map, engine.armies)
+    return pygame, view, BG_COLOR
+
+
+def bench_pygame(states, frames: int = FRAMES, zooms: tuple[float, ...] = ZOOMS) -> dict:
+    """{"z<zoom>": [temps par phase (ns), par frame]} sur tous les etats."""
+    samples = {}
+    pygame = view = None
+    for _, engine in states:
+        if view is None:
+            pygame, view, bg_color = _pygame_view(engine)
+        armies = engine.armies
+
+        def draw_map():
+            view.screen.fill(bg_color)
+            view.draw_map()
+        phases = [
+            ("draw_map", draw_map),
+            ("draw_units", lambda: view.draw_units(armies)),
+            ("draw_ui", lambda: view.draw_ui(engine.time_elapsed, False, armies, 1.0)),
+            ("flip", pygame.display.flip),
+        ]
+        for zoom in zooms:
+            view.zoom = zoom
+            view.update_zoom_metrics()
+            view._rescale_assets()
+            times = samples.setdefault(f"z{zoom}", [[] for _ in PHASES])
+            for gx, gy in camera_path(engine.map.width, engine.map.height, frames):
+                view._center_camera_on_grid(gx, gy)
+                _animate(armies)
+                _time_frame(phases, times)
+    if pygame is not None:
+        pygame.quit()
+    return samples
+
+
+# --- Terminal (faux ecran curses) ---
+
+class FakeCursesScreen:
+    """Ecran curses en memoire: addstr ecrit dans un tampon, refresh le serialise."""
+
+    def __init__(self, width: int, height: int):
+        self.width, self.height = width, height
+        self.clear()
+        self.frame = ""
+
+    def clear(self):
+        self.rows = [[" "] * self.width for _ in range(self.height)]
+
+    def getmaxyx(self) -> tuple[int, int]:
+        return self.height, self.width
+
+    def addstr(self, y: int, x: int, text: str, attr: int = 0):
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise ValueError(f"addstr hors ecran ({y}, {x})")  # comme curses.error
+        row = self.rows[y]
+        for i, char in enumerate(text[:self.width - x]):
+            row[x + i] = char
+
+    def refresh(self):
+        self.frame = "\n".join("".join(row) for row in self.rows)
+
+    def getch(self) -> int:
+        return -1
+
+    def nodelay(self, flag: bool):
+        pass
+
+    def keypad(self, flag: bool):
+        pass
+
+
+def _fake_curses(screen: FakeCursesScreen) -> SimpleNamespace:
+    def noop(*args):
+        pass
+    return SimpleNamespace(
+        initscr=lambda: screen, cbreak=noop, noecho=noop, echo=noop, nocbreak=noop, endwin=noop,
+        has_colors=lambda: True, start_color=noop, init_pair=noop, color_pair=lambda n: n << 8,
+        A_BOLD=1 << 21, COLOR_BLUE=4, COLOR_RED=1, COLOR_GREEN=2, COLOR_YELLOW=3, COLOR_WHITE=7,
+        COLOR_BLACK=0, KEY_UP=259, KEY_DOWN=258, KEY_LEFT=260, KEY_RIGHT=261,
+    )
+
+
+def _terminal_view(engine: Engine, screen: FakeCursesScreen):
+    """
+    TerminalView branchee sur le faux ecran (le vrai terminal n'est jamais
+    touche). Retourne (vue, restauration du module curses de la vue).
+    """
+    import view.terminal_view as terminal_view
+    saved = getattr(terminal_view, "curses", None), terminal_view.CURSES_AVAILABLE
+    terminal_view.curses, terminal_view.CURSES_AVAILABLE = _fake_curses(screen), True
+    try:
+        view = terminal_view.TerminalView(engine.map)
+    except Exception:
+        _restore_curses(terminal_view, saved)
+        raise
+    return view, lambda: _restore_curses(terminal_view, saved)
+
+
+def _restore_curses(module, saved):
+    curses, available = saved
+    if curses is not None:
+        module.curses = curses
+    else:
+        del module.curses
+    module.CURSES_AVAILABLE = available
+
+
+def bench_terminal(states, frames: int = FRAMES, sizes: tuple[tuple[int, int], ...] = TERMINAL_SIZES) -> dict:
+    """{"<largeur>x<hauteur>": [temps par phase (ns), par frame]} sur tous les etats."""
+    samples = {}
+    for _, engine in states:
+        armies = engine.armies
+        for width, height in sizes:
+            screen = FakeCursesScreen(width, height)
+            view, restore = _terminal_view(engine, screen)
+            try:
+                phases = [
+                    ("draw_map", view.draw_map),
+                    ("draw_units", lambda: view.draw_units(armies)),
+                    ("draw_ui", lambda: view.draw_ui(armies, engine.time_elapsed, False, 1.0)),
+                    ("flip", view.flip),
+                ]
+                times = samples.setdefault(f"{width}x{height}", [[] for _ in PHASES])
+                for gx, gy in camera_path(engine.map.width, engine.map.height, frames):
+                    # Camera centree sur (gx, gy): le coin haut-gauche de la zone visible
+                    view.scroll_x = max(0, int(gx - view.max_display_width / 2))
+                    view.scroll_y = max(0, int(gy - view.max_display_height / 2))
+                    _animate(armies)
+                    _time_frame(phases, times)
+            finally:
+                view.stdscr = None  # pas de _restore_terminal sur le faux ecran
+                restore()
+    return samples
+
+
+# --- Resultats ---
+
+def _percentile(values: list[int], p: int) -> float:
+    """Centile au rang le plus proche (valeurs deja triees)."""
+    return values[min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))]
+
+
+def summarize(times: list[list[int]]) -> dict:
+    """Centiles (ms) de chaque phase et du frame complet, et FPS moyen."""
+    frame = sorted(sum(parts) for parts in zip(*times))
+    metrics = {"frames": len(frame)}
+    for p in PERCENTILES:
+        metrics[f"frame_ms_p{p}"] = round(_percentile(frame, p) / 1e6, 3)
+    metrics["fps"] = round(1e9 * len(frame) / sum(frame), 1) if sum(frame) else 0.0
+    for name, phase in zip(PHASES, times):
+        ordered = sorted(phase)
+        for p in PERCENTILES:
+            metrics[f"{name}_ms_p{p}"] = round(_percentile(ordered, p) / 1e6, 3)
+    return metrics
+
+
+def run_render(views: tuple[str, ...] = ("pygame", "terminal"), units: int = DEFAULT_UNITS,
+               replay: Optional[str] = None, seed: int = DEFAULT_SEED, frames: int = FRAMES) -> dict:
+    """Joue les benchmarks de rendu demandes. Une vue indisponible (pygame absent) est ignoree."""
+    runners = {"pygame": bench_pygame, "terminal": bench_terminal}
+    unknown = [view for view in views if view not in runners]
+    if unknown:
+        raise ValueError(f"Vues inconnues: {unknown} (disponibles: {list(runners)})")
+
+    cases = {}
+    skipped = {}
+    for view in views:
+        print(f"  {view}... ", end="", flush=True)
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            samples = runners[view](battle_states(units, replay, seed), frames)
+        except ImportError as e:
+            skipped[view] = str(e)
+            print(f"ignore ({e})")
+            continue
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        for setting, times in samples.items():
+            cases[f"render_{view}_{setting}"] = summarize(times)
+        print(", ".join(f"{setting}: {cases[f'render_{view}_{setting}']['fps']} FPS" for setting in samples))
+
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "seed": seed,
+            "units": units,
+            "replay": replay,
+            "state_ticks": list(STATE_TICKS),
+            "skipped": skipped,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "cases": cases,
+    }
+
+
+def format_render(results: dict) -> str:
+    lines = [f"{'cas':<26}{'FPS':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+             + "".join(f"{name + ' p95':>16}" for name in PHASES)]
+    for case, metrics in results["cases"].items():
+        lines.append(f"{case:<26}{metrics['fps']:>8.1f}{metrics['frame_ms_p50']:>9.3f}"
+                     f"{metrics['frame_ms_p95']:>9.3f}{metrics['frame_ms_p99']:>9.3f}"
+                     + "".join(f"{metrics[name + '_ms_p95']:>16.3f}" for name in PHASES))
+    return "\n".join(lines)
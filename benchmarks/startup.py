@@ -0,0 +1,99 @@
+# benchmarks/startup.py
+"""
+Budget de demarrage des commandes headless (commande `bench startup`).
+
+main.py est reimporte par chaque processus lance en "spawn" (pool du
+tournoi, workers d'entrainement, benchmarks isoles): tout ce qu'il importe
+au niveau module se paie une fois par processus. Pour chaque cible, on
+mesure dans un interpreteur neuf (`python -X importtime`) le cout
+d'import de main.py et des modules de la commande, hors modules deja
+charges par le demarrage de Python lui-meme, et on verifie qu'aucun module
+d'affichage n'est charge.
+
+Une cible echoue si son temps (meilleur de REPEATS) depasse son budget, ou
+si un module de FORBIDDEN est importe.
+"""
+import sys
+import os
+import subprocess
+from typing import Optional
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+REPEATS = 5
+# Modules d'affichage/trace: jamais importes par une commande headless
+FORBIDDEN = ("pygame", "PIL", "curses", "_curses", "matplotlib", "view")
+
+# cible -> (modules importes, budget en ms)
+TARGETS: dict[str, tuple[tuple[str, ...], float]] = {
+    "main": (("main",), 100.0),
+    "tourney": (("main", "scripts.tournament"), 100.0),
+    "train": (("main", "rl_modules.trainer", "scripts.distributed"), 150.0),
+    "bench": (("main", "benchmarks.suite"), 150.0),
+}
+
+
+def _importtime(code: str) -> list[tuple[int, int, str]]:
+    """Lignes de `python -X importtime -c code`: (self us, cumulatif us, module indente)."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(own), int(cumulative), name.rstrip()[1:]))
+    return rows
+
+
+def measure_target(modules: tuple[str, ...], baseline: set[str]) -> dict:
+    """Meilleur temps d'import (ms) sur REPEATS interpreteurs neufs, et modules charges."""
+    code = "; ".join(f"import {module}" for module in modules)
+    best, loaded = None, set()
+    for _ in range(REPEATS):
+        rows = _importtime(code)
+        # Lignes de premier niveau (non indentees), hors demarrage de l'interpreteur
+        total = sum(cumulative for _, cumulative, name in rows
+                    if not name.startswith(" ") and name not in baseline)
+        best = total if best is None else min(best, total)
+        loaded = {name.strip() for _, _, name in rows}
+    forbidden = sorted(name for name in loaded if name.split(".")[0] in FORBIDDEN)
+    heaviest = sorted(((cumulative, name.strip()) for _, cumulative, name in rows
+                       if name.strip() not in baseline and name.count(" ") <= 2), reverse=True)[:5]
+    return {
+        "import_ms": round(best / 1000, 1),
+        "modules": len(loaded - baseline),
+        "forbidden": forbidden,
+        "heaviest": [[name, round(cumulative / 1000, 1)] for cumulative, name in heaviest],
+    }
+
+
+def run_startup(targets: Optional[list[str]] = None, scale: float = 1.0) -> dict:
+    """Mesure les cibles demandees (toutes par defaut). scale: multiplie les budgets."""
+    targets = targets or list(TARGETS)
+    unknown = [name for name in targets if name not in TARGETS]
+    if unknown:
+        raise ValueError(f"Cibles inconnues: {unknown} (disponibles: {list(TARGETS)})")
+
+    baseline = {name.strip() for _, _, name in _importtime("pass")}
+    cases = {}
+    for name in targets:
+        modules, budget = TARGETS[name]
+        metrics = measure_target(modules, baseline)
+        metrics["budget_ms"] = round(budget * scale, 1)
+        metrics["ok"] = not metrics["forbidden"] and metrics["import_ms"] <= metrics["budget_ms"]
+        cases[name] = metrics
+    return {"cases": cases}
+
+
+def format_startup(results: dict) -> str:
+    lines = [f"{'cible':<10}{'import ms':>11}{'budget':>9}{'modules':>9}  statut"]
+    for name, metrics in results["cases"].items():
+        if metrics["forbidden"]:
+            status = f"ECHEC (import de {', '.join(metrics['forbidden'])})"
+        else:
+            status = "OK" if metrics["ok"] else "ECHEC (budget depasse)"
+        lines.append(f"{name:<10}{metrics['import_ms']:>11.1f}{metrics['budget_ms']:>9.1f}"
+                     f"{metrics['modules']:>9}  {status}")
+        lines.append("          " + ", ".join(f"{module} {ms} ms" for module, ms in metrics["heaviest"]))
+    return "\n".join(lines)
@@ -0,0 +1,283 @@
+# benchmarks/suite.py
+"""
+Suite de benchmarks du moteur (commande `bench`).
+
+Chaque cas est une bataille headless sur une graine fixe, jouee pendant un
+nombre de ticks fixe (les batailles ne vont pas forcement a leur terme: on
+mesure le debit, pas l'issue). Metriques par cas:
+    ticks_per_sec          debit de la simulation (plus haut = mieux)
+    ms_per_decision        temps moyen d'un appel decide_actions
+    peak_rss_mb            pic de memoire residente du processus du cas
+    alloc_kb_per_tick      pic d'allocation transitoire par tick (tracemalloc,
+                           mesure sur une fenetre separee, hors chronometre)
+
+Chaque cas tourne dans un processus neuf (pic RSS propre au cas). Les
+resultats sont ecrits en JSON; `bench compare` echoue si une metrique se
+degrade de plus du seuil par rapport a une reference.
+"""
+import sys
+import os
+import json
+import math
+import time
+import platform
+import tempfile
+import tracemalloc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Optional
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(ROOT)
+
+from core.map import Map
+from core.rng import seed_all
+from core.definitions import GENERAL_CLASS_MAP
+from engine import Engine
+
+DEFAULT_SEED = 1234
+DEFAULT_RESULTS = "benchmarks/results.json"
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+DEFAULT_THRESHOLD = 0.10
+LOGIC_DT = 1 / 30.0
+ALLOC_TICKS = 10  # Fenetre tracemalloc (au plus un quart des ticks du cas)
+
+# Sens de chaque metrique: +1 plus haut = mieux, -1 plus bas = mieux
+METRICS = {
+    "ticks_per_sec": 1,
+    "ms_per_decision": -1,
+    "peak_rss_mb": -1,
+    "alloc_kb_per_tick": -1,
+    "ns_per_call": -1,  # benchmarks/micro.py
+    "frame_ms_p95": -1,  # benchmarks/render.py
+}
+
+
+def _scenario(path: str, p0: str = "MajorDAFT", p1: str = "MajorDAFT") -> Callable:
+    def build(seed: int) -> Engine:
+        from scripts.tournament import load_match
+        seed_all(seed)
+        game_map, army1, army2 = load_match(os.path.join(ROOT, path), p0, p1)
+        return Engine(game_map, army1, army2, seed=seed)
+    return build
+
+
+def _lanchester(n: int, unit_type: str = "Knight") -> Callable:
+    """N contre 2N, sur une carte assez grande pour deux blocs separes."""
+    def build(seed: int) -> Engine:
+        from scripts.run_scenario import custom_battle_scenario
+        seed_all(seed)
+        general = GENERAL_CLASS_MAP["MajorDAFT"]
+        side = int(2 * 2.5 * math.ceil(math.sqrt(2 * n))) + 30
+        army1, army2 = custom_battle_scenario({unit_type: n}, {unit_type: 2 * n},
+                                              general, general, (side, side))
+        return Engine(Map(side, side), army1, army2, seed=seed)
+    return build
+
+
+def _stress(n: int, general: str = "CaptainBRAINDEAD",
+            mix: str = "Knight:0.4,Pikeman:0.4,Crossbowman:0.2") -> Callable:
+    """
+    N unites au total (N/2 par armee, formation en blocs), generees dans un
+    .bscen temporaire puis chargees comme un scenario (chemin de `create stress`).
+    CaptainBRAINDEAD par defaut: ses decisions restent lineaires (requetes
+    spatiales locales), la ou MajorDAFT parcourt toute l'armee ennemie par unite.
+    """
+    def build(seed: int) -> Engine:
+        from contextlib import redirect_stdout
+        from io import StringIO
+        from utils.generators import generate_stress_scenario, parse_unit_mix
+        from scripts.tournament import load_match
+        seed_all(seed)
+        fd, path = tempfile.mkstemp(suffix=".bscen")
+        os.close(fd)
+        try:
+            with redirect_stdout(StringIO()):
+                generate_stress_scenario(path, n // 2, parse_unit_mix(mix))
+            game_map, army1, army2 = load_match(path, general, general)
+        finally:
+            os.remove(path)
+        return Engine(game_map, army1, army2, seed=seed)
+    return build
+
+
+# nom -> (construction du moteur a partir de la graine, ticks mesures)
+CASES: dict[str, tuple[Callable, int]] = {
+    "mega_battle": (_scenario("scenarios/mega_battle.scen"), 100),
+    "tourney_battle": (_scenario("scenarios/tourney_battle.scen"), 300),
+    "lanchester_knight_50": (_lanchester(50), 300),
+    "lanchester_knight_200": (_lanchester(200), 100),
+    "lanchester_knight_1000": (_lanchester(1000), 10),
+    "forest_map": (_scenario("maps/forest.map"), 300),
+    "stress_1k": (_stress(1000), 50),
+    "stress_10k": (_stress(10000), 20),
+    "stress_100k": (_stress(100000), 4),
+}
+CASES.update({f"general_{name}": (_scenario("scenarios/tourney_battle.scen", name, name), 150)
+              for name in GENERAL_CLASS_MAP})
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss: octets sous macOS, kilo-octets sous Linux
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _time_decisions(engine: Engine) -> list:
+    """Chronometre les decide_actions des generaux: [appels, ns]."""
+    totals = [0, 0]
+    for army in engine.armies:
+        decide = army.general.decide_actions
+
+        def timed(*args, decide=decide):
+            start = time.perf_counter_ns()
+            try:
+                return decide(*args)
+            finally:
+                totals[0] += 1
+                totals[1] += time.perf_counter_ns() - start
+        army.general.decide_actions = timed
+    return totals
+
+
+def run_case(name: str, seed: int = DEFAULT_SEED) -> dict:
+    """Joue un cas et retourne ses metriques."""
+    build, ticks = CASES[name]
+    engine = build(seed)
+    units = len(engine.units_by_id)
+    decisions = _time_decisions(engine)
+
+    start = time.perf_counter()
+    while engine.turn_count < ticks and engine.step(LOGIC_DT):
+        pass
+    wall = time.perf_counter() - start
+    played = engine.turn_count
+
+    # Fenetre d'allocation separee: tracemalloc ralentit fortement le moteur
+    alloc = []
+    tracemalloc.start()
+    try:
+        for _ in range(max(1, min(ALLOC_TICKS, ticks // 4))):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            if not engine.step(LOGIC_DT):
+                break
+            alloc.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "units": units,
+        "ticks": played,
+        "wall_s": round(wall, 3),
+        "ticks_per_sec": round(played / wall, 2) if wall > 0 else 0.0,
+        "ms_per_decision": round(decisions[1] / 1e6 / decisions[0], 3) if decisions[0] else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "alloc_kb_per_tick": round(sum(alloc) / len(alloc) / 1024, 1) if alloc else None,
+    }
+
+
+def run_suite(names: Optional[list[str]] = None, seed: int = DEFAULT_SEED,
+              isolate: bool = True) -> dict:
+    """
+    Joue les cas demandes (tous par defaut). isolate: un processus neuf par
+    cas (sinon le pic RSS est celui de toute la suite).
+    """
+    names = names or list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise ValueError(f"Cas inconnus: {unknown} (disponibles: {list(CASES)})")
+
+    cases = {}
+    for name in names:
+        print(f"  {name}... ", end="", flush=True)
+        if isolate:
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                metrics = pool.submit(run_case, name, seed).result()
+        else:
+            metrics = run_case(name, seed)
+        cases[name] = metrics
+        print(f"{metrics['ticks_per_sec']} ticks/s, {metrics['ms_per_decision']} ms/decision")
+
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "seed": seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "cases": cases,
+    }
+
+
+def save_results(results: dict, path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path: str) -> dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_baseline(results: dict, path: str = DEFAULT_BASELINE):
+    """
+    Enregistre des resultats comme reference. Les cas deja presents dans la
+    reference et non rejoues sont conserves (une reference peut se construire
+    en plusieurs passes, ex. les cas de stress a part).
+    """
+    baseline = {"meta": results["meta"], "cases": {}}
+    if os.path.exists(path):
+        baseline["cases"].update(load_results(path).get("cases", {}))
+    baseline["cases"].update(results["cases"])
+    save_results(baseline, path)
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    """
+    Compare deux resultats cas par cas. Retourne une ligne par metrique
+    commune: {"case", "metric", "baseline", "current", "change", "regression"}.
+    change est relatif et oriente (negatif = pire), regression si change < -threshold.
+    """
+    rows = []
+    for case, base_metrics in baseline["cases"].items():
+        metrics = current["cases"].get(case)
+        if metrics is None:
+            continue
+        for metric, direction in METRICS.items():
+            base, value = base_metrics.get(metric), metrics.get(metric)
+            if base is None or value is None:
+                continue
+            if base == 0:
+                change = 0.0 if value == 0 else direction * math.inf
+            else:
+                change = direction * (value - base) / base + 0.0  # pas de -0.0
+            rows.append({
+                "case": case,
+                "metric": metric,
+                "baseline": base,
+                "current": value,
+                "change": change,
+                "regression": change < -threshold,
+            })
+    return rows
+
+
+def format_comparison(rows: list[dict]) -> str:
+    width = max([26] + [len(row["case"]) + 2 for row in rows])
+    lines = [f"{'cas':<{width}}{'metrique':<20}{'reference':>12}{'actuel':>12}{'ecart':>9}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(f"{row['case']:<{width}}{row['metric']:<20}{row['baseline']:>12}{row['current']:>12}"
+                     f"{100 * row['change']:>+8.1f}%{flag}")
+    return "\n".join(lines)
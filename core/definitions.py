@@ -1,5 +1,5 @@
 # core/definitions.py
-from ai.generals import CaptainBRAINDEAD, MajorDAFT, ColonelKAISER
+from ai.generals import CaptainBRAINDEAD, MajorDAFT, ColonelKAISER, MarshalCARLO
 from core.unit import (
     Knight, Pikeman, Crossbowman, LongSwordsman,
     EliteSkirmisher, CavalryArcher, Onager, Castle, Wonder,
@@ -10,6 +10,7 @@ GENERAL_CLASS_MAP = {
     "CaptainBRAINDEAD": CaptainBRAINDEAD,
     "MajorDAFT": MajorDAFT,
     "ColonelKAISER": ColonelKAISER,
+    "MarshalCARLO": MarshalCARLO,
 }
 
 UNIT_CLASS_MAP = {
@@ -0,0 +1,119 @@
+# core/digest.py
+import zlib
+from array import array
+from typing import Optional
+
+
+# Quantification: positions et cooldowns au 1/1000, HP entiers. Assez fin
+# pour voir toute divergence de logique, assez grossier pour ignorer le bruit
+# d'arrondi d'une formule equivalente.
+POS_SCALE = 1000
+COOLDOWN_SCALE = 1000
+
+
+def state_digest(engine, previous: int = 0) -> int:
+    """
+    CRC32 de l'etat quantifie (unites triees par id: id, armee, vivant,
+    x, y, HP, cooldown), chaine avec `previous` (hash glissant).
+    """
+    units = engine.units_by_id
+    values = array('q')
+    for unit_id in sorted(units):
+        unit = units[unit_id]
+        x, y = unit.pos
+        values.extend((
+            unit_id,
+            unit.army_id,
+            1 if unit.is_alive else 0,
+            int(round(x * POS_SCALE)),
+            int(round(y * POS_SCALE)),
+            int(unit.current_hp),
+            int(round(unit.current_cooldown * COOLDOWN_SCALE)),
+        ))
+    return zlib.crc32(values.tobytes(), previous)
+
+
+class DigestRecorder:
+    """
+    Flux de digests d'etat, calcule tous les `every` ticks (listener du moteur).
+
+    Chaque digest chaine le precedent: deux flux identiques jusqu'au tick T
+    prouvent que les deux moteurs ont eu le meme etat quantifie a chaque
+    echantillon jusqu'a T. Format fichier: une ligne "tick digest_hex".
+    """
+
+    def __init__(self, every: int = 10):
+        self.every: int = max(1, every)
+        self.ticks = array('q')
+        self.digests = array('L')
+        self._last: int = 0
+
+    def on_damage(self, attacker, target, amount: int):
+        pass
+
+    def on_death(self, attacker, target):
+        pass
+
+    def on_heal(self, healer, target, amount: int):
+        pass
+
+    def on_convert(self, unit, old_army_id: int, new_army_id: int):
+        pass
+
+    def on_tick(self, engine):
+        if engine.turn_count % self.every == 0:
+            self.sample(engine)
+
+    def snapshot_state(self):
+        return (len(self.digests), self._last)
+
+    def restore_state(self, state):
+        count, self._last = state
+        del self.ticks[count:]
+        del self.digests[count:]
+
+    def sample(self, engine) -> int:
+        self._last = state_digest(engine, self._last)
+        self.ticks.append(engine.turn_count)
+        self.digests.append(self._last)
+        return self._last
+
+    def __len__(self) -> int:
+        return len(self.digests)
+
+    def items(self) -> list[tuple[int, int]]:
+        return list(zip(self.ticks, self.digests))
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            f.write(f"# every={self.every}\n")
+            for tick, digest in zip(self.ticks, self.digests):
+                f.write(f"{tick} {digest:08x}\n")
+
+    @classmethod
+    def load(cls, path: str) -> 'DigestRecorder':
+        recorder = cls()
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("# every="):
+                    recorder.every = int(line[len("# every="):])
+                elif line and not line.startswith("#"):
+                    tick, digest = line.split()
+                    recorder.ticks.append(int(tick))
+                    recorder.digests.append(int(digest, 16))
+        return recorder
+
+
+def first_divergence(a: DigestRecorder, b: DigestRecorder) -> Optional[int]:
+    """
+    Premier tick ou les deux flux different (ou ou l'un s'arrete avant l'autre),
+    None s'ils sont identiques.
+    """
+    for (tick_a, digest_a), (tick_b, digest_b) in zip(a.items(), b.items()):
+        if tick_a != tick_b or digest_a != digest_b:
+            return min(tick_a, tick_b)
+    if len(a) != len(b):
+        shorter = a if len(a) < len(b) else b
+        return shorter.ticks[-1] + 1 if len(shorter) else 0
+    return None
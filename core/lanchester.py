@@ -0,0 +1,242 @@
+# core/lanchester.py
+"""
+Modele de combat en champ moyen (lois de Lanchester).
+
+Predit l'issue d'un affrontement a partir des seules stats des unites
+(UNIT_CLASS_MAP), sans simulation spatiale:
+- DPS effectif = degats par coup (attaque + bonus - armure, min 1) / reload_time
+- delai d'engagement = (distance - portee) / vitesse de rapprochement
+- integration des EDO de Lanchester sur les "reservoirs de HP" de chaque camp
+
+Loi carree (tir vise, unites a distance) : dH_A/dt = -dps_B * N_B
+Loi lineaire (melee, front limite)       : dH_A/dt = -dps_B * N_B * N_A / N_ref
+
+La loi carree est le defaut: le moteur laisse les unites se regrouper sur
+leurs cibles, y compris en melee.
+"""
+import math
+from typing import Optional
+
+from core.rng import get_rng
+
+# Au-dela de cette portee, une unite est consideree "a distance" (law="auto")
+RANGED_THRESHOLD = 2.0
+DEFAULT_DISTANCE = 10.0
+MAX_BATTLE_TIME = 600.0
+# Un camp est elimine quand il lui reste moins d'une demi-unite
+ELIMINATION_THRESHOLD = 0.5
+# Pas d'integration: fraction max des HP initiaux perdue par pas
+STEP_FRACTION = 0.01
+MAX_STEP = 0.5
+
+_STATS_CACHE: dict[type, dict] = {}
+
+
+def _resolve(unit_type) -> type:
+    """Accepte une classe d'unite ou son nom dans UNIT_CLASS_MAP."""
+    if isinstance(unit_type, str):
+        from core.definitions import UNIT_CLASS_MAP
+        cls = UNIT_CLASS_MAP.get(unit_type)
+        if cls is None:
+            raise ValueError(f"Type d'unité inconnu: {unit_type}")
+        return cls
+    return unit_type
+
+
+def unit_stats(unit_type) -> dict:
+    """
+    Stats de base d'un type d'unite (instancie une seule fois, puis cache).
+    L'instance est construite sans consommer le generateur "units": un
+    premier appel en cours de partie seedee ne change pas la suite.
+    """
+    cls = _resolve(unit_type)
+    stats = _STATS_CACHE.get(cls)
+    if stats is None:
+        anim_rng = get_rng("units")
+        state = anim_rng.getstate()
+        try:
+            dummy = cls(unit_id=0, army_id=0, pos=(0.0, 0.0))
+        finally:
+            anim_rng.setstate(state)
+        stats = {
+            "unit": dummy,
+            "hp": dummy.max_hp,
+            "speed": dummy.speed,
+            "range": dummy.attack_range + dummy.hitbox_radius * 2,
+            "reload_time": max(0.1, dummy.reload_time),
+        }
+        _STATS_CACHE[cls] = stats
+    return stats
+
+
+def effective_dps(attacker_type, defender_type) -> float:
+    """Degats par seconde d'une unite `attacker_type` contre `defender_type`."""
+    attacker = unit_stats(attacker_type)
+    defender = unit_stats(defender_type)
+    damage = attacker["unit"].calculate_damage(defender["unit"])
+    return damage / attacker["reload_time"]
+
+
+def approach_time(attacker_type, defender_type, distance: float) -> float:
+    """Temps avant que `attacker_type` soit a portee (les deux camps avancent)."""
+    attacker = unit_stats(attacker_type)
+    defender = unit_stats(defender_type)
+    gap = distance - attacker["range"]
+    if gap <= 0:
+        return 0.0
+    closing_speed = attacker["speed"] + defender["speed"]
+    if closing_speed <= 0:
+        return math.inf
+    return gap / closing_speed
+
+
+def _normalize(composition: dict) -> dict[type, int]:
+    return {_resolve(k): n for k, n in composition.items() if n > 0}
+
+
+def _side_params(mine: dict[type, int], theirs: dict[type, int], distance: float, law: str) -> dict:
+    """Agrege une composition en une 'unite moyenne' face a la composition adverse."""
+    count = sum(mine.values())
+    their_count = sum(theirs.values())
+    hp_total = sum(unit_stats(t)["hp"] * n for t, n in mine.items())
+
+    dps = 0.0
+    engage = 0.0
+    ranged = 0
+    for t, n in mine.items():
+        # DPS moyen contre la composition adverse (pondere par effectif)
+        dps += n * sum(effective_dps(t, e) * m for e, m in theirs.items()) / their_count
+        engage += n * min(approach_time(t, e, distance) for e in theirs)
+        if unit_stats(t)["range"] > RANGED_THRESHOLD:
+            ranged += n
+
+    if law == "auto":
+        law = "square" if ranged * 2 >= count else "linear"
+
+    return {
+        "count": count,
+        "hp_total": float(hp_total),
+        "hp_per_unit": hp_total / count,
+        "dps": dps / count,
+        "engage_time": engage / count,
+        "law": law,
+    }
+
+
+def predict_battle(composition_a: dict, composition_b: dict,
+                   distance: float = DEFAULT_DISTANCE, law: str = "square",
+                   max_time: float = MAX_BATTLE_TIME) -> dict:
+    """
+    Predit l'issue A vs B par integration RK4 des EDO de Lanchester.
+
+    Args:
+        composition_a / composition_b: {type ou nom: effectif}
+        distance: distance initiale entre les fronts (tuiles)
+        law: "square", "linear" ou "auto" (loi choisie par camp selon la portee)
+
+    Returns:
+        {"winner": 0|1|None, "time": s, "remaining": [a, b], "casualties": [a, b],
+         "laws": [law_a, law_b]}
+    """
+    comp_a = _normalize(composition_a)
+    comp_b = _normalize(composition_b)
+    if not comp_a or not comp_b:
+        winner = 0 if comp_a else (1 if comp_b else None)
+        remaining = [float(sum(comp_a.values())), float(sum(comp_b.values()))]
+        return {"winner": winner, "time": 0.0, "remaining": remaining,
+                "casualties": [0.0, 0.0], "laws": [law, law]}
+
+    side_a = _side_params(comp_a, comp_b, distance, law)
+    side_b = _side_params(comp_b, comp_a, distance, law)
+    n_ref = (side_a["count"] + side_b["count"]) / 2.0
+
+    def losses(h_target: float, target: dict, h_shooter: float, shooter: dict, t: float) -> float:
+        """Perte de HP par seconde de `target` sous le feu de `shooter`."""
+        if t < shooter["engage_time"] or h_shooter <= 0 or h_target <= 0:
+            return 0.0
+        rate = shooter["dps"] * (h_shooter / shooter["hp_per_unit"])
+        if shooter["law"] == "linear":
+            rate *= (h_target / target["hp_per_unit"]) / n_ref
+        return rate
+
+    def derivatives(h_a: float, h_b: float, t: float) -> tuple[float, float]:
+        return (-losses(h_a, side_a, h_b, side_b, t), -losses(h_b, side_b, h_a, side_a, t))
+
+    h_a, h_b = side_a["hp_total"], side_b["hp_total"]
+    t = min(side_a["engage_time"], side_b["engage_time"])
+
+    if math.isinf(t):
+        # Aucun des deux camps ne peut atteindre l'autre
+        return {"winner": None, "time": 0.0,
+                "remaining": [float(side_a["count"]), float(side_b["count"])],
+                "casualties": [0.0, 0.0], "laws": [side_a["law"], side_b["law"]]}
+
+    min_a = ELIMINATION_THRESHOLD * side_a["hp_per_unit"]
+    min_b = ELIMINATION_THRESHOLD * side_b["hp_per_unit"]
+    while h_a > min_a and h_b > min_b and t < max_time:
+        k1a, k1b = derivatives(h_a, h_b, t)
+        # Pas adaptatif: ~1% des HP initiaux du camp le plus expose
+        dt = MAX_STEP
+        if k1a < 0:
+            dt = min(dt, STEP_FRACTION * side_a["hp_total"] / -k1a)
+        if k1b < 0:
+            dt = min(dt, STEP_FRACTION * side_b["hp_total"] / -k1b)
+        k2a, k2b = derivatives(h_a + k1a * dt / 2, h_b + k1b * dt / 2, t + dt / 2)
+        k3a, k3b = derivatives(h_a + k2a * dt / 2, h_b + k2b * dt / 2, t + dt / 2)
+        k4a, k4b = derivatives(h_a + k3a * dt, h_b + k3b * dt, t + dt)
+        h_a += (k1a + 2 * k2a + 2 * k3a + k4a) * dt / 6
+        h_b += (k1b + 2 * k2b + 2 * k3b + k4b) * dt / 6
+        t += dt
+
+    winner: Optional[int] = None
+    if h_a <= min_a < h_b:
+        winner, h_a = 1, 0.0
+    elif h_b <= min_b < h_a:
+        winner, h_b = 0, 0.0
+
+    remaining_a = max(0.0, h_a) / side_a["hp_per_unit"]
+    remaining_b = max(0.0, h_b) / side_b["hp_per_unit"]
+
+    return {
+        "winner": winner,
+        "time": t,
+        "remaining": [remaining_a, remaining_b],
+        "casualties": [side_a["count"] - remaining_a, side_b["count"] - remaining_b],
+        "laws": [side_a["law"], side_b["law"]],
+    }
+
+
+def predict_lanchester(unit_type, n: int, distance: float = DEFAULT_DISTANCE, law: str = "square") -> dict:
+    """Prediction du scenario Lanchester N vs 2N (meme type d'unite)."""
+    return predict_battle({unit_type: n}, {unit_type: 2 * n}, distance=distance, law=law)
+
+
+def evaluate_engagement(my_units: list, enemy_units: list, law: str = "square") -> float:
+    """
+    Evaluation rapide d'un engagement pour les generaux.
+
+    Returns:
+        Score dans [-1, 1]: fraction de mes unites survivantes moins
+        fraction des unites ennemies survivantes (> 0 = favorable).
+    """
+    mine: dict[type, int] = {}
+    theirs: dict[type, int] = {}
+    for u in my_units:
+        if u.is_alive:
+            mine[type(u)] = mine.get(type(u), 0) + 1
+    for u in enemy_units:
+        if u.is_alive:
+            theirs[type(u)] = theirs.get(type(u), 0) + 1
+    if not mine or not theirs:
+        return 1.0 if mine else -1.0
+
+    def centroid(units):
+        alive = [u for u in units if u.is_alive]
+        return (sum(u.pos[0] for u in alive) / len(alive), sum(u.pos[1] for u in alive) / len(alive))
+
+    (mx, my), (ex, ey) = centroid(my_units), centroid(enemy_units)
+    distance = math.sqrt((mx - ex) ** 2 + (my - ey) ** 2)
+
+    result = predict_battle(mine, theirs, distance=distance, law=law)
+    return (result["remaining"][0] / sum(mine.values())
+            - result["remaining"][1] / sum(theirs.values()))
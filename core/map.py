@@ -1,5 +1,6 @@
 # core/map.py
 import math
+from array import array
 from core.unit import Unit
 
 class Tile:
@@ -21,12 +22,34 @@ class Map:
         self.grid: list[list[Tile]] = [[Tile() for _ in range(height)] for _ in range(width)]
         self.obstacles: list[tuple[str, int, int]] = []
 
+        # Decor statique (arbres...) : tableaux compacts (x, y, kind, variant)
+        # au lieu d'objets Unit. Chaque prop bloque sa tuile.
+        self.prop_x = array('H')
+        self.prop_y = array('H')
+        self.prop_kind = array('B')
+        self.prop_variant = array('B')
+
     def add_obstacle(self, type_name: str, x: int, y: int):
         """Ajoute un obstacle à la carte."""
         # Pour l'instant, on se contente de le stocker.
         # Pourrait modifier la tuile, par ex. la rendre non-traversable.
         self.obstacles.append((type_name, x, y))
 
+    def add_prop(self, kind: int, x: int, y: int, variant: int = 0):
+        """Ajoute un element de decor statique (bloquant) sur la tuile (x, y)."""
+        self.prop_x.append(x)
+        self.prop_y.append(y)
+        self.prop_kind.append(kind)
+        self.prop_variant.append(variant)
+
+    def iter_props(self):
+        """Itere sur le decor statique: (x, y, kind, variant)."""
+        return zip(self.prop_x, self.prop_y, self.prop_kind, self.prop_variant)
+
+    def prop_cells(self) -> set[tuple[int, int]]:
+        """Tuiles occupees par du decor (bloquantes)."""
+        return set(zip(self.prop_x, self.prop_y))
+
     def get_tile(self, x: int, y: int) -> Tile | None:
         """Retourne l'objet Tile à une coordonnée de grille donnée."""
         if 0 <= x < self.width and 0 <= y < self.height:
@@ -139,7 +162,8 @@ class Map:
             'width': self.width,
             'height': self.height,
             'grid': grid_data, # Sparse representation
-            'obstacles': self.obstacles
+            'obstacles': self.obstacles,
+            'props': [list(prop) for prop in self.iter_props()]
         }
 
     @classmethod
@@ -156,4 +180,6 @@ class Map:
                 new_map.grid[x][y].terrain_type = tile_data.get('t', 'plain')
         
         new_map.obstacles = [tuple(obs) for obs in data.get('obstacles', [])]
+        for x, y, kind, variant in data.get('props', []):
+            new_map.add_prop(kind, x, y, variant)
         return new_map
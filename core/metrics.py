@@ -0,0 +1,177 @@
+# core/metrics.py
+import csv
+from array import array
+
+
+class MetricsRecorder:
+    """
+    Enregistreur de series temporelles par armee, integre au moteur.
+
+    Les compteurs (unites vivantes, HP total, degats infliges, kills) sont mis
+    a jour de facon incrementale a partir des evenements du moteur (degats,
+    morts, soins, conversions) : aucun parcours des unites a chaque tick.
+    Un echantillon est ecrit tous les `sample_every` ticks dans des buffers
+    circulaires preallouees (les plus anciens sont ecrases si plein).
+    """
+    SERIES = ("alive", "hp", "damage", "kills")
+    TYPECODES = {"alive": 'q', "hp": 'd', "damage": 'd', "kills": 'q'}
+
+    def __init__(self, sample_every: int = 1, capacity: int = 8192):
+        self.sample_every: int = max(1, sample_every)
+        self.capacity: int = capacity
+        self.army_ids: list[int] = []
+        self._index: dict[int, int] = {}
+
+        # Compteurs courants (un par armee)
+        self.alive: list[int] = []
+        self.hp: list[float] = []
+        self.damage: list[float] = []
+        self.kills: list[int] = []
+
+        # Buffers circulaires
+        self._ticks = array('q', [0]) * capacity
+        self._times = array('d', [0.0]) * capacity
+        self._buffers: dict[str, list[array]] = {}
+        self._head: int = 0
+        self._count: int = 0
+
+    def reset(self, armies: list):
+        """(Re)initialise les compteurs a partir de l'etat des armees (O(N), une seule fois)."""
+        self.army_ids = [army.army_id for army in armies]
+        self._index = {army_id: i for i, army_id in enumerate(self.army_ids)}
+        self.alive = [sum(1 for u in army.units if u.is_alive) for army in armies]
+        self.hp = [float(sum(u.current_hp for u in army.units if u.is_alive)) for army in armies]
+        self.damage = [0.0] * len(armies)
+        self.kills = [0] * len(armies)
+        self._buffers = {
+            name: [array(self.TYPECODES[name], [0]) * self.capacity for _ in armies]
+            for name in self.SERIES
+        }
+        self._head = 0
+        self._count = 0
+
+    # --- Evenements du moteur ---
+
+    def on_damage(self, attacker, target, amount: int):
+        idx = self._index.get(target.army_id)
+        if idx is not None:
+            self.hp[idx] -= amount
+        if attacker is not None:
+            idx = self._index.get(attacker.army_id)
+            if idx is not None:
+                self.damage[idx] += amount
+
+    def on_death(self, attacker, target):
+        idx = self._index.get(target.army_id)
+        if idx is not None:
+            self.alive[idx] -= 1
+        if attacker is not None:
+            idx = self._index.get(attacker.army_id)
+            if idx is not None:
+                self.kills[idx] += 1
+
+    def on_heal(self, healer, target, amount: int):
+        idx = self._index.get(target.army_id)
+        if idx is not None:
+            self.hp[idx] += amount
+
+    def on_convert(self, unit, old_army_id: int, new_army_id: int):
+        old_idx = self._index.get(old_army_id)
+        new_idx = self._index.get(new_army_id)
+        if old_idx is not None:
+            self.alive[old_idx] -= 1
+            self.hp[old_idx] -= unit.current_hp
+        if new_idx is not None:
+            self.alive[new_idx] += 1
+            self.hp[new_idx] += unit.current_hp
+
+    def on_tick(self, engine):
+        """Appele par le moteur apres chaque tick logique."""
+        if engine.turn_count % self.sample_every == 0:
+            self.sample(engine.turn_count, engine.time_elapsed)
+
+    # --- Snapshot / rollback (Engine.snapshot) ---
+
+    def snapshot_state(self):
+        """
+        Les echantillons ecrits apres la capture (rollouts MarshalCARLO) peuvent
+        ecraser des cases deja remplies du buffer circulaire : le contenu des
+        buffers est donc copie avec les compteurs (copie memoire, O(capacity)).
+        """
+        count = self._count
+        slots = (self._ticks[:count], self._times[:count],
+                 {name: [buf[:count] for buf in buffers] for name, buffers in self._buffers.items()})
+        return (self.alive[:], self.hp[:], self.damage[:], self.kills[:], self._head, count, slots)
+
+    def restore_state(self, state):
+        alive, hp, damage, kills, self._head, self._count, slots = state
+        self.alive, self.hp, self.damage, self.kills = alive[:], hp[:], damage[:], kills[:]
+        ticks, times, buffers = slots
+        count = self._count
+        self._ticks[:count] = ticks
+        self._times[:count] = times
+        for name, saved in buffers.items():
+            for buf, values in zip(self._buffers[name], saved):
+                buf[:count] = values
+
+    # --- Echantillonnage / export ---
+
+    def sample(self, tick: int, time_elapsed: float):
+        """Ecrit les compteurs courants dans les buffers circulaires."""
+        head = self._head
+        self._ticks[head] = tick
+        self._times[head] = time_elapsed
+        current = {"alive": self.alive, "hp": self.hp, "damage": self.damage, "kills": self.kills}
+        for name, values in current.items():
+            buffers = self._buffers[name]
+            for i, value in enumerate(values):
+                buffers[i][head] = value
+        self._head = (head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _ordered(self, buf: array) -> list:
+        """Contenu d'un buffer dans l'ordre chronologique."""
+        if self._count < self.capacity:
+            return buf[:self._count].tolist()
+        return (buf[self._head:] + buf[:self._head]).tolist()
+
+    def history(self) -> dict:
+        """
+        Retourne l'historique sous forme de listes Python:
+        {"tick": [...], "t": [...], "alive": [[armee0...], [armee1...]], "hp": ..., ...}
+        """
+        data = {"tick": self._ordered(self._ticks), "t": self._ordered(self._times)}
+        for name in self.SERIES:
+            data[name] = [self._ordered(buf) for buf in self._buffers.get(name, [])]
+        return data
+
+    def to_numpy(self) -> dict:
+        """
+        Retourne l'historique sous forme de tableaux NumPy
+        (les series par armee ont la forme (n_armees, n_echantillons)).
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("NumPy est requis pour to_numpy(): pip install numpy")
+        data = self.history()
+        return {key: np.asarray(values) for key, values in data.items()}
+
+    def to_csv(self, path: str):
+        """Exporte l'historique en CSV (une ligne par echantillon)."""
+        data = self.history()
+        header = ["tick", "t"]
+        for name in self.SERIES:
+            header.extend(f"{name}_{army_id}" for army_id in self.army_ids)
+
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for row_idx in range(len(data["tick"])):
+                row = [data["tick"][row_idx], data["t"][row_idx]]
+                for name in self.SERIES:
+                    row.extend(series[row_idx] for series in data[name])
+                writer.writerow(row)
@@ -0,0 +1,145 @@
+# core/profiler.py
+"""
+Profilage par phase du tick (Engine.enable_profiler / --profile).
+
+Le moteur n'a aucun code de mesure: chaque phase est une methode
+(_collect_actions, _advance_timers, _apply_moves...) et le profiler
+remplace ces methodes sur l'instance par des versions chronometrees. Sans
+profiler, le chemin d'execution est strictement celui d'origine.
+
+Les temps sont exclusifs: une phase imbriquee (collisions dans les
+mouvements) est retiree du temps de la phase englobante. Les ticks simules
+par un general a recherche (Engine.step imbrique) comptent dans la phase "ai".
+"""
+from time import perf_counter_ns
+
+
+def _count_kind(kinds: tuple[str, ...]):
+    def count(engine, args, result) -> int:
+        return sum(1 for action in args[0] if action[0] in kinds)
+    return count
+
+
+def _count_units(engine, args, result) -> int:
+    return len(engine.units_by_id)
+
+
+# (phase, methode du moteur, unites traitees par appel)
+PHASES = (
+    ("ai", "_collect_actions", lambda engine, args, result: len(result)),
+    ("timers", "_advance_timers", _count_units),
+    ("movement", "_apply_moves", _count_kind(("move",))),
+    ("collision", "_resolve_collisions", lambda engine, args, result: 1),
+    ("attacks", "_apply_attacks", _count_kind(("attack",))),
+    ("monks", "_apply_monk_actions", _count_kind(("heal", "convert"))),
+    ("status", "_update_statuses", _count_units),
+    ("reap", "_reap_dead_units", _count_units),
+    ("listeners", "_notify_tick", lambda engine, args, result: len(engine.listeners)),
+)
+
+
+class TickProfiler:
+    """
+    Compteurs par phase: temps (ns, exclusif), appels, unites traitees.
+    Un meme profiler peut etre attache a plusieurs moteurs (episodes,
+    matchs d'un tournoi) pour cumuler, ou fusionne depuis as_dict() d'un
+    autre processus (merge).
+    """
+
+    def __init__(self):
+        self.ticks = 0
+        self.total_ns = 0
+        self.ns = [0] * len(PHASES)
+        self.calls = [0] * len(PHASES)
+        self.units = [0] * len(PHASES)
+        self._depth = 0
+        self._stack: list[int] = []
+
+    def attach(self, engine) -> 'TickProfiler':
+        for index, (_, method, count) in enumerate(PHASES):
+            setattr(engine, method, self._timed(index, engine, getattr(engine, method), count))
+        engine.step = self._timed_step(engine.step)
+        engine.profiler = self
+        return self
+
+    def detach(self, engine) -> None:
+        """Retire les versions chronometrees: le moteur retrouve les methodes de sa classe."""
+        for _, method, _ in PHASES:
+            vars(engine).pop(method, None)
+        vars(engine).pop("step", None)
+        engine.profiler = None
+
+    def _timed_step(self, step):
+        def timed_step(dt):
+            self._depth += 1
+            if self._depth > 1:
+                # Tick simule depuis une phase (general a recherche): compte dans cette phase
+                try:
+                    return step(dt)
+                finally:
+                    self._depth -= 1
+            start = perf_counter_ns()
+            try:
+                running = step(dt)
+            finally:
+                self._depth -= 1
+            self.total_ns += perf_counter_ns() - start
+            if running:
+                self.ticks += 1
+            return running
+        return timed_step
+
+    def _timed(self, index: int, engine, method, count):
+        ns, calls, units, stack = self.ns, self.calls, self.units, self._stack
+
+        def timed(*args):
+            if self._depth != 1:
+                return method(*args)
+            stack.append(0)
+            start = perf_counter_ns()
+            try:
+                result = method(*args)
+            finally:
+                elapsed = perf_counter_ns() - start
+                ns[index] += elapsed - stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                calls[index] += 1
+            units[index] += count(engine, args, result)
+            return result
+        return timed
+
+    def as_dict(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "total_ns": self.total_ns,
+            "phases": {name: {"ns": self.ns[i], "calls": self.calls[i], "units": self.units[i]}
+                       for i, (name, _, _) in enumerate(PHASES)},
+        }
+
+    def merge(self, data: dict) -> None:
+        """Cumule un profil serialise (as_dict), ex: match joue dans un autre processus."""
+        self.ticks += data["ticks"]
+        self.total_ns += data["total_ns"]
+        for i, (name, _, _) in enumerate(PHASES):
+            phase = data["phases"].get(name)
+            if phase:
+                self.ns[i] += phase["ns"]
+                self.calls[i] += phase["calls"]
+                self.units[i] += phase["units"]
+
+    def report(self) -> str:
+        seconds = self.total_ns / 1e9
+        rate = self.ticks / seconds if seconds > 0 else 0.0
+        ticks = max(1, self.ticks)
+        total = max(1, self.total_ns)
+        lines = [
+            f"Profil: {self.ticks} ticks en {seconds:.2f} s ({rate:.1f} ticks/s)",
+            f"{'phase':<11}{'total ms':>11}{'%':>7}{'ms/tick':>10}{'appels':>10}{'unites':>11}",
+        ]
+        rows = [(name, self.ns[i], self.calls[i], self.units[i]) for i, (name, _, _) in enumerate(PHASES)]
+        rows.append(("autre", max(0, self.total_ns - sum(self.ns)), self.ticks, 0))
+        for name, ns, calls, units in rows:
+            lines.append(f"{name:<11}{ns / 1e6:>11.1f}{100 * ns / total:>6.1f}%"
+                         f"{ns / 1e6 / ticks:>10.3f}{calls:>10}{units:>11}")
+        return "\n".join(lines)
@@ -0,0 +1,143 @@
+# core/replay.py
+"""
+Enregistrement compact du flux d'actions et relecture sans generaux.
+
+Format binaire (petit-boutiste):
+    en-tete   MAGIC (8 octets) | version u16 | a_graine u8 | graine u64 | taille u32
+              + etat initial (Engine.to_dict en JSON, compresse zlib)
+    par tick  numero u32 | dt f64 | nombre d'actions u32
+    action    type u8 | unit_id u32 | charge utile:
+                  move                    -> x f64, y f64
+                  attack / heal / convert -> cible u32
+
+Les positions sont gardees en f64: la relecture reproduit exactement les
+memes deplacements. Les actions d'un type inconnu du moteur (sans effet)
+ne sont pas enregistrees.
+
+La graine de l'en-tete est tronquee a 64 bits (derive_seed et les graines
+utilisateur peuvent depasser 2**63, ou etre negatives); la valeur exacte est
+celle de l'etat initial ("seed"), que la relecture utilise en priorite.
+"""
+import json
+import zlib
+import struct
+from typing import Optional
+
+from engine import Engine
+
+MAGIC = b"BTLREPLY"
+VERSION = 1
+
+_HEADER = struct.Struct("<HBQI")
+_SEED_MASK = (1 << 64) - 1
+_TICK = struct.Struct("<IdI")
+_ACTION = struct.Struct("<BI")
+_POS = struct.Struct("<dd")
+_TARGET = struct.Struct("<I")
+
+KIND_MOVE = 0
+ACTION_KINDS = ("move", "attack", "heal", "convert")
+_KIND_CODES = {name: code for code, name in enumerate(ACTION_KINDS)}
+
+
+class ReplayRecorder:
+    """Ecrit le flux d'actions d'un moteur, tick par tick (voir Engine.record_replay)."""
+
+    def __init__(self, path: str, engine: Engine):
+        self.path = path
+        self.ticks = 0
+        self._file = open(path, "wb")
+        state = zlib.compress(json.dumps(engine.to_dict()).encode("utf-8"))
+        seed = engine.seed
+        self._file.write(MAGIC)
+        self._file.write(_HEADER.pack(VERSION, seed is not None, (seed or 0) & _SEED_MASK, len(state)))
+        self._file.write(state)
+
+    def record(self, tick: int, dt: float, actions: list) -> None:
+        chunks = []
+        for kind, unit_id, data in actions:
+            code = _KIND_CODES.get(kind)
+            if code is None:
+                continue
+            chunks.append(_ACTION.pack(code, unit_id))
+            chunks.append(_POS.pack(data[0], data[1]) if code == KIND_MOVE else _TARGET.pack(data))
+        self._file.write(_TICK.pack(tick, dt, len(chunks) // 2))
+        self._file.write(b"".join(chunks))
+        self.ticks += 1
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_replay(path: str) -> tuple[dict, Optional[int], list[tuple[int, float, list]]]:
+    """Lit un replay -> (etat initial, graine, [(tick, dt, actions)])."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path}: pas un fichier replay")
+    offset = len(MAGIC)
+    version, has_seed, seed, state_len = _HEADER.unpack_from(raw, offset)
+    if version > VERSION:
+        raise ValueError(f"{path}: version {version} non supportee (max {VERSION})")
+    offset += _HEADER.size
+    state = json.loads(zlib.decompress(raw[offset:offset + state_len]))
+    offset += state_len
+
+    ticks = []
+    end = len(raw)
+    while offset < end:
+        tick, dt, count = _TICK.unpack_from(raw, offset)
+        offset += _TICK.size
+        actions = []
+        for _ in range(count):
+            code, unit_id = _ACTION.unpack_from(raw, offset)
+            offset += _ACTION.size
+            if code == KIND_MOVE:
+                data = _POS.unpack_from(raw, offset)
+                offset += _POS.size
+            else:
+                (data,) = _TARGET.unpack_from(raw, offset)
+                offset += _TARGET.size
+            actions.append((ACTION_KINDS[code], unit_id, data))
+        ticks.append((tick, dt, actions))
+    if not has_seed:
+        seed = None
+    elif isinstance(state.get('seed'), int):
+        seed = state['seed']
+    return state, seed, ticks
+
+
+class ReplayEngine(Engine):
+    """
+    Moteur qui rejoue un flux d'actions enregistre: aucun general n'est
+    appele, le dt de chaque tick est celui de l'enregistrement. Compatible
+    avec run_game (vues Pygame / terminal, pause, pas-a-pas).
+    """
+
+    @classmethod
+    def load(cls, path: str) -> 'ReplayEngine':
+        state, seed, ticks = read_replay(path)
+        state['seed'] = seed
+        engine = cls.from_dict(state)
+        engine.replay_ticks = ticks
+        engine.replay_cursor = 0
+        return engine
+
+    def step(self, dt: float) -> bool:
+        if self.replay_cursor >= len(self.replay_ticks):
+            # Fin du flux: constater l'etat final (vainqueur) sans jouer de tick
+            self._reap_dead_units()
+            self._check_game_over()
+            return False
+        return super().step(self.replay_ticks[self.replay_cursor][1])
+
+    def _collect_actions(self) -> list:
+        actions = self.replay_ticks[self.replay_cursor][2]
+        self.replay_cursor += 1
+        return actions
+
+    def fast_forward(self, tick: int) -> None:
+        """Rejoue sans vue jusqu'au tick `tick` (pour demarrer la relecture en cours de partie)."""
+        while self.turn_count < tick and self.step(0.0):
+            pass
@@ -0,0 +1,56 @@
+# core/rng.py
+"""
+Generateurs aleatoires par sous-systeme (mode deterministe).
+
+Chaque sous-systeme (unites, generaux, cartes, armees) tire ses nombres d'une
+instance random.Random dediee. seed_all(seed) les re-seede toutes a partir
+d'une graine unique: meme scenario + memes generaux + meme graine
+=> bataille identique, quel que soit l'ordre d'appel entre sous-systemes.
+
+Les graines derivees utilisent SHA-256 (et non hash(), randomise par processus)
+pour etre stables entre processus et machines.
+"""
+import random
+import hashlib
+from typing import Optional
+
+SUBSYSTEMS = ("units", "generals", "map", "armies")
+
+_streams: dict[str, random.Random] = {}
+
+
+def derive_seed(seed: int, *labels) -> int:
+    """Graine 64 bits stable derivee de `seed` et d'etiquettes (ex: "general", 0)."""
+    key = "|".join(str(part) for part in (seed,) + labels).encode("utf-8")
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "little")
+
+
+def make_rng(seed: Optional[int], *labels) -> random.Random:
+    """Nouvelle instance random.Random (graine derivee, ou systeme si seed=None)."""
+    if seed is None:
+        return random.Random()
+    return random.Random(derive_seed(seed, *labels))
+
+
+def get_rng(name: str) -> random.Random:
+    """Instance partagee du sous-systeme `name` (voir SUBSYSTEMS)."""
+    rng = _streams.get(name)
+    if rng is None:
+        rng = _streams[name] = random.Random()
+    return rng
+
+
+def seed_all(seed: int) -> int:
+    """
+    Re-seede tous les sous-systemes et le module `random` global
+    (code tiers ou ancien qui l'utiliserait encore). Retourne la graine.
+    """
+    for name in SUBSYSTEMS:
+        get_rng(name).seed(derive_seed(seed, name))
+    random.seed(derive_seed(seed, "global"))
+    return seed
+
+
+def new_seed() -> int:
+    """Graine aleatoire (32 bits) a enregistrer quand aucune n'est imposee."""
+    return random.SystemRandom().randrange(2 ** 32)
@@ -0,0 +1,133 @@
+# core/snapshot.py
+from array import array
+
+
+# Sentinelle "pas de cible" dans le buffer target_id
+NO_TARGET = -1
+
+
+class EngineSnapshot:
+    """
+    Copie de l'etat dynamique du moteur dans des buffers preallouees, pour
+    les generaux a recherche (simuler quelques secondes, puis revenir).
+
+    Le roster (toutes les unites presentes au premier snapshot) est fige: une
+    partie ne cree pas d'unites, elle ne fait qu'en retirer (_reap_dead_units).
+    Chaque capture ecrit en place dans les memes tableaux (O(N), sans
+    allocation par unite):
+        pos_x, pos_y, cooldown (f64) | hp, army_id, target_id (i64)
+        alive, present (i8) | statut (liste)
+    plus l'appartenance aux armees, le contenu des tuiles occupees (ordre
+    compris), les scalaires du moteur et l'etat des listeners et des generaux
+    qui exposent snapshot_state()/restore_state(state).
+
+    Non restaure: l'animation (cosmetique).
+    """
+
+    def __init__(self, engine):
+        self.roster = list(engine.units_by_id.values())
+        self._index = {id(unit): i for i, unit in enumerate(self.roster)}
+        n = len(self.roster)
+        self.pos_x = array('d', [0.0]) * n
+        self.pos_y = array('d', [0.0]) * n
+        self.cooldown = array('d', [0.0]) * n
+        self.hp = array('q', [0]) * n
+        self.army_id = array('q', [0]) * n
+        self.target_id = array('q', [0]) * n
+        self.alive = array('b', [0]) * n
+        self.present = array('b', [0]) * n
+        self.statut = [None] * n
+        # Indices du roster, par armee, dans l'ordre de army.units
+        self.army_members = [array('l') for _ in engine.armies]
+        self.tiles: list = []
+        self.tile_units: list[tuple] = []
+        self.turn_count = 0
+        self.time_elapsed = 0.0
+        self.game_over = False
+        self.winner = None
+        self.last_actions: dict = {}
+        self.listener_states: list = []
+        self.general_states: list = []
+
+    def capture(self, engine):
+        pos_x, pos_y, cooldown = self.pos_x, self.pos_y, self.cooldown
+        hp, army_id, target_id = self.hp, self.army_id, self.target_id
+        alive, present, statut = self.alive, self.present, self.statut
+        units_by_id = engine.units_by_id
+        for i, unit in enumerate(self.roster):
+            pos_x[i], pos_y[i] = unit.pos
+            cooldown[i] = unit.current_cooldown
+            hp[i] = unit.current_hp
+            army_id[i] = unit.army_id
+            target = getattr(unit, 'target_id', None)
+            target_id[i] = NO_TARGET if target is None else target
+            alive[i] = unit.is_alive
+            present[i] = units_by_id.get(unit.unit_id) is unit
+            statut[i] = unit.statut
+
+        index = self._index
+        for members, army in zip(self.army_members, engine.armies):
+            del members[:]
+            members.extend(index[id(unit)] for unit in army.units)
+
+        # Tuiles occupees (ordre des listes conserve: il influe sur les recherches de voisins)
+        game_map = engine.map
+        seen = set()
+        self.tiles.clear()
+        self.tile_units.clear()
+        for unit in units_by_id.values():
+            tile = game_map.get_tile(int(unit.pos[0]), int(unit.pos[1]))
+            if tile is not None and id(tile) not in seen:
+                seen.add(id(tile))
+                self.tiles.append(tile)
+                self.tile_units.append(tuple(tile.units))
+
+        self.turn_count = engine.turn_count
+        self.time_elapsed = engine.time_elapsed
+        self.game_over = engine.game_over
+        self.winner = engine.winner
+        self.last_actions = dict(engine._last_actions)
+        self.listener_states = [(listener, listener.snapshot_state())
+                                for listener in engine.listeners if hasattr(listener, 'snapshot_state')]
+        self.general_states = [(army.general, army.general.snapshot_state())
+                               for army in engine.armies if hasattr(army.general, 'snapshot_state')]
+        return self
+
+    def restore(self, engine):
+        # Vider les tuiles actuellement occupees avant de remettre l'ancien contenu
+        game_map = engine.map
+        for unit in engine.units_by_id.values():
+            tile = game_map.get_tile(int(unit.pos[0]), int(unit.pos[1]))
+            if tile is not None:
+                tile.units.clear()
+
+        units_by_id = {}
+        for i, unit in enumerate(self.roster):
+            unit.pos = (self.pos_x[i], self.pos_y[i])
+            unit.current_cooldown = self.cooldown[i]
+            unit.current_hp = self.hp[i]
+            unit.army_id = self.army_id[i]
+            target = self.target_id[i]
+            unit.target_id = None if target == NO_TARGET else target
+            unit.is_alive = bool(self.alive[i])
+            unit.statut = self.statut[i]
+            if self.present[i]:
+                units_by_id[unit.unit_id] = unit
+        engine.units_by_id = units_by_id
+
+        for tile, units in zip(self.tiles, self.tile_units):
+            tile.units[:] = units
+
+        roster = self.roster
+        for members, army in zip(self.army_members, engine.armies):
+            army.units[:] = [roster[i] for i in members]
+
+        engine.turn_count = self.turn_count
+        engine.time_elapsed = self.time_elapsed
+        engine.game_over = self.game_over
+        engine.winner = self.winner
+        engine._last_actions = dict(self.last_actions)
+        for listener, state in self.listener_states:
+            listener.restore_state(state)
+        for general, state in self.general_states:
+            general.restore_state(state)
@@ -1,8 +1,8 @@
 # core/unit.py
 import math
-import random
 import logging
 from typing import Optional
+from core.rng import get_rng
 
 # Constantes pour les types d'unités (pour éviter les chaînes magiques)
 UC_BUILDING = "building"
@@ -63,9 +63,11 @@ class Unit:
         self.is_alive: bool = True
         # Animation control (index + speed in ms per frame)
         # Décalage aléatoire pour désynchroniser les animations entre unités
-        self.anim_index: int = random.randint(0, 29)
+        # (generateur du sous-systeme "units" : reproductible via core.rng.seed_all)
+        anim_rng = get_rng("units")
+        self.anim_index: int = anim_rng.randint(0, 29)
         self.anim_speed: int = 150  # milliseconds per frame (lower = faster)
-        self.anim_elapsed: int = random.randint(0, 100)  # Léger décalage temporel
+        self.anim_elapsed: int = anim_rng.randint(0, 100)  # Léger décalage temporel
         # Nombre de frames par état (colonnes). Valeur par défaut = 30.
         self.anim_frames_per_state: dict[str, int] = {
             'attack': 30,
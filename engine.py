@@ -5,20 +5,26 @@ from typing import Optional, Any
 from core.map import Map
 from core.army import Army
 from core.unit import Unit
+from core.metrics import MetricsRecorder
+from core.digest import DigestRecorder
+from core.snapshot import EngineSnapshot
+from core.profiler import TickProfiler
+from core.rng import make_rng
 from ai.general import General
 
 # Type alias pour les actions que l'IA peut retourner
 Action = tuple[str, int, Any]
 
-# Chemin par défaut pour les sauvegardes rapides (F11/F12)
-QUICK_SAVE_PATH = "saves/quicksave.json"
+# Chemin par défaut pour les sauvegardes rapides (F11/F12), au format binaire
+# (utils/serialization.py; `battle export` la convertit en JSON)
+QUICK_SAVE_PATH = "saves/quicksave.bsav"
 
 class Engine:
     """
     Moteur de jeu principal.
     Gere la boucle de jeu, l'etat global, et les positions.
     """
-    def __init__(self, map_instance: Map, army1: Army, army2: Army):
+    def __init__(self, map_instance: Map, army1: Army, army2: Army, seed: Optional[int] = None):
         self.map: Map = map_instance
         self.armies: list[Army] = [army1, army2]
         self.turn_count: int = 0
@@ -29,12 +35,32 @@ class Engine:
         # État de pause pour l'interface
         self.paused: bool = False 
 
+        # Graine de la partie (None = non deterministe). Chaque general recoit
+        # un generateur derive (seed, "general", army_id) a la liaison.
+        self.seed: Optional[int] = seed
+
+        # Abonnés aux événements du moteur (dégâts, morts...) et métriques optionnelles
+        self.listeners: list[Any] = []
+        self.metrics: Optional[MetricsRecorder] = None
+        self.digest: Optional[DigestRecorder] = None
+        # Enregistreur du flux d'actions (voir record_replay / core/replay.py)
+        self.replay_recorder: Optional[Any] = None
+        # Decisions des generaux en parallele (voir enable_parallel_decisions / ai/parallel.py)
+        self.decider: Optional[Any] = None
+        # Profilage par phase (voir enable_profiler / core/profiler.py)
+        self.profiler: Optional[TickProfiler] = None
+
+        # Dernières actions de chaque armée (rejouées si le général ne décide pas ce tick)
+        self._last_actions: dict[int, list[Action]] = {}
+
         # Dictionnaire central pour accès O(1) aux unités
         self.units_by_id: dict[int, Unit] = {}
 
         # Optimisation : Set des obstacles pour recherche O(1)
         # On exclut 'Tree' pour permettre aux unités de passer à travers (Demande User)
+        # Le decor statique de la carte (props) est bloquant.
         self.obstacle_set = set((x, y) for t, x, y in self.map.obstacles if t != "Tree")
+        self.obstacle_set |= self.map.prop_cells()
 
         for army in self.armies:
             # === Initialisation des Stats de départ ===
@@ -56,6 +82,16 @@ class Engine:
                 self.units_by_id[unit.unit_id] = unit
                 self.map.add_unit(unit)
 
+        self._bind_generals()
+
+    def _bind_generals(self):
+        """Laisse chaque general s'abonner aux evenements du moteur."""
+        for army in self.armies:
+            if army.general is not None:
+                if self.seed is not None:
+                    army.general.rng = make_rng(self.seed, "general", army.army_id)
+                army.general.bind_engine(self)
+
     def run_game(self, max_turns: int = 2000, view: Optional[Any] = None, logic_speed: int = 2, quiet: bool = False):
         """
         Boucle principale du jeu.
@@ -111,6 +147,8 @@ class Engine:
                         from utils.serialization import load_game
                         try:
                             loaded_engine = load_game(QUICK_SAVE_PATH)
+                            # Le replay en cours ne peut pas suivre un saut d'etat
+                            self.stop_recording()
                             # Copier l'état du moteur chargé vers self
                             self.map = loaded_engine.map
                             self.armies = loaded_engine.armies
@@ -118,12 +156,20 @@ class Engine:
                             self.time_elapsed = loaded_engine.time_elapsed
                             self.game_over = loaded_engine.game_over
                             self.winner = loaded_engine.winner
+                            self.seed = loaded_engine.seed
                             self.paused = True  # Mettre en pause après chargement
                             # Reconstruire le cache d'unités
                             self.units_by_id = {}
                             for army in self.armies:
                                 for unit in army.units:
                                     self.units_by_id[unit.unit_id] = unit
+                            if self.metrics:
+                                self.metrics.reset(self.armies)
+                            self._last_actions = {}
+                            self._bind_generals()
+                            # Le decideur parallele indexe les unites des anciennes armees
+                            if self.decider is not None:
+                                self.enable_parallel_decisions(self.decider.mode)
                             # Mettre à jour la map dans la vue
                             if view:
                                 view.map = self.map
@@ -185,26 +231,11 @@ class Engine:
             
             step_once = False # Reset du step
 
-            # --- DÉBUT DE LA LOGIQUE DU TOUR ---
-            self._reap_dead_units()
-
-            if self._check_game_over():
+            if not self.step(dt_base * game_speed_multiplier):
                 break
 
-            all_actions: list[Action] = []
-            for army in self.armies:
-                if not army.is_defeated():
-                    my_living_units = [u for u in army.units if u.is_alive]
-                    enemy_living_units = self.get_enemy_units(army.army_id)
-                    if not enemy_living_units: continue
-
-                    actions = army.general.decide_actions(self.map, my_living_units, enemy_living_units)
-                    all_actions.extend(actions)
-            dt_sim = dt_base * game_speed_multiplier
-            self._execute_actions(all_actions, dt_sim)
-            self.turn_count += 1
-            self.time_elapsed += dt_sim
-            # --- FIN DE LA LOGIQUE ---
+        self.stop_recording()
+        self.stop_parallel_decisions()
 
         if view:
             view.display(self.armies, self.time_elapsed, self.paused)
@@ -223,6 +254,164 @@ class Engine:
             else:
                 print("Egalite.")
 
+    def step(self, dt: float) -> bool:
+        """
+        Execute un tick logique complet (sans vue).
+        Retourne False si la partie est terminee (aucun tick joue).
+        """
+        # --- DÉBUT DE LA LOGIQUE DU TOUR ---
+        self._reap_dead_units()
+
+        if self._check_game_over():
+            return False
+
+        all_actions = self._collect_actions()
+        if self.replay_recorder is not None:
+            self.replay_recorder.record(self.turn_count, dt, all_actions)
+        self._execute_actions(all_actions, dt)
+        self.turn_count += 1
+        self.time_elapsed += dt
+
+        self._notify_tick()
+        # --- FIN DE LA LOGIQUE ---
+        return True
+
+    def _notify_tick(self):
+        for listener in self.listeners:
+            listener.on_tick(self)
+
+    def _collect_actions(self) -> list[Action]:
+        """
+        Demande a chaque general ses actions pour ce tick. Un general qui ne
+        decide pas ce tick (should_decide) garde ses dernieres actions.
+        """
+        if self.decider is not None:
+            return self.decider.collect(self)
+        all_actions: list[Action] = []
+        for army in self.armies:
+            if not army.is_defeated():
+                all_actions.extend(self._army_actions(army))
+        return all_actions
+
+    def _army_actions(self, army: Army) -> list[Action]:
+        """Actions d'une armee pour ce tick (cache si son general ne decide pas)."""
+        cached = self._last_actions.get(army.army_id)
+        if not army.general.should_decide(self.turn_count) and cached is not None:
+            return cached
+
+        my_living_units = [u for u in army.units if u.is_alive]
+        enemy_living_units = self.get_enemy_units(army.army_id)
+        if not enemy_living_units:
+            return []
+
+        actions = army.general.decide_actions(self.map, my_living_units, enemy_living_units)
+        self._last_actions[army.army_id] = actions
+        return actions
+
+    # --- Evenements (degats, morts, soins, conversions) ---
+
+    def add_listener(self, listener):
+        """
+        Abonne un objet aux evenements du moteur. Le listener implemente
+        on_damage(attacker, target, amount), on_death(attacker, target),
+        on_heal(healer, target, amount), on_convert(unit, old_army_id, new_army_id)
+        et on_tick(engine).
+        """
+        self.listeners.append(listener)
+
+    def enable_metrics(self, sample_every: int = 1, capacity: int = 8192) -> MetricsRecorder:
+        """Active l'enregistreur de series temporelles (voir core/metrics.py)."""
+        self.metrics = MetricsRecorder(sample_every=sample_every, capacity=capacity)
+        self.metrics.reset(self.armies)
+        self.metrics.sample(self.turn_count, self.time_elapsed)
+        self.add_listener(self.metrics)
+        return self.metrics
+
+    def enable_digest(self, every: int = 10) -> DigestRecorder:
+        """Active le flux de digests d'etat tous les `every` ticks (voir core/digest.py)."""
+        self.digest = DigestRecorder(every=every)
+        self.digest.sample(self)
+        self.add_listener(self.digest)
+        return self.digest
+
+    def enable_profiler(self, profiler: Optional[TickProfiler] = None) -> TickProfiler:
+        """
+        Chronometre chaque phase du tick (IA, mouvements, collisions, attaques,
+        statuts, nettoyage...). Passer un profiler existant pour cumuler
+        plusieurs parties.
+        """
+        return (profiler or TickProfiler()).attach(self)
+
+    def disable_profiler(self):
+        """Retire le profiler (les compteurs restent lisibles sur l'objet TickProfiler)."""
+        if self.profiler is not None:
+            self.profiler.detach(self)
+
+    def profile_report(self) -> str:
+        """Repartition par phase et ticks/s (voir enable_profiler)."""
+        if self.profiler is None:
+            return "Profilage non active (Engine.enable_profiler)."
+        return self.profiler.report()
+
+    def enable_parallel_decisions(self, mode: str = "process"):
+        """
+        Fait decider les generaux en parallele ("thread" ou "process", voir
+        ai/parallel.py); "sequential" revient au mode par defaut.
+        """
+        self.stop_parallel_decisions()
+        if mode != "sequential":
+            from ai.parallel import ParallelDecider
+            self.decider = ParallelDecider(self, mode)
+        return self.decider
+
+    def stop_parallel_decisions(self):
+        if self.decider is not None:
+            self.decider.close()
+            self.decider = None
+
+    def snapshot(self, token: Optional[EngineSnapshot] = None) -> EngineSnapshot:
+        """
+        Capture l'etat dynamique (positions, HP, cooldowns, vivants, cibles...)
+        dans des buffers preallouees (voir core/snapshot.py). Passer un token
+        existant le reutilise sans allocation.
+        """
+        if token is None:
+            token = EngineSnapshot(self)
+        return token.capture(self)
+
+    def restore(self, token: EngineSnapshot):
+        """Revient a l'etat capture par snapshot(token)."""
+        token.restore(self)
+
+    def record_replay(self, path: str):
+        """
+        Enregistre l'etat courant, la graine puis les actions de chaque tick
+        dans un replay binaire (voir core/replay.py). Ferme par stop_recording
+        (appele a la fin de run_game).
+        """
+        from core.replay import ReplayRecorder
+        self.stop_recording()
+        self.replay_recorder = ReplayRecorder(path, self)
+        return self.replay_recorder
+
+    def stop_recording(self):
+        if self.replay_recorder is not None:
+            self.replay_recorder.close()
+            self.replay_recorder = None
+
+    def _apply_damage(self, attacker: Optional[Unit], target: Unit, amount: int):
+        """Inflige des degats et notifie les listeners (degats reels + mort eventuelle)."""
+        hp_before = target.current_hp
+        target.take_damage(amount)
+        if not self.listeners:
+            return
+        dealt = hp_before - target.current_hp
+        for listener in self.listeners:
+            listener.on_damage(attacker, target, dealt)
+        if not target.is_alive:
+            for listener in self.listeners:
+                listener.on_death(attacker, target)
+
     def _determine_unit_status(self, unit: Unit):
         """Met a jour le statut d'une unite."""
         if not getattr(unit, 'is_alive', True):
@@ -270,8 +459,17 @@ class Engine:
                     pass
 
     def _execute_actions(self, actions: list[Action], dt: float):
-        """Execute les actions (Mouvements, Attaques)."""
+        """
+        Execute les actions (Mouvements, Attaques), phase par phase (chaque
+        phase est une methode: voir core/profiler.py).
+        """
+        self._advance_timers(dt)
+        self._apply_moves(actions, dt)
+        self._apply_attacks(actions)
+        self._apply_monk_actions(actions)
+        self._update_statuses()
 
+    def _advance_timers(self, dt: float):
         # 0. FAIRE AVANCER LE TEMPS (COOLDOWNS)
         # dt est le temps écoulé en secondes depuis la dernière update
         TIME_STEP = dt 
@@ -297,6 +495,7 @@ class Engine:
             except Exception:
                 pass
 
+    def _apply_moves(self, actions: list[Action], dt: float):
         # 1. Mouvements (Prioritaires)
         move_actions = [a for a in actions if a[0] == "move"]
         
@@ -318,6 +517,7 @@ class Engine:
                     pass
                 self._handle_movement(unit, target_pos, dt)
 
+    def _apply_attacks(self, actions: list[Action]):
         # 2. Attaques (Après mouvements)
         for action_type, unit_id, data in actions:
             if action_type == "attack":
@@ -337,7 +537,7 @@ class Engine:
                     # If we are strictly in Attack logic:
                     if unit.can_attack(target) and unit.can_act():
                         final_damage = unit.calculate_damage(target, self.map)
-                        target.take_damage(final_damage)
+                        self._apply_damage(unit, target, final_damage)
                         unit.current_cooldown = unit.reload_time
                         # Déclencher l'animation d'attaque (jouer la ligne complète)
                         try:
@@ -354,7 +554,7 @@ class Engine:
                             nearby = self.map.get_units_in_radius(target.pos, unit.splash_radius)
                             for other in nearby:
                                 if other.is_alive and other != target and other.army_id != unit.army_id:
-                                    other.take_damage(splash_damage)
+                                    self._apply_damage(unit, other, splash_damage)
 
                         # --- Trample Damage (Elite War Elephant) ---
                         if hasattr(unit, 'trample_radius') and unit.trample_radius > 0:
@@ -362,8 +562,9 @@ class Engine:
                             nearby = self.map.get_units_in_radius(unit.pos, unit.trample_radius)
                             for other in nearby:
                                 if other.is_alive and other != target and other.army_id != unit.army_id:
-                                    other.take_damage(trample_dmg)
-        
+                                    self._apply_damage(unit, other, trample_dmg)
+
+    def _apply_monk_actions(self, actions: list[Action]):
         # Actions speciales des Moines (Heal / Conversion)
         for action_type, unit_id, data in actions:
             unit = self.units_by_id.get(unit_id)
@@ -380,8 +581,11 @@ class Engine:
                 if target and target.is_alive and target.army_id == unit.army_id:
                     if unit.can_act():
                         heal_amount = unit.heal_rate
+                        hp_before = target.current_hp
                         target.current_hp = min(target.max_hp, target.current_hp + heal_amount)
                         unit.current_cooldown = unit.reload_time
+                        for listener in self.listeners:
+                            listener.on_heal(unit, target, target.current_hp - hp_before)
             
             elif action_type == "convert":
                 # Tenter de convertir une unité ennemie
@@ -394,8 +598,11 @@ class Engine:
                         old_army_id = target.army_id
                         target.army_id = unit.army_id
                         unit.current_cooldown = getattr(unit, 'conversion_time', 4.0)
+                        for listener in self.listeners:
+                            listener.on_convert(target, old_army_id, target.army_id)
                         print(f"CONVERSION: {unit} a converti {target}!")
 
+    def _update_statuses(self):
         # 4. Final Status Update
         for uid, unit in self.units_by_id.items():
             self._determine_unit_status(unit)
@@ -593,6 +800,7 @@ class Engine:
             'army2': self.armies[1].to_dict(),
             'turn_count': self.turn_count,
             'time_elapsed': self.time_elapsed,
+            'seed': self.seed,
         }
 
     @classmethod
@@ -608,11 +816,19 @@ class Engine:
         army2 = Army.from_dict(data['army2'])
         
         # 3. Engine (re-populate map spatial grid via __init__)
-        engine = cls(game_map, army1, army2)
+        engine = cls(game_map, army1, army2, seed=data.get('seed'))
         
         # 4. Restore state
         engine.turn_count = data['turn_count']
         engine.time_elapsed = data['time_elapsed']
+
+        # 5. __init__ recalcule les stats initiales depuis les survivants: remettre celles sauvegardees
+        for army, army_data in zip(engine.armies, (data['army1'], data['army2'])):
+            stats = army_data.get('initial_stats')
+            if stats:
+                army.initial_count = stats.get('count', army.initial_count)
+                army.initial_total_hp = stats.get('hp', army.initial_total_hp)
+                army.initial_units_breakdown = stats.get('breakdown', army.initial_units_breakdown)
         
         return engine
 
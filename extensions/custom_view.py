@@ -1,7 +1,7 @@
 import pygame
 import os
 from view.gui_view import PygameView, BG_COLOR, RED, GREEN, BLUE, BLACK
-from extensions.custom_units import NatureTree, House, GameCastle
+from extensions.custom_units import House, GameCastle
 
 # Định nghĩa đường dẫn
 ASSET_DIR = "assets/resources"
@@ -12,16 +12,8 @@ NATURE_DIR = os.path.join(ASSET_DIR, "natures")
 class CustomPygameView(PygameView):
     def __init__(self, map_instance, armies):
         super().__init__(map_instance, armies)
-        self.nature_units = []  # Danh sách chứa cây cối (vẽ riêng)
         self._load_custom_sprites()
 
-    def set_nature_units(self, nature_list):
-        """
-        Nhận danh sách cây từ MapBuilder để vẽ.
-        Cây không nằm trong Army để tránh bị tính vào thống kê chiến đấu.
-        """
-        self.nature_units = nature_list
-
     def _load_custom_sprites(self):
         try:
             # 1. Load Buildings (Castle & House)
@@ -72,17 +64,11 @@ class CustomPygameView(PygameView):
         Trả về ảnh tĩnh cho các Unit tùy chỉnh.
         Trả về None nếu là lính thường (để dùng logic sprite của cha).
         """
-        # 1. Cây (NatureTree)
-        if isinstance(unit, NatureTree):
-            t_type = getattr(unit, 'tree_type', 1)
-            variant = getattr(unit, 'variant', 0)
-            return self.tree_images.get(t_type, {}).get(variant, None)
-
-        # 2. Nhà (House)
+        # 1. Nhà (House)
         if isinstance(unit, House):
             return self.custom_images['house1'] if unit.army_id == 0 else self.custom_images['house2']
 
-        # 3. Lâu đài (Castle)
+        # 2. Lâu đài (Castle)
         if isinstance(unit, GameCastle):
             return self.custom_images['castle']
 
@@ -91,27 +77,38 @@ class CustomPygameView(PygameView):
     def draw_units(self, armies):
         """
         Ghi đè hoàn toàn hàm vẽ units để xử lý hỗn hợp:
-        - Custom Units (Ảnh tĩnh): Cây, Nhà, Lâu đài.
+        - Decor tĩnh của Map (Cây): đọc trực tiếp từ map.iter_props().
+        - Custom Units (Ảnh tĩnh): Nhà, Lâu đài.
         - Standard Units (Spritesheet): Lính, Kỵ sĩ.
         """
         visible_units = []
 
-        # 1. Thêm Cây vào danh sách vẽ (Gán army_id giả = 99)
-        for tree in self.nature_units:
-            visible_units.append((99, tree))
+        # 1. Thêm Cây (prop) còn nằm trong màn hình, army_id = None
+        margin = 100 * self.zoom
+        for x, y, kind, variant in self.map.iter_props():
+            screen_x, screen_y = self.cart_to_iso(x, y)
+            if -margin <= screen_x <= self.screen_w + margin and -margin <= screen_y <= self.screen_h + margin:
+                visible_units.append(((float(y), float(x), -1), None, (kind, variant, screen_x, screen_y)))
 
         # 2. Thêm Lính/Nhà từ các Army thực
         for army in armies:
             for unit in army.units:
-                visible_units.append((army.army_id, unit))
+                visible_units.append(((round(unit.pos[1], 1), round(unit.pos[0], 1), unit.unit_id), army.army_id, unit))
 
         # 3. Sắp xếp theo trục Y (Depth Sorting) để vật ở dưới che vật ở trên
         # Sắp xếp theo: Y -> X -> Unit ID
-        visible_units.sort(key=lambda p: (round(p[1].pos[1], 1), round(p[1].pos[0], 1), p[1].unit_id))
+        visible_units.sort(key=lambda p: p[0])
+
+        for _, army_id, unit in visible_units:
+            if army_id is None:
+                kind, variant, screen_x, screen_y = unit
+                tree_img = self.tree_images.get(kind, {}).get(variant)
+                if tree_img:
+                    self._blit_static(tree_img, screen_x, screen_y)
+                continue
 
-        for army_id, unit in visible_units:
             # Bỏ qua unit đã chết (trừ khi là lính đang có animation chết)
-            if not unit.is_alive and isinstance(unit, (NatureTree, House, GameCastle)):
+            if not unit.is_alive and isinstance(unit, (House, GameCastle)):
                 continue
 
             x, y = unit.pos
@@ -129,26 +126,13 @@ class CustomPygameView(PygameView):
             # --- VẼ UNIT ---
             custom_img = self.get_unit_image(unit)
 
-            # TRƯỜNG HỢP 1: CUSTOM UNIT (Cây, Nhà, Lâu đài)
+            # TRƯỜNG HỢP 1: CUSTOM UNIT (Nhà, Lâu đài)
             if custom_img:
-                # Scale ảnh theo zoom
-                if self.zoom != 1.0:
-                    w = int(custom_img.get_width() * self.zoom)
-                    h = int(custom_img.get_height() * self.zoom)
-                    img_to_draw = pygame.transform.scale(custom_img, (w, h))
-                else:
-                    img_to_draw = custom_img
-
-                # Tọa độ vẽ ảnh (top-left của ảnh)
-                # Căn giữa chiều ngang (screen_x) và chân ảnh nằm tại mặt đất (draw_pos_y)
-                draw_x = screen_x - img_to_draw.get_width() // 2
-                draw_y = draw_pos_y - img_to_draw.get_height()
-
-                self.screen.blit(img_to_draw, (draw_x, draw_y))
+                draw_y = self._blit_static(custom_img, screen_x, draw_pos_y)
 
-                # Vẽ thanh máu (Trừ cây)
+                # Vẽ thanh máu
                 # Vị trí: Trên đỉnh đầu ảnh (draw_y) trừ đi khoảng 10px
-                if self.show_hp_bars and not isinstance(unit, NatureTree):
+                if self.show_hp_bars:
                     self._draw_custom_health_bar(unit, screen_x, draw_y - 10)
 
             # TRƯỜNG HỢP 2: STANDARD UNIT (Lính thường - Dùng SpriteSheet)
@@ -194,6 +178,23 @@ class CustomPygameView(PygameView):
                         if self.show_hp_bars:
                             self._draw_custom_health_bar(unit, screen_x, draw_pos_y - 30)
 
+    def _blit_static(self, img, screen_x, ground_y):
+        """
+        Vẽ ảnh tĩnh (scale theo zoom), căn giữa ngang tại screen_x và chân ảnh
+        nằm tại mặt đất (ground_y). Trả về tọa độ y của đỉnh ảnh.
+        """
+        # Scale ảnh theo zoom
+        if self.zoom != 1.0:
+            w = int(img.get_width() * self.zoom)
+            h = int(img.get_height() * self.zoom)
+            img = pygame.transform.scale(img, (w, h))
+
+        # Tọa độ vẽ ảnh (top-left của ảnh)
+        draw_x = screen_x - img.get_width() // 2
+        draw_y = ground_y - img.get_height()
+        self.screen.blit(img, (draw_x, draw_y))
+        return draw_y
+
     def _draw_custom_health_bar(self, unit, x, y):
         """
         Vẽ thanh máu tại tọa độ (x, y).
@@ -1,19 +1,24 @@
-import random
 from core.map import Map
+from core.rng import get_rng
 from core.unit import Knight, Pikeman, Crossbowman
-from extensions.custom_units import GameCastle, House, NatureTree
+from extensions.custom_units import GameCastle, House
 
 
-def create_battle_map(width=80, height=80):
+def create_battle_map(width=80, height=80, rng=None):
+    """
+    Tạo map huấn luyện với cây là decor tĩnh (Map.add_prop): không tạo Unit,
+    View vẽ trực tiếp từ map, Engine coi ô có cây là vật cản.
+    rng: random.Random (mặc định: luồng "map" của core.rng, seed qua seed_all).
+    """
+    rng = rng or get_rng("map")
     game_map = Map(width, height)
-    tree_list = []  # Danh sách chứa object cây để View vẽ
 
     # Số lượng cây
     num_trees = 300
 
     for i in range(num_trees):
-        tx = random.randint(0, width - 1)
-        ty = random.randint(0, height - 1)
+        tx = rng.randint(0, width - 1)
+        ty = rng.randint(0, height - 1)
 
         # Tránh spawn đè lên vùng căn cứ 2 đội (Góc 15,15 và 105,105 hoặc tùy size map)
         margin = 10
@@ -22,27 +27,22 @@ def create_battle_map(width=80, height=80):
 
         # Logic chọn loại cây (Visual)
         if tx < width / 2:
-            tree_type = random.choice([1, 2])
+            tree_type = rng.choice([1, 2])
         else:
-            tree_type = random.choice([3, 4])
+            tree_type = rng.choice([3, 4])
 
-        variant = random.randint(0, 6)
+        variant = rng.randint(0, 6)
 
-        # Tạo Unit Cây (Lưu ý: army_id=None để biết nó không thuộc phe nào)
-        tree = NatureTree(unit_id=900000 + i, army_id=None, pos=(float(tx), float(ty)), tree_type=tree_type,
-                          variant=variant)
-        tree_list.append(tree)
+        # QUAN TRỌNG: Prop là vật cản, Engine tìm đường sẽ dựa vào cái này
+        game_map.add_prop(tree_type, tx, ty, variant)
 
-        # QUAN TRỌNG: Đánh dấu lên Map đây là vật cản
-        # Engine tìm đường sẽ dựa vào cái này
-        if 0 <= tx < width and 0 <= ty < height:
-            game_map.add_obstacle("tree", tx, ty)
+    return game_map
 
-    return game_map, tree_list
 
-
-def generate_army_composition(army_id, start_x, start_y, total_units=50):
+def generate_army_composition(army_id, start_x, start_y, total_units=50, rng=None):
     # (Giữ nguyên code cũ của bạn)
+    # rng: mặc định luồng "armies" của core.rng
+    rng = rng or get_rng("armies")
     units = []
     base_id = army_id * 10000
 
@@ -57,9 +57,9 @@ def generate_army_composition(army_id, start_x, start_y, total_units=50):
 
     unit_types = [Knight, Pikeman, Crossbowman]
     for i in range(total_units):
-        u_class = random.choice(unit_types)
-        ux = start_x + random.uniform(-10, 10)
-        uy = start_y + random.uniform(-10, 10)
+        u_class = rng.choice(unit_types)
+        ux = start_x + rng.uniform(-10, 10)
+        uy = start_y + rng.uniform(-10, 10)
         # Chỉnh lại tọa độ một chút để không kẹt vào nhà
         unit = u_class(base_id + 100 + i, army_id, (ux, uy))
         units.append(unit)
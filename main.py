@@ -8,6 +8,14 @@ Usage:
     battle tourney -G <AI1> <AI2> ... -S <SCEN1> <SCEN2> ... [-N=10]
     battle plot <AI> <plotter> <scenario> <range>
     battle lanchester <unit_type> <N> [-t]
+    battle replay <file.replay> [-t] [--headless] [--start TICK]
+    battle verify-digest <scenario> <AI1> <AI2> [--engine-a M:C] [--engine-b M:C] [-K 10]
+    battle bench run [CAS ...] [-o results.json] [--save-baseline [B]] | battle bench compare [results.json] [--baseline B]
+    battle bench micro [BENCH ...] [-o micro_results.json] [--calls 2000] [--save-baseline [B]]
+    battle bench ai [GENERAL ...] [--sizes 10,100,1000] [--source save.json] [--warmup 60]
+    battle bench render [pygame|terminal] [--units 1000] [--replay file.replay] [--frames 60]
+    battle bench startup [main|tourney|train|bench] [--scale 1.0]
+    battle export <save.bsav|save.json> [-o save.json]
     battle match --map-size 150 --units 100 --maxturn -1
     battle train --episodes 1000 --map-size 80
 """
@@ -18,17 +26,16 @@ from typing import Optional
 import importlib.util
 
 # --- Import de nos modules de jeu ---
+# Seul le coeur headless est importe ici: main.py est reimporte par chaque
+# processus lance en "spawn" (tournoi, entrainement, benchmarks). Les vues
+# (pygame, PIL, curses), matplotlib et les outils propres a une commande sont
+# importes par les fonctions qui s'en servent (voir `bench startup`).
 from core.map import Map
 from core.army import Army
 from engine import Engine
-from view.terminal_view import TerminalView
-from view.gui_view import PygameView
 from utils.serialization import save_game, load_game
-from scripts.tournament import Tournament
-from utils.loaders import load_map_from_file, load_army_from_file
 from core.definitions import GENERAL_CLASS_MAP, UNIT_CLASS_MAP
-from scripts.run_scenario import lanchester_scenario, custom_battle_scenario
-from utils.generators import generate_map_file, generate_army_file
+from core.rng import seed_all, new_seed
 
 
 def load_game_from_save(filepath: str) -> Engine:
@@ -72,6 +79,10 @@ Exemples d'utilisation:
                              help="Nombre max de ticks (approx 3 min)")
     play_parser.add_argument("--map-size", type=str, default="120x120",
                              help="Taille de la carte (ex: 60x60, 120x120...)")
+    play_parser.add_argument("--seed", type=int, default=None,
+                             help="Graine de la partie (défaut: aléatoire, affichée)")
+    play_parser.add_argument("--profile", action="store_true",
+                             help="Affiche la répartition du temps par phase du tick et les ticks/s à la fin")
 
     # =========================================================================
     # Commande: MATCH (Demo RL Match with Custom Args)
@@ -90,13 +101,42 @@ Exemples d'utilisation:
     train_parser.add_argument("--episodes", type=int, default=500, help="Number of training episodes")
     train_parser.add_argument("--map-size", type=int, default=80, help="Training map size")
     train_parser.add_argument("--units", type=int, default=40, help="Units per team for training")
+    train_parser.add_argument("--workers", type=int, default=0,
+                              help="Number of local worker processes (distributed backend)")
+    train_parser.add_argument("--listen", type=str, default=None,
+                              help="Coordinator address for remote workers (e.g. :5555)")
+    train_parser.add_argument("--envs", type=int, default=0,
+                              help="Number of battles stepped in lockstep (VecBattleEnv)")
+    train_parser.add_argument("--env-workers", type=int, default=0,
+                              help="Worker processes for the VecBattleEnv battles (0 = in-process)")
+    train_parser.add_argument("--rollout-workers", type=int, default=0,
+                              help="Rollout processes playing episodes on a Q-table snapshot")
+    train_parser.add_argument("--sync-every", type=int, default=None,
+                              help="Episodes between Q-table snapshot broadcasts (default: rollout workers)")
+    train_parser.add_argument("--decision-interval", type=int, default=1,
+                              help="Ticks between RL commander decisions (orders are repeated in between)")
+    train_parser.add_argument("--decide-on-change", action="store_true",
+                              help="Also decide as soon as the RL state key changes")
+    train_parser.add_argument("--resume", action="store_true",
+                              help="Resume from the latest checkpoint in ai/rl/models/checkpoints")
+    train_parser.add_argument("--telemetry", type=str, default="ai/rl/models/training_log.jsonl",
+                              help="Per-episode metrics file (.jsonl or .csv, 'none' to disable)")
+    train_parser.add_argument("--profile", action="store_true",
+                              help="Print a per-phase tick time breakdown and ticks/sec at the end")
+
+    # Usage: python main.py train-report ai/rl/models/training_log.jsonl -o chart.png
+    report_parser = subparsers.add_parser("train-report", help="Plot a training telemetry file")
+    report_parser.add_argument("path", type=str, nargs="?", default="ai/rl/models/training_log.jsonl",
+                               help="Telemetry file written by 'train'")
+    report_parser.add_argument("-o", "--output", type=str, default=None,
+                               help="Output image (default: <path>.png)")
 
     # =========================================================================
     # Commande: battle run <scenario> <AI1> <AI2> [-t] [-d DATAFILE]
     # =========================================================================
     run_parser = subparsers.add_parser("run", help="Lancer une bataille unique")
     run_parser.add_argument("scenario", type=str,
-                            help="Chemin vers le scénario (.scen, .py ou .map + armées)")
+                            help="Chemin vers le scénario (.scen, .bscen, .py ou .map + armées)")
     run_parser.add_argument("AI1", type=str,
                             help="Nom du général de l'armée 1 (ex: MajorDAFT)")
     run_parser.add_argument("AI2", type=str,
@@ -111,6 +151,14 @@ Exemples d'utilisation:
                             help="Fichier armée 2 (optionnel si scénario .py)")
     run_parser.add_argument("--max_turns", type=int, default=1000,
                             help="Nombre maximum de ticks (defaut: 1000)")
+    run_parser.add_argument("--seed", type=int, default=None,
+                            help="Graine de la partie: même scénario + généraux + graine = même bataille")
+    run_parser.add_argument("--record", type=str, default=None,
+                            help="Enregistrer le flux d'actions dans un replay binaire (voir 'replay')")
+    run_parser.add_argument("--decisions", choices=["sequential", "thread", "process"], default="sequential",
+                            help="Décisions des deux généraux en parallèle (process: un worker par armée)")
+    run_parser.add_argument("--profile", action="store_true",
+                            help="Affiche la répartition du temps par phase du tick et les ticks/s à la fin")
 
     # =========================================================================
     # Commande: battle tourney [-G AI1 AI2 ...] [-S SCENARIO1 ...] [-N=10] [-na]
@@ -126,6 +174,37 @@ Exemples d'utilisation:
                                 help="Nombre de rounds par matchup (défaut: 10)")
     tourney_parser.add_argument("-na", "--no-alternate", action="store_true",
                                 help="Ne pas alterner les positions (joueur 0/1)")
+    tourney_parser.add_argument("--workers", type=int, default=0,
+                                help="Nombre de workers locaux (backend distribué)")
+    tourney_parser.add_argument("--listen", type=str, default=None,
+                                help="Adresse du coordinateur pour workers distants (ex: :5555)")
+    tourney_parser.add_argument("--seed", type=int, default=None,
+                                help="Graine du tournoi (une graine dérivée par match, enregistrée)")
+    tourney_parser.add_argument("--record", type=str, default=None,
+                                help="Dossier où enregistrer le replay de chaque match (mode local)")
+    tourney_parser.add_argument("--profile", action="store_true",
+                                help="Affiche la répartition du temps par phase du tick (tous les matchs) et les ticks/s")
+
+    # =========================================================================
+    # Commande: battle replay <file.replay> [-t] [--headless] [--start TICK]
+    # =========================================================================
+    replay_parser = subparsers.add_parser("replay", help="Rejouer un replay enregistré (sans généraux)")
+    replay_parser.add_argument("file", type=str, help="Fichier replay (run/tourney --record)")
+    replay_parser.add_argument("-t", "--terminal", action="store_true",
+                               help="Mode terminal ASCII (défaut: mode 2.5D Pygame)")
+    replay_parser.add_argument("--headless", action="store_true",
+                               help="Sans vue, à vitesse maximale (affiche le résultat)")
+    replay_parser.add_argument("--start", type=int, default=0,
+                               help="Avancer sans vue jusqu'à ce tick avant d'ouvrir la vue")
+
+    # =========================================================================
+    # Commande: battle worker --connect HOST:PORT
+    # =========================================================================
+    worker_parser = subparsers.add_parser("worker", help="Worker headless pour tournois/entraînement distribués")
+    worker_parser.add_argument("--connect", type=str, default="127.0.0.1:5555",
+                               help="Adresse du coordinateur (HOST:PORT)")
+    worker_parser.add_argument("--name", type=str, default=None,
+                               help="Nom du worker (défaut: hôte-pid)")
 
     # =========================================================================
     # Commande: battle plot <AI> <plotter> <scenario> <range>
@@ -139,6 +218,101 @@ Exemples d'utilisation:
                              help="Range Python (ex: 'range(5, 50, 5)') - utilise eval()")
     plot_parser.add_argument("--opponent", type=str, default="MajorDAFT",
                              help="Adversaire pour les tests (défaut: MajorDAFT)")
+    plot_parser.add_argument("-K", "--seeds", type=int, default=5,
+                             help="Nombre de seeds par valeur de N (défaut: 5)")
+    plot_parser.add_argument("-j", "--jobs", type=int, default=None,
+                             help="Processus parallèles (défaut: nombre de coeurs)")
+    plot_parser.add_argument("--no-cache", action="store_true",
+                             help="Ignorer le cache des résultats (cache/lanchester_sweep.json)")
+    plot_parser.add_argument("--analytical", action="store_true",
+                             help="Superposer la prédiction du modèle de Lanchester (core/lanchester.py)")
+
+    # =========================================================================
+    # Commande: battle verify-digest <scenario> <AI1> <AI2> [--engine-a] [--engine-b]
+    # =========================================================================
+    digest_parser = subparsers.add_parser("verify-digest",
+                                          help="Comparer deux configurations du moteur tick par tick")
+    digest_parser.add_argument("scenario", type=str, help="Scénario .scen ou .map")
+    digest_parser.add_argument("AI1", type=str, help="Général de l'armée 1")
+    digest_parser.add_argument("AI2", type=str, help="Général de l'armée 2")
+    digest_parser.add_argument("--engine-a", type=str, default="engine:Engine",
+                               help="Moteur de référence 'module:Classe' (défaut: engine:Engine)")
+    digest_parser.add_argument("--engine-b", type=str, default="engine:Engine",
+                               help="Moteur à vérifier 'module:Classe'")
+    digest_parser.add_argument("-K", "--every", type=int, default=10,
+                               help="Digest tous les K ticks (défaut: 10)")
+    digest_parser.add_argument("--seed", type=int, default=0, help="Graine commune (défaut: 0)")
+    digest_parser.add_argument("--max_turns", type=int, default=2000, help="Nombre maximum de ticks")
+    digest_parser.add_argument("-A", "--army", type=str, default=None,
+                               help="Fichier armée (scénarios .map)")
+    digest_parser.add_argument("--save", type=str, default=None,
+                               help="Sauvegarder le flux de digests de --engine-b (référence CI)")
+    digest_parser.add_argument("--against", type=str, default=None,
+                               help="Comparer --engine-b à un flux sauvegardé au lieu de --engine-a")
+
+    # =========================================================================
+    # Commande: battle bench run|compare
+    # =========================================================================
+    bench_parser = subparsers.add_parser("bench", help="Benchmarks du moteur (débit, IA, mémoire)")
+    bench_subparsers = bench_parser.add_subparsers(dest="bench_command")
+    bench_run_parser = bench_subparsers.add_parser("run", help="Jouer la suite de benchmarks")
+    bench_run_parser.add_argument("cases", nargs="*", help="Cas à jouer (défaut: tous)")
+    bench_run_parser.add_argument("-o", "--output", type=str, default="benchmarks/results.json",
+                                  help="Fichier JSON des résultats (défaut: benchmarks/results.json)")
+    bench_run_parser.add_argument("--seed", type=int, default=1234, help="Graine des batailles (défaut: 1234)")
+    bench_run_parser.add_argument("--no-isolate", action="store_true",
+                                  help="Tout jouer dans ce processus (pic RSS non isolé par cas)")
+    bench_run_parser.add_argument("--list", action="store_true", help="Lister les cas disponibles")
+    bench_run_parser.add_argument("--save-baseline", nargs="?", const="benchmarks/baseline.json", default=None,
+                                  metavar="BASELINE",
+                                  help="Enregistrer aussi les cas joués comme référence "
+                                       "(défaut: benchmarks/baseline.json)")
+    bench_micro_parser = bench_subparsers.add_parser("micro",
+                                                     help="Micro-benchmarks (requêtes spatiales, méthodes des unités)")
+    bench_micro_parser.add_argument("benches", nargs="*", help="Benchmarks à jouer (défaut: tous)")
+    bench_micro_parser.add_argument("-o", "--output", type=str, default="benchmarks/micro_results.json",
+                                    help="Fichier JSON des résultats (défaut: benchmarks/micro_results.json)")
+    bench_micro_parser.add_argument("--seed", type=int, default=1234, help="Graine des placements (défaut: 1234)")
+    bench_micro_parser.add_argument("--calls", type=int, default=2000, help="Appels par répétition (défaut: 2000)")
+    bench_micro_parser.add_argument("--list", action="store_true", help="Lister les benchmarks disponibles")
+    bench_micro_parser.add_argument("--save-baseline", nargs="?", const="benchmarks/micro_baseline.json",
+                                    default=None, metavar="BASELINE",
+                                    help="Enregistrer aussi les résultats comme référence "
+                                         "(défaut: benchmarks/micro_baseline.json)")
+    bench_ai_parser = bench_subparsers.add_parser("ai", help="Coût de décision de chaque général selon la taille des armées")
+    bench_ai_parser.add_argument("generals", nargs="*", help="Généraux à mesurer (défaut: tous, RLCommander compris)")
+    bench_ai_parser.add_argument("--sizes", type=str, default="10,50,100,500,1000,5000",
+                                 help="Tailles d'armée (défaut: 10,50,100,500,1000,5000)")
+    bench_ai_parser.add_argument("--source", type=str, default=None,
+                                 help="Sauvegarde (.json, .bsav) ou scénario dont figer l'état (défaut: bataille générée)")
+    bench_ai_parser.add_argument("--warmup", type=int, default=0, help="Ticks joués avant de figer l'état")
+    bench_ai_parser.add_argument("--calls", type=int, default=20, help="Appels de decide_actions par point (défaut: 20)")
+    bench_ai_parser.add_argument("--seed", type=int, default=1234, help="Graine (défaut: 1234)")
+    bench_ai_parser.add_argument("-o", "--output", type=str, default="benchmarks/ai_cost_results.json",
+                                 help="Fichier JSON des résultats (défaut: benchmarks/ai_cost_results.json)")
+    bench_render_parser = bench_subparsers.add_parser("render", help="Temps de rendu hors écran (Pygame, terminal)")
+    bench_render_parser.add_argument("views", nargs="*", choices=["pygame", "terminal"], default=[],
+                                     help="Vues à mesurer (défaut: les deux)")
+    bench_render_parser.add_argument("--units", type=int, default=1000, help="Unités de la bataille générée (défaut: 1000)")
+    bench_render_parser.add_argument("--replay", type=str, default=None,
+                                     help="Rejouer un .replay au lieu de générer la bataille")
+    bench_render_parser.add_argument("--frames", type=int, default=60, help="Frames par parcours de caméra (défaut: 60)")
+    bench_render_parser.add_argument("--seed", type=int, default=1234, help="Graine (défaut: 1234)")
+    bench_render_parser.add_argument("-o", "--output", type=str, default="benchmarks/render_results.json",
+                                     help="Fichier JSON des résultats (défaut: benchmarks/render_results.json)")
+    bench_startup_parser = bench_subparsers.add_parser("startup",
+                                                       help="Budget d'import des commandes headless (-X importtime)")
+    bench_startup_parser.add_argument("targets", nargs="*", help="Cibles (défaut: main, tourney, train, bench)")
+    bench_startup_parser.add_argument("--scale", type=float, default=1.0,
+                                      help="Multiplie les budgets (machine plus lente)")
+    bench_compare_parser = bench_subparsers.add_parser("compare",
+                                                       help="Comparer des résultats à une référence")
+    bench_compare_parser.add_argument("results", nargs="?", default="benchmarks/results.json",
+                                      help="Résultats à vérifier (défaut: benchmarks/results.json)")
+    bench_compare_parser.add_argument("--baseline", type=str, default="benchmarks/baseline.json",
+                                      help="Référence (défaut: benchmarks/baseline.json)")
+    bench_compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                      help="Dégradation tolérée par métrique (défaut: 0.10 = 10%%)")
 
     # =========================================================================
     # Commande: battle lanchester <unit_type> <N> [-t]
@@ -155,6 +329,8 @@ Exemples d'utilisation:
                                    help="Général à utiliser (défaut: MajorDAFT)")
     lanchester_parser.add_argument("--max_turns", type=int, default=1000,
                                    help="Nombre maximum de ticks")
+    lanchester_parser.add_argument("--metrics-csv", type=str, default=None,
+                                   help="Exporter les séries (vivants, HP, dégâts, kills) en CSV")
 
     # =========================================================================
     # Commande legacy: battle (ancien format avec --map, --army1, etc.)
@@ -170,6 +346,14 @@ Exemples d'utilisation:
     legacy_parser.add_argument("--max_turns", type=int, default=1000)
     legacy_parser.add_argument("--save_path", type=str, default=None)
 
+    # =========================================================================
+    # Commande: battle export <sauvegarde> [-o sortie]
+    # =========================================================================
+    export_parser = subparsers.add_parser("export", help="Convertir une sauvegarde (binaire .bsav <-> JSON)")
+    export_parser.add_argument("save", type=str, help="Sauvegarde à convertir (.bsav ou .json)")
+    export_parser.add_argument("-o", "--output", type=str, default=None,
+                               help="Fichier produit, format selon l'extension (défaut: même nom en .json)")
+
     # =========================================================================
     # Commande: battle create <type> <filename> [options]
     # =========================================================================
@@ -191,6 +375,20 @@ Exemples d'utilisation:
     army_parser.add_argument("--map_size", type=str, default="60x60", help="Taille de la carte (ex: '60x60')")
     army_parser.add_argument("--id", type=int, default=0, help="ID de l'armée (0=Haut/Gauche, 1=Bas/Droite)")
 
+    # battle create stress
+    stress_parser = create_subparsers.add_parser("stress", help="Créer un scénario de stress (jusqu'à 100k unités)")
+    stress_parser.add_argument("filename", type=str, help="Fichier scénario (.scen texte ou .bscen binaire)")
+    stress_parser.add_argument("--units", type=int, default=5000, help="Unités par armée")
+    stress_parser.add_argument("--mix", type=str, default="Knight:0.4,Pikeman:0.4,Crossbowman:0.2",
+                               help="Mélange d'unités (poids, ex: 'Knight:0.5,Pikeman:0.5')")
+    stress_parser.add_argument("--formation", type=str, default="blocks",
+                               choices=["blocks", "lines", "scatter"], help="Forme des formations")
+    stress_parser.add_argument("--obstacles", type=float, default=0.0,
+                               help="Densité d'obstacles dans le no man's land (0.0 - 1.0)")
+    stress_parser.add_argument("--map_size", type=str, default=None,
+                               help="Taille de la carte (ex: '400x400', défaut: selon le nombre d'unités)")
+    stress_parser.add_argument("--seed", type=int, default=None, help="Graine de génération")
+
     # Parse arguments
     parsed_args = parser.parse_args(args)
 
@@ -206,11 +404,39 @@ Exemples d'utilisation:
 
     elif parsed_args.command == "train":
         from rl_modules.trainer import train_agent
-        train_agent(
-            num_episodes=parsed_args.episodes,
-            map_size=parsed_args.map_size,
-            units_per_team=parsed_args.units
-        )
+        from scripts.distributed import open_coordinator
+        coordinator = open_coordinator(parsed_args.listen, parsed_args.workers)
+        try:
+            train_agent(
+                num_episodes=parsed_args.episodes,
+                map_size=parsed_args.map_size,
+                units_per_team=parsed_args.units,
+                coordinator=coordinator,
+                num_envs=parsed_args.envs,
+                env_workers=parsed_args.env_workers,
+                rollout_workers=parsed_args.rollout_workers,
+                sync_every=parsed_args.sync_every,
+                decision_interval=parsed_args.decision_interval,
+                decide_on_change=parsed_args.decide_on_change,
+                resume=parsed_args.resume,
+                telemetry=None if parsed_args.telemetry.lower() == "none" else parsed_args.telemetry,
+                profile=parsed_args.profile
+            )
+        finally:
+            if coordinator:
+                coordinator.close()
+
+    elif parsed_args.command == "train-report":
+        from rl_modules.telemetry import render_report
+        output = render_report(parsed_args.path, parsed_args.output)
+        print(f"Graphique sauvegardé: {output}")
+
+    elif parsed_args.command == "worker":
+        from scripts.distributed import main as worker_main
+        worker_args = ["--connect", parsed_args.connect]
+        if parsed_args.name:
+            worker_args += ["--name", parsed_args.name]
+        worker_main(worker_args)
 
     elif parsed_args.command == "play":
         run_play(parsed_args)
@@ -222,6 +448,14 @@ Exemples d'utilisation:
         run_plot(parsed_args)
     elif parsed_args.command == "lanchester":
         run_lanchester(parsed_args)
+    elif parsed_args.command == "replay":
+        run_replay(parsed_args)
+    elif parsed_args.command == "verify-digest":
+        run_verify_digest(parsed_args)
+    elif parsed_args.command == "bench":
+        run_bench(parsed_args)
+    elif parsed_args.command == "export":
+        run_export(parsed_args)
     elif parsed_args.command == "create":
         run_create(parsed_args)
     elif parsed_args.command == "legacy":
@@ -234,11 +468,16 @@ def run_battle(args):
     """
     Execute une bataille.
     """
+    from utils.loaders import load_map_from_file, load_army_from_file
+    from scripts.run_scenario import custom_battle_scenario
+
     print("--- Bataille ---")
     print(f"Scénario: {args.scenario}")
     print(f"Général 1: {args.AI1}")
     print(f"Général 2: {args.AI2}")
     print(f"Mode: {'Terminal' if args.terminal else 'Pygame 2.5D'}")
+    seed = seed_all(args.seed if args.seed is not None else new_seed())
+    print(f"Graine: {seed}")
 
     # Vérifier les généraux
     if args.AI1 not in GENERAL_CLASS_MAP:
@@ -254,7 +493,7 @@ def run_battle(args):
 
     # Charger le scénario
     # Cas 1: Unified Scenario (.scen) ou détection de contenu
-    is_unified = False
+    is_unified = args.scenario.endswith('.bscen')
     if args.scenario.endswith('.scen') or args.scenario.endswith('.txt'):
         # Check simple de contenu pour différencier d'un simple fichier armée
         # (Pas parfait mais suffisant pour le prototype)
@@ -321,22 +560,35 @@ def run_battle(args):
             print(f"Erreur lors du chargement du scénario Python: {e}")
             sys.exit(1)
 
-    engine = Engine(game_map, army1, army2)
+    engine = Engine(game_map, army1, army2, seed=seed)
+    if args.record:
+        engine.record_replay(args.record)
+        print(f"Replay: {args.record}")
+    if args.decisions != "sequential":
+        engine.enable_parallel_decisions(args.decisions)
+    if args.profile:
+        engine.enable_profiler()
 
     # Choix de la vue
     view = None
     if args.terminal:
+        from view.terminal_view import TerminalView
         view = TerminalView(engine.map)
     else:
+        from view.gui_view import PygameView
         view = PygameView(engine.map, [army1, army2])
 
     try:
         engine.run_game(max_turns=args.max_turns, view=view)
     except KeyboardInterrupt:
         print("\nSimulation interrompue.")
+    finally:
+        engine.stop_parallel_decisions()
+    if args.profile:
+        print(engine.profile_report())
 
     # Sauvegarde si demandé
-    if args.datafile and args.datafile.endswith('.sav'):
+    if args.datafile and args.datafile.endswith(('.sav', '.json', '.bsav')):
         save_game(engine, args.datafile)
 
 
@@ -345,6 +597,7 @@ def run_tourney(args):
     Execute un tournoi automatique.
     """
     import glob
+    from scripts.tournament import Tournament
 
     print("=" * 60)
     print("Tournoi Automatique")
@@ -394,14 +647,213 @@ def run_tourney(args):
         print("\n")
     print("=" * 60)
 
+    from scripts.distributed import open_coordinator
+    coordinator = open_coordinator(args.listen, args.workers)
+
     tournament = Tournament(
         generals,
         scenarios,
         rounds=args.rounds,
         alternate_positions=not args.no_alternate,
-        army_file=args.army
+        army_file=args.army,
+        coordinator=coordinator,
+        seed=args.seed,
+        record_dir=args.record,
+        profile=args.profile
     )
-    tournament.run()
+    try:
+        tournament.run()
+    finally:
+        if coordinator:
+            coordinator.close()
+
+
+def run_replay(args):
+    """
+    Rejoue un flux d'actions enregistré, sans appeler aucun général.
+    """
+    import time
+    from core.replay import ReplayEngine
+
+    engine = ReplayEngine.load(args.file)
+    generals = [army.general.__class__.__name__ for army in engine.armies]
+    print(f"Replay: {args.file} | {generals[0]} vs {generals[1]} | "
+          f"{len(engine.replay_ticks)} ticks | graine {engine.seed}")
+
+    if args.headless:
+        start = time.perf_counter()
+        while engine.step(0.0):
+            pass
+        elapsed = time.perf_counter() - start
+        alive = [sum(1 for u in army.units if u.is_alive) for army in engine.armies]
+        winner = f"Armée {engine.winner + 1}" if engine.winner is not None else "Egalité"
+        print(f"Résultat: {winner} | {engine.turn_count} ticks | vivants {alive} | "
+              f"{engine.turn_count / max(elapsed, 1e-9):.0f} ticks/s")
+        return
+
+    if args.start > 0:
+        engine.fast_forward(args.start)
+        print(f"Avance rapide jusqu'au tick {engine.turn_count}")
+
+    if args.terminal:
+        from view.terminal_view import TerminalView
+        view = TerminalView(engine.map)
+    else:
+        from view.gui_view import PygameView
+        view = PygameView(engine.map, engine.armies)
+    try:
+        remaining = len(engine.replay_ticks) - engine.replay_cursor
+        engine.run_game(max_turns=engine.turn_count + remaining, view=view, logic_speed=1 if args.terminal else 2)
+    except KeyboardInterrupt:
+        print("\nReplay interrompu.")
+
+
+def run_verify_digest(args):
+    """
+    Vérifie que deux configurations du moteur produisent le même état
+    (digests tous les K ticks) et affiche le premier tick divergent.
+    """
+    from core.digest import DigestRecorder, first_divergence
+    from scripts.verify_digest import verify_digest, run_digest
+
+    for name in (args.AI1, args.AI2):
+        if name not in GENERAL_CLASS_MAP:
+            print(f"Erreur: Général inconnu '{name}'")
+            sys.exit(1)
+
+    if args.against:
+        reference = DigestRecorder.load(args.against)
+        digests = run_digest(args.engine_b, args.scenario, args.AI1, args.AI2, seed=args.seed,
+                             every=reference.every, max_turns=args.max_turns, army_file=args.army)
+        diverged_at = first_divergence(reference, digests)
+        label = f"{args.against} vs {args.engine_b}"
+    else:
+        result = verify_digest(args.scenario, args.AI1, args.AI2, args.engine_a, args.engine_b,
+                               seed=args.seed, every=args.every, max_turns=args.max_turns,
+                               army_file=args.army)
+        digests = result["digests"][1]
+        diverged_at = result["diverged_at"]
+        label = f"{args.engine_a} vs {args.engine_b}"
+
+    if args.save:
+        digests.save(args.save)
+        print(f"Digests sauvegardés: {args.save}")
+
+    last_tick = digests.ticks[-1] if len(digests) else 0
+    if diverged_at is None:
+        print(f"OK: {label} identiques ({len(digests)} digests, jusqu'au tick {last_tick})")
+    else:
+        print(f"DIVERGENCE: {label} au tick {diverged_at}")
+        sys.exit(1)
+
+
+def run_bench(args):
+    """
+    bench run: joue la suite (benchmarks/suite.py) et écrit les résultats.
+    bench micro: micro-benchmarks (benchmarks/micro.py), même format de résultats.
+    bench ai: coût de décision par général et taille d'armée (benchmarks/ai_cost.py).
+    bench render: temps de rendu par phase, sans affichage (benchmarks/render.py).
+    bench startup: code de sortie 1 si une commande headless dépasse son budget d'import.
+    bench compare: code de sortie 1 si une métrique régresse au-delà du seuil.
+    """
+    from benchmarks.suite import (CASES, run_suite, save_results, save_baseline, load_results, compare,
+                                  format_comparison)
+
+    if args.bench_command == "run":
+        if args.list:
+            for name, (_, ticks) in CASES.items():
+                print(f"  {name} ({ticks} ticks)")
+            return
+        try:
+            results = run_suite(args.cases or None, seed=args.seed, isolate=not args.no_isolate)
+        except ValueError as e:
+            print(f"Erreur: {e}")
+            sys.exit(1)
+        save_results(results, args.output)
+        print(f"Résultats: {args.output}")
+        if args.save_baseline:
+            save_baseline(results, args.save_baseline)
+            print(f"Référence: {args.save_baseline}")
+
+    elif args.bench_command == "micro":
+        from benchmarks.micro import BENCHES, run_micro, format_micro
+        if args.list:
+            for name, (_, params) in BENCHES.items():
+                print(f"  {name} ({', '.join(params) or 'sans paramètre'})")
+            return
+        try:
+            results = run_micro(args.benches or None, seed=args.seed, calls=args.calls)
+        except ValueError as e:
+            print(f"Erreur: {e}")
+            sys.exit(1)
+        print(format_micro(results))
+        save_results(results, args.output)
+        print(f"Résultats: {args.output}")
+        if args.save_baseline:
+            save_baseline(results, args.save_baseline)
+            print(f"Référence: {args.save_baseline}")
+
+    elif args.bench_command == "ai":
+        from benchmarks.ai_cost import run_ai_cost, format_ai_cost
+        try:
+            sizes = tuple(int(size) for size in args.sizes.split(','))
+        except ValueError:
+            print("Erreur: Format sizes incorrect (utiliser '10,100,1000')")
+            sys.exit(1)
+        if args.source and not os.path.exists(args.source):
+            print(f"Erreur: fichier introuvable '{args.source}'")
+            sys.exit(1)
+        try:
+            results = run_ai_cost(args.generals or None, sizes, args.source, args.seed, args.warmup, args.calls)
+        except ValueError as e:
+            print(f"Erreur: {e}")
+            sys.exit(1)
+        print(format_ai_cost(results))
+        save_results(results, args.output)
+        print(f"Résultats: {args.output}")
+
+    elif args.bench_command == "render":
+        from benchmarks.render import run_render, format_render
+        if args.replay and not os.path.exists(args.replay):
+            print(f"Erreur: fichier introuvable '{args.replay}'")
+            sys.exit(1)
+        results = run_render(tuple(args.views) or ("pygame", "terminal"), args.units, args.replay,
+                             args.seed, args.frames)
+        print(format_render(results))
+        save_results(results, args.output)
+        print(f"Résultats: {args.output}")
+
+    elif args.bench_command == "startup":
+        from benchmarks.startup import run_startup, format_startup
+        try:
+            results = run_startup(args.targets or None, args.scale)
+        except ValueError as e:
+            print(f"Erreur: {e}")
+            sys.exit(1)
+        print(format_startup(results))
+        if not all(metrics["ok"] for metrics in results["cases"].values()):
+            sys.exit(1)
+
+    elif args.bench_command == "compare":
+        for path in (args.results, args.baseline):
+            if not os.path.exists(path):
+                print(f"Erreur: fichier introuvable '{path}'")
+                if path == args.baseline:
+                    print("La référence dépend de la machine et n'est pas versionnée : "
+                          "la créer avec `bench run --save-baseline` (ou `bench micro --save-baseline`).")
+                sys.exit(1)
+        rows = compare(load_results(args.results), load_results(args.baseline), args.threshold)
+        print(format_comparison(rows))
+        regressions = [row for row in rows if row["regression"]]
+        if regressions:
+            print(f"\n{len(regressions)} régression(s) au-delà de {args.threshold:.0%}")
+            sys.exit(1)
+        print(f"\nOK: aucune régression au-delà de {args.threshold:.0%}")
+
+    else:
+        print("Usage: battle bench run [CAS ...] | battle bench micro [BENCH ...] | battle bench ai [GENERAL ...] | "
+              "battle bench render [pygame|terminal] | battle bench startup | "
+              "battle bench compare [results.json] --baseline B")
 
 
 def run_plot(args):
@@ -462,51 +914,44 @@ def run_plot(args):
     elif "Crossbow" in args.scenario:
         unit_type = "Crossbowman"
 
-    unit_class = UNIT_CLASS_MAP.get(unit_type)
-
     print(f"Unité         : {unit_type}")
+    print(f"Seeds         : {args.seeds}")
     print("-" * 60)
 
-    # Collecter les données
-    results = {
-        'N': values,
-        'winner_casualties': [],  # Pertes du gagnant (armée 2N)
-        'loser_casualties': [],  # Pertes du perdant (armée N) = toujours N
-    }
-
-    for N in values:
-        print(f"  Test N={N} ({N} vs {2 * N})...", end=" ", flush=True)
-
-        # Créer le scénario Lanchester
-        army1, army2 = lanchester_scenario(unit_class, N, ai_class)
-        game_map = Map(60, 60)
-        engine = Engine(game_map, army1, army2)
-
-        # Exécuter sans vue (headless) -> Vitesse maximale
-        engine.run_game(max_turns=2000, view=None, logic_speed=1)
-
-        # Calculer les pertes
-        army1_alive = sum(1 for u in army1.units if u.is_alive)
-        army2_alive = sum(1 for u in army2.units if u.is_alive)
-
-        # L'armée 2 (2N unités) devrait gagner
-        winner_lost = (2 * N) - army2_alive
-
-        results['winner_casualties'].append(winner_lost)
-        results['loser_casualties'].append(N)  # Le perdant perd toutes ses unités
-
-        print(f"Gagnant perd {winner_lost}/{2 * N}")
+    # Collecter les données (N x seeds en parallèle, avec cache)
+    from scripts.lanchester_sweep import run_sweep, summarize, DEFAULT_CACHE_PATH
+    results = run_sweep(
+        unit_type, args.AI, values, list(range(args.seeds)),
+        workers=args.jobs,
+        cache_path=None if args.no_cache else DEFAULT_CACHE_PATH
+    )
+    summary = summarize(results)
 
     print("-" * 60)
+    for n, mean, low, high in zip(summary['N'], summary['winner_mean'],
+                                  summary['winner_low'], summary['winner_high']):
+        print(f"  N={n}: gagnant perd {mean:.1f}/{2 * n} (p10={low:.0f}, p90={high:.0f})")
 
     # Générer le graphique
     plt.figure(figsize=(10, 6))
-    plt.plot(results['N'], results['winner_casualties'], 'b-o', label='Pertes du gagnant (2N)')
-    plt.plot(results['N'], results['loser_casualties'], 'r--', label='Pertes du perdant (N)')
+    plt.plot(summary['N'], summary['winner_mean'], 'b-o', label='Pertes du gagnant (2N), moyenne')
+    plt.fill_between(summary['N'], summary['winner_low'], summary['winner_high'],
+                     color='b', alpha=0.2, label='Pertes du gagnant, p10-p90')
+    plt.plot(summary['N'], summary['loser_mean'], 'r--', label='Pertes du perdant (N), moyenne')
+    plt.fill_between(summary['N'], summary['loser_low'], summary['loser_high'],
+                     color='r', alpha=0.1)
+
+    if args.analytical:
+        from core.lanchester import predict_lanchester
+        predictions = [predict_lanchester(unit_type, n) for n in summary['N']]
+        plt.plot(summary['N'], [p['casualties'][1] for p in predictions], 'g:',
+                 label='Pertes du gagnant, modèle analytique')
+        plt.plot(summary['N'], [p['casualties'][0] for p in predictions], 'm:',
+                 label='Pertes du perdant, modèle analytique')
 
     plt.xlabel('Taille de la petite armée (N)')
     plt.ylabel('Nombre de pertes')
-    plt.title(f"Loi de Lanchester - {unit_type} (N vs 2N)")
+    plt.title(f"Loi de Lanchester - {unit_type} (N vs 2N, {args.seeds} seeds)")
     plt.legend()
     plt.grid(True, alpha=0.3)
 
@@ -523,6 +968,8 @@ def run_lanchester(args):
     """
     Execute un scenario Lanchester et affiche le graphique a la fin.
     """
+    from scripts.run_scenario import lanchester_scenario
+
     print("--- Test de Lanchester ---")
     print(f"Unite: {args.unit_type}")
     print(f"Configuration: {args.N} vs {2 * args.N}")
@@ -548,39 +995,29 @@ def run_lanchester(args):
     # Choix de la vue
     inner_view = None
     if args.terminal:
+        from view.terminal_view import TerminalView
         inner_view = TerminalView(engine.map)
     else:
+        from view.gui_view import PygameView
         inner_view = PygameView(engine.map, [army1, army2])
 
-    # Wrapper pour collecter les stats
-    class StatsWrapper:
-        def __init__(self, view_obj):
-            self.view = view_obj
-            self.history = {'t': [], 'a1': [], 'a2': []}
-
-        def display(self, armies, t, paused, speed=1.0):
-            # Enregistrement à chaque frame affichée
-            if not paused:
-                self.history['t'].append(t)
-                self.history['a1'].append(sum(1 for u in armies[0].units if u.is_alive))
-                self.history['a2'].append(sum(1 for u in armies[1].units if u.is_alive))
-            return self.view.display(armies, t, paused, speed)
-
-        def __getattr__(self, name):
-            return getattr(self.view, name)
-
-    wrapper = StatsWrapper(inner_view)
+    # Enregistreur de séries temporelles intégré au moteur (échantillon à chaque tick)
+    recorder = engine.enable_metrics(sample_every=1)
 
     speed = 1 if args.terminal else 2
-    engine.run_game(max_turns=args.max_turns, view=wrapper, logic_speed=speed)
+    engine.run_game(max_turns=args.max_turns, view=inner_view, logic_speed=speed)
+
+    if args.metrics_csv:
+        recorder.to_csv(args.metrics_csv)
+        print(f"Métriques exportées: {args.metrics_csv}")
 
     # Génération du graphique à la fin
     print("\nGénération du graphique de bataille (Pertes)...")
     try:
         import matplotlib.pyplot as plt
         
-        history = wrapper.history
-        if not history['t']:
+        history = recorder.history()
+        if len(history['t']) < 2:
             print("Pas de données collectées (durée trop courte ou pause).")
             return
 
@@ -589,8 +1026,8 @@ def run_lanchester(args):
         initial_a2 = 2 * args.N
         
         # Pertes = Initial - Vivants
-        casualties_a1 = [initial_a1 - x for x in history['a1']]
-        casualties_a2 = [initial_a2 - x for x in history['a2']]
+        casualties_a1 = [initial_a1 - x for x in history['alive'][0]]
+        casualties_a2 = [initial_a2 - x for x in history['alive'][1]]
 
         plt.figure(figsize=(10, 6))
         plt.plot(history['t'], casualties_a1, 'b-', label=f'Pertes Armée 1 (Total: {args.N})')
@@ -620,6 +1057,8 @@ def run_legacy_battle(args):
     """
     Mode legacy.
     """
+    from utils.loaders import load_map_from_file, load_army_from_file
+
     print("--- Mode Legacy ---")
 
     engine = None
@@ -637,8 +1076,10 @@ def run_legacy_battle(args):
 
     view = None
     if args.view == "terminal":
+        from view.terminal_view import TerminalView
         view = TerminalView(engine.map)
     elif args.view == "pygame":
+        from view.gui_view import PygameView
         view = PygameView(engine.map, armies)
 
     try:
@@ -655,12 +1096,16 @@ def run_play(args):
     """
     Lance une partie rapidement.
     """
+    from scripts.run_scenario import custom_battle_scenario
+
     print("=" * 50)
     print("Partie Rapide")
     print("=" * 50)
     print(f"Unites   : {args.count}x {args.units} par camp")
     print(f"IAs      : {args.generals[0]} vs {args.generals[1]}")
     print(f"Mode     : {'Terminal' if args.terminal else 'Pygame 2.5D'}")
+    seed = seed_all(args.seed if args.seed is not None else new_seed())
+    print(f"Graine   : {seed}")
     print("=" * 50)
 
     # Vérifier tous les types d'unités
@@ -688,8 +1133,9 @@ def run_play(args):
 
     game_map = Map(w, h)
 
-    import random
     import math
+    from core.rng import get_rng
+    rng = get_rng("map")
     n_trees = int((w * h) * 0.06) # 6% de densité
     
     # Zone de combat au centre à éviter (carré central ~40% de la map)
@@ -697,8 +1143,8 @@ def run_play(args):
     combat_radius = min(w, h) * 0.25  # Rayon de la zone libre
     
     for _ in range(n_trees):
-        tx = random.randint(0, w-1)
-        ty = random.randint(0, h-1)
+        tx = rng.randint(0, w-1)
+        ty = rng.randint(0, h-1)
         
         # Distance au centre
         dist_to_center = math.sqrt((tx - center_x)**2 + (ty - center_y)**2)
@@ -722,12 +1168,16 @@ def run_play(args):
         (game_map.width, game_map.height)
     )
 
-    engine = Engine(game_map, army1, army2)
+    engine = Engine(game_map, army1, army2, seed=seed)
+    if args.profile:
+        engine.enable_profiler()
 
     # Choisir la vue
     if args.terminal:
+        from view.terminal_view import TerminalView
         view = TerminalView(engine.map)
     else:
+        from view.gui_view import PygameView
         view = PygameView(engine.map, [army1, army2])
 
     try:
@@ -735,10 +1185,27 @@ def run_play(args):
         engine.run_game(max_turns=args.max_turns, view=view, logic_speed=speed)
     except KeyboardInterrupt:
         print("\nPartie interrompue.")
+    if args.profile:
+        print(engine.profile_report())
+
+
+def run_export(args):
+    """
+    Convertit une sauvegarde: la sauvegarde rapide (binaire) en JSON lisible,
+    ou l'inverse. Le format produit suit l'extension de la sortie.
+    """
+    output = args.output or os.path.splitext(args.save)[0] + ".json"
+    if os.path.abspath(output) == os.path.abspath(args.save):
+        print("Erreur: la sortie doit être différente de la sauvegarde source", file=sys.stderr)
+        sys.exit(1)
+    engine = load_game(args.save)
+    save_game(engine, output)
 
 
 def run_create(args):
     """Gere la commande 'battle create'."""
+    from utils.generators import generate_map_file, generate_army_file, generate_stress_scenario, parse_unit_mix
+
     if args.create_type == "map":
         generate_map_file(args.filename, args.width, args.height, args.noise)
 
@@ -768,8 +1235,29 @@ def run_create(args):
 
         generate_army_file(args.filename, args.general, units_config, (w, h), args.id)
 
+    elif args.create_type == "stress":
+        map_size = None
+        if args.map_size:
+            try:
+                map_size = tuple(map(int, args.map_size.lower().split('x')))
+            except ValueError:
+                print("Erreur: Format map_size incorrect (utiliser '400x400')")
+                sys.exit(1)
+        try:
+            mix = parse_unit_mix(args.mix)
+        except ValueError:
+            print("Erreur: Format mix incorrect (utiliser 'Knight:0.5,Pikeman:0.5')")
+            sys.exit(1)
+        unknown = [name for name in mix if name not in UNIT_CLASS_MAP]
+        if unknown:
+            print(f"Erreur: Unités inconnues {unknown}. Disponibles: {list(UNIT_CLASS_MAP.keys())}")
+            sys.exit(1)
+        if args.seed is not None:
+            seed_all(args.seed)
+        generate_stress_scenario(args.filename, args.units, mix, args.formation, args.obstacles, map_size)
+
     else:
-        print("Spécifiez 'map' ou 'army'.")
+        print("Spécifiez 'map', 'army' ou 'stress'.")
 
 
 if __name__ == "__main__":
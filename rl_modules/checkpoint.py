@@ -0,0 +1,203 @@
+"""
+Checkpoint Q-table: định dạng gọn, có phiên bản, không dùng pickle.
+
+Một checkpoint là một thư mục:
+    manifest.json            episode, epsilon, lịch sử win-rate, cấu hình, danh sách bảng
+    team1_states.npy         state key (int64, shape (n, 3))
+    team1_q.npy              Q-value  (float64, shape (n, 3))
+    team2_states.npy / team2_q.npy
+
+File .npy được ghi theo chuẩn NPY v1.0 (đọc được bằng numpy.load) nhưng
+không cần NumPy: ghi/đọc bằng module `array`. Checkpoint được ghi trọn vẹn
+vào thư mục tạm rồi đổi tên (os.replace), manifest.json ghi cuối cùng:
+một checkpoint chỉ hợp lệ khi manifest tồn tại. Checkpoint cũ được đổi tên
+thành `<thư mục>.old` và chỉ bị xóa khi bản mới đã vào chỗ; nếu tiến trình
+dừng giữa hai lần đổi tên, load_checkpoint/latest_checkpoint đọc bản `.old`.
+"""
+import os
+import ast
+import sys
+import json
+import struct
+import pickle
+import shutil
+from array import array
+
+FORMAT_NAME = "rl-qtable"
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+
+NPY_MAGIC = b"\x93NUMPY"
+# descr NPY <-> typecode array
+NPY_TYPES = {"<i8": "q", "<f8": "d"}
+
+
+# =============================================================================
+# NPY v1.0
+# =============================================================================
+
+def _atomic_write(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_npy(path, descr, shape, values):
+    """Ghi một mảng 2D (list phẳng `values`) ra file .npy."""
+    data = array(NPY_TYPES[descr], values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    header = "{'descr': '%s', 'fortran_order': False, 'shape': (%d, %d), }" % (descr, shape[0], shape[1])
+    # Magic (6) + version (2) + độ dài header (2) + header căn theo 64 byte, kết thúc bằng '\n'
+    padding = 64 - (10 + len(header) + 1) % 64
+    header = (header + " " * padding + "\n").encode("latin1")
+    _atomic_write(path, NPY_MAGIC + b"\x01\x00" + struct.pack("<H", len(header)) + header + data.tobytes())
+
+
+def read_npy(path):
+    """Đọc file .npy (v1.0, '<i8' hoặc '<f8') -> (shape, list phẳng)."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw[:6] != NPY_MAGIC or raw[6] != 1:
+        raise ValueError(f"{path}: không phải file NPY v1.0")
+    (header_len,) = struct.unpack("<H", raw[8:10])
+    header = ast.literal_eval(raw[10:10 + header_len].decode("latin1"))
+    descr = header["descr"]
+    if descr not in NPY_TYPES or header["fortran_order"]:
+        raise ValueError(f"{path}: kiểu dữ liệu không hỗ trợ ({descr})")
+
+    data = array(NPY_TYPES[descr])
+    data.frombytes(raw[10 + header_len:])
+    if sys.byteorder != "little":
+        data.byteswap()
+    return tuple(header["shape"]), data.tolist()
+
+
+# =============================================================================
+# Checkpoint
+# =============================================================================
+
+def save_checkpoint(directory, q_tables, meta):
+    """
+    Ghi checkpoint vào `directory`.
+    q_tables: {"team1": {state_tuple: [q0, q1, q2]}, ...}
+    meta: episode, epsilon, win_history, config...
+    """
+    directory = directory.rstrip("/\\")
+    tmp_dir = directory + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    tables = {}
+    for name, q_table in q_tables.items():
+        keys = list(q_table.keys())
+        state_size = len(keys[0]) if keys else 0
+        action_count = len(q_table[keys[0]]) if keys else 0
+        states_file = f"{name}_states.npy"
+        q_file = f"{name}_q.npy"
+        write_npy(os.path.join(tmp_dir, states_file), "<i8", (len(keys), state_size),
+                  [int(v) for k in keys for v in k])
+        write_npy(os.path.join(tmp_dir, q_file), "<f8", (len(keys), action_count),
+                  [float(v) for k in keys for v in q_table[k]])
+        tables[name] = {"states": states_file, "q": q_file}
+
+    manifest = {"format": FORMAT_NAME, "version": FORMAT_VERSION, "tables": tables}
+    manifest.update(meta)
+    _atomic_write(os.path.join(tmp_dir, MANIFEST), json.dumps(manifest, indent=2).encode("utf-8"))
+
+    # Thay thế checkpoint cũ (nếu có) bằng thư mục tạm đã hoàn chỉnh.
+    # Bản cũ nằm ở `.old` cho tới khi bản mới đã vào chỗ.
+    old_dir = directory + ".old"
+    if os.path.isdir(directory):
+        shutil.rmtree(old_dir, ignore_errors=True)
+        os.replace(directory, old_dir)
+    try:
+        os.replace(tmp_dir, directory)
+    except OSError:
+        if os.path.isdir(old_dir) and not os.path.exists(directory):
+            os.replace(old_dir, directory)
+        raise
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return directory
+
+
+def resolve_checkpoint(directory):
+    """
+    Thư mục chứa checkpoint `directory`: chính nó nếu có manifest, nếu không
+    thì bản `.old` còn lại khi lần ghi trước bị ngắt giữa hai lần đổi tên.
+    """
+    directory = directory.rstrip("/\\")
+    if not os.path.isfile(os.path.join(directory, MANIFEST)):
+        old_dir = directory + ".old"
+        if os.path.isfile(os.path.join(old_dir, MANIFEST)):
+            return old_dir
+    return directory
+
+
+def load_checkpoint(directory):
+    """Đọc checkpoint -> (q_tables, manifest). Dùng bản `.old` nếu cần (xem resolve_checkpoint)."""
+    directory = resolve_checkpoint(directory)
+    with open(os.path.join(directory, MANIFEST), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT_NAME:
+        raise ValueError(f"{directory}: không phải checkpoint Q-table")
+    if manifest.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"{directory}: phiên bản {manifest['version']} mới hơn bản hỗ trợ ({FORMAT_VERSION})")
+
+    q_tables = {}
+    for name, files in manifest["tables"].items():
+        (rows, state_size), states = read_npy(os.path.join(directory, files["states"]))
+        (_, action_count), values = read_npy(os.path.join(directory, files["q"]))
+        q_tables[name] = {
+            tuple(states[i * state_size:(i + 1) * state_size]): values[i * action_count:(i + 1) * action_count]
+            for i in range(rows)
+        }
+    return q_tables, manifest
+
+
+def latest_checkpoint(root):
+    """Checkpoint hợp lệ (có manifest) có episode lớn nhất trong `root`, hoặc None."""
+    if not os.path.isdir(root):
+        return None
+    best = None
+    best_episode = -1
+    for entry in os.listdir(root):
+        if entry.endswith(".tmp"):
+            continue
+        if entry.endswith(".old"):
+            # Chỉ dùng khi bản chính không còn (ghi bị ngắt giữa hai lần đổi tên)
+            entry = entry[:-len(".old")]
+            if os.path.isfile(os.path.join(root, entry, MANIFEST)):
+                continue
+        path = os.path.join(root, entry)
+        manifest_path = os.path.join(resolve_checkpoint(path), MANIFEST)
+        if not os.path.isfile(manifest_path):
+            continue
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                episode = json.load(f).get("episode", 0)
+        except (OSError, ValueError):
+            continue
+        if episode > best_episode:
+            best, best_episode = path, episode
+    return best
+
+
+# =============================================================================
+# Pickle cũ (chỉ dict/list/tuple/số)
+# =============================================================================
+
+class _PlainDataUnpickler(pickle.Unpickler):
+    """Từ chối mọi class/hàm: Q-table cũ chỉ gồm dict, tuple, list, int, float."""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"Đối tượng không được phép trong Q-table: {module}.{name}")
+
+
+def load_legacy_q_table(path):
+    """Đọc Q-table .pkl cũ mà không thực thi code tùy ý."""
+    with open(path, "rb") as f:
+        q_table = _PlainDataUnpickler(f).load()
+    if not isinstance(q_table, dict):
+        raise ValueError(f"{path}: Q-table không hợp lệ")
+    return q_table
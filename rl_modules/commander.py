@@ -1,4 +1,3 @@
-import random
 import math
 from ai.general import General
 from core.unit import Unit, UC_BUILDING
@@ -10,12 +9,99 @@ STRATEGY_ATTACK_BASE = 0  # Ưu tiên phá công trình (Castle > House)
 STRATEGY_HUNT_UNITS = 1  # Săn quân địch
 STRATEGY_MIXED = 2  # Hỗn hợp
 
+# Trọng số điểm cho công trình địch
+CASTLE_WEIGHT = 50
+HOUSE_WEIGHT = 10
+
+
+class ArmyTotals:
+    """
+    Listener của engine: duy trì theo từng đội tổng máu, tổng máu có trọng số
+    (Castle x50, House x10, lính x1) và số Castle/House còn sống, cập nhật
+    từ các sự kiện damage/death/heal/convert -> đọc trạng thái O(1).
+    """
+
+    def __init__(self, engine):
+        self.hp = {}
+        self.weighted_hp = {}
+        self.castles = {}
+        self.houses = {}
+        for army in engine.armies:
+            self.hp[army.army_id] = 0
+            self.weighted_hp[army.army_id] = 0
+            self.castles[army.army_id] = 0
+            self.houses[army.army_id] = 0
+            for u in army.units:
+                if u.is_alive:
+                    self._add(u, u.army_id, 1)
+                    self._count(u, u.army_id, 1)
+
+    @staticmethod
+    def weight(unit):
+        if isinstance(unit, GameCastle):
+            return CASTLE_WEIGHT
+        if isinstance(unit, House):
+            return HOUSE_WEIGHT
+        return 1
+
+    def _add(self, unit, army_id, amount):
+        if army_id in self.hp:
+            self.hp[army_id] += amount * unit.current_hp
+            self.weighted_hp[army_id] += amount * unit.current_hp * self.weight(unit)
+
+    def _count(self, unit, army_id, delta):
+        if army_id not in self.hp:
+            return
+        if isinstance(unit, GameCastle):
+            self.castles[army_id] += delta
+        elif isinstance(unit, House):
+            self.houses[army_id] += delta
+
+    def on_damage(self, attacker, target, amount):
+        if target.army_id in self.hp:
+            self.hp[target.army_id] -= amount
+            self.weighted_hp[target.army_id] -= amount * self.weight(target)
+
+    def on_death(self, attacker, target):
+        self._count(target, target.army_id, -1)
+
+    def on_heal(self, healer, target, amount):
+        if target.army_id in self.hp:
+            self.hp[target.army_id] += amount
+            self.weighted_hp[target.army_id] += amount * self.weight(target)
+
+    def on_convert(self, unit, old_army_id, new_army_id):
+        self._add(unit, old_army_id, -1)
+        self._count(unit, old_army_id, -1)
+        self._add(unit, new_army_id, 1)
+        self._count(unit, new_army_id, 1)
+
+    def on_tick(self, engine):
+        pass
+
+    def snapshot_state(self):
+        return (dict(self.hp), dict(self.weighted_hp), dict(self.castles), dict(self.houses))
+
+    def restore_state(self, state):
+        hp, weighted_hp, castles, houses = state
+        self.hp, self.weighted_hp = dict(hp), dict(weighted_hp)
+        self.castles, self.houses = dict(castles), dict(houses)
+
 
 class RLCommander(General):
-    def __init__(self, army_id: int, role_config: str = "team1", learning=True):
+    def __init__(self, army_id: int, role_config: str = "team1", learning=True,
+                 decision_interval=1, decide_on_change=False):
         super().__init__(army_id)
         self.role_config = role_config
 
+        # Macro-action: quyết định mỗi `decision_interval` tick (hoặc sớm hơn khi
+        # state key đổi nếu decide_on_change); giữa hai lần engine lặp lại lệnh cũ
+        self.decision_interval = max(1, decision_interval)
+        self.decide_on_change = decide_on_change
+        self.last_decision_turn = None
+        self.ticks_since_decision = 1
+        self.issued_strategy = None
+
         # State: (Tỉ lệ máu, Castle Status, House Status)
         self.q_table = {}
         self.learning_rate = 0.1
@@ -25,6 +111,23 @@ class RLCommander(General):
         self.last_state = None
         self.last_action = None
         self.previous_score = 0
+        # Tổng reward đã học trong episode (telemetry)
+        self.episode_reward = 0.0
+
+        # Chiến thuật áp đặt từ bên ngoài (VecBattleEnv): bỏ qua học/chọn nội bộ
+        self.forced_strategy = None
+        # Nếu là list: ghi lại (state, action, reward, next_state) thay vì cập nhật
+        # Q-table (rollout worker); learner sẽ replay qua update_q
+        self.transitions = None
+
+        # Trạng thái tăng dần từ sự kiện engine (None -> quét O(N) như cũ)
+        self.totals = None
+        self.enemy_army_id = None
+
+    def bind_engine(self, engine):
+        self.totals = ArmyTotals(engine)
+        self.enemy_army_id = next((a.army_id for a in engine.armies if a.army_id != self.army_id), None)
+        engine.add_listener(self.totals)
 
     def calculate_weighted_score(self, my_units, enemy_units):
         """
@@ -33,22 +136,30 @@ class RLCommander(General):
         - House: 10 điểm (Quan trọng)
         - Lính: 1 điểm
         """
+        if self.totals is not None:
+            return self.totals.hp[self.army_id] - self.totals.weighted_hp[self.enemy_army_id]
+
         score = 0
         for u in my_units:
             score += u.current_hp
 
         for u in enemy_units:
             if isinstance(u, GameCastle):
-                score -= u.current_hp * 50
+                score -= u.current_hp * CASTLE_WEIGHT
             elif isinstance(u, House):
-                score -= u.current_hp * 10
+                score -= u.current_hp * HOUSE_WEIGHT
             else:
                 score -= u.current_hp
         return score
 
     def _get_state_key(self, my_units, enemy_units):
-        my_hp = sum(u.current_hp for u in my_units)
-        en_hp = sum(u.current_hp for u in enemy_units)
+        if self.totals is not None:
+            totals = self.totals
+            my_hp = totals.hp[self.army_id]
+            en_hp = totals.hp[self.enemy_army_id]
+        else:
+            my_hp = sum(u.current_hp for u in my_units)
+            en_hp = sum(u.current_hp for u in enemy_units)
 
         # 1. Tỷ lệ lực lượng
         ratio = my_hp / (en_hp + 1)
@@ -63,50 +174,92 @@ class RLCommander(General):
         castle_alive = 0
         house_alive = 0
 
-        for u in enemy_units:
-            if isinstance(u, GameCastle):
-                castle_alive = 1
-            if isinstance(u, House):
-                house_alive = 1
-            if castle_alive and house_alive: break
+        if self.totals is not None:
+            castle_alive = 1 if self.totals.castles[self.enemy_army_id] > 0 else 0
+            house_alive = 1 if self.totals.houses[self.enemy_army_id] > 0 else 0
+        else:
+            for u in enemy_units:
+                if isinstance(u, GameCastle):
+                    castle_alive = 1
+                if isinstance(u, House):
+                    house_alive = 1
+                if castle_alive and house_alive: break
 
         return (r_state, castle_alive, house_alive)
 
+    def update_q(self, state, action, reward, next_state=None):
+        """Luật Q-learning. next_state=None: chuyển trạng thái kết thúc (không bootstrap)."""
+        old_q = self.q_table.get(state, [0.0] * 3)[action]
+        if next_state is None:
+            new_q = old_q + self.learning_rate * (reward - old_q)
+        else:
+            max_future_q = max(self.q_table.get(next_state, [0.0] * 3))
+            new_q = old_q + self.learning_rate * (reward + self.discount_factor * max_future_q - old_q)
+
+        if state not in self.q_table: self.q_table[state] = [0.0] * 3
+        self.q_table[state][action] = new_q
+
+    def _learn(self, state, action, reward, next_state=None):
+        self.episode_reward += reward
+        if self.transitions is not None:
+            self.transitions.append((state, action, reward, next_state))
+        else:
+            self.update_q(state, action, reward, next_state)
+
     def learn_terminal_result(self, final_reward):
         if self.last_state is not None and self.last_action is not None:
-            old_q = self.q_table.get(self.last_state, [0.0] * 3)[self.last_action]
-            new_q = old_q + self.learning_rate * (final_reward - old_q)
-            if self.last_state not in self.q_table: self.q_table[self.last_state] = [0.0] * 3
-            self.q_table[self.last_state][self.last_action] = new_q
+            self._learn(self.last_state, self.last_action, final_reward)
+
+    def should_decide(self, turn):
+        due = (self.last_decision_turn is None
+               or turn - self.last_decision_turn >= self.decision_interval)
+        if not due:
+            if self.forced_strategy is not None:
+                due = self.forced_strategy != self.issued_strategy
+            elif self.decide_on_change and self.totals is not None:
+                # Chỉ đọc được state key O(1) khi đã bind vào engine
+                due = self._get_state_key([], []) != self.last_state
+        if due:
+            self.ticks_since_decision = turn - self.last_decision_turn if self.last_decision_turn is not None else 1
+            self.last_decision_turn = turn
+        return due
+
+    def choose_strategy(self, state_key):
+        """Epsilon-greedy trên Q-table."""
+        if self.rng.random() < self.epsilon:
+            return self.rng.randint(0, 2)
+        qs = self.q_table.get(state_key, [0.0] * 3)
+        return qs.index(max(qs))
 
     def decide_actions(self, current_map, my_units, enemy_units):
-        actions = []
+        if self.forced_strategy is not None:
+            self.issued_strategy = self.forced_strategy
+            return self.issue_orders(self.forced_strategy, my_units, enemy_units)
+
         state_key = self._get_state_key(my_units, enemy_units)
 
         # Tính Reward
         current_score = self.calculate_weighted_score(my_units, enemy_units)
-        reward = (current_score - self.previous_score) - 1  # Phạt thời gian
+        # Thưởng tích lũy từ lần quyết định trước, phạt thời gian -1 mỗi tick
+        reward = (current_score - self.previous_score) - self.ticks_since_decision
         self.previous_score = current_score
 
         # Q-Learning Update
         if self.last_state is not None and self.last_action is not None:
-            old_q = self.q_table.get(self.last_state, [0.0] * 3)[self.last_action]
-            max_future_q = max(self.q_table.get(state_key, [0.0] * 3))
-            new_q = old_q + self.learning_rate * (reward + self.discount_factor * max_future_q - old_q)
-
-            if self.last_state not in self.q_table: self.q_table[self.last_state] = [0.0] * 3
-            self.q_table[self.last_state][self.last_action] = new_q
+            self._learn(self.last_state, self.last_action, reward, state_key)
 
         # Chọn Action
-        if random.random() < self.epsilon:
-            strategy = random.randint(0, 2)
-        else:
-            qs = self.q_table.get(state_key, [0.0] * 3)
-            strategy = qs.index(max(qs))
+        strategy = self.choose_strategy(state_key)
 
         self.last_state = state_key
         self.last_action = strategy
 
+        return self.issue_orders(strategy, my_units, enemy_units)
+
+    def issue_orders(self, strategy, my_units, enemy_units):
+        """Chuyển một chiến thuật cấp cao thành lệnh cho từng lính."""
+        actions = []
+
         # --- TÌM MỤC TIÊU ---
         target_castle = None
         target_house = None
@@ -162,8 +315,8 @@ class RLCommander(General):
                 dist = unit._calculate_distance(target)
                 if dist > unit.attack_range + 0.5:
                     # Di chuyển phân tán nhẹ
-                    rx = random.uniform(-1.0, 1.0)
-                    ry = random.uniform(-1.0, 1.0)
+                    rx = self.rng.uniform(-1.0, 1.0)
+                    ry = self.rng.uniform(-1.0, 1.0)
                     move_pos = (target.pos[0] + rx, target.pos[1] + ry)
                     actions.append(("move", unit.unit_id, move_pos))
                 else:
@@ -1,6 +1,5 @@
 import sys
 import os
-import pickle
 import pygame
 import time
 
@@ -13,19 +12,31 @@ from extensions.map_builder import create_battle_map, generate_army_composition
 from extensions.custom_view import CustomPygameView
 from rl_modules.commander import RLCommander
 from extensions.custom_units import GameCastle
+from rl_modules.checkpoint import load_checkpoint, load_legacy_q_table, resolve_checkpoint
 
 MODEL_DIR = "ai/rl/models"
 REPORT_DIR = "reports"
 
 
 def load_trained_model(team_id):
-    """Hàm hỗ trợ load Q-Table từ file .pkl"""
+    """
+    Hàm hỗ trợ load Q-Table: checkpoint `final/` (định dạng mới), nếu không có
+    thì file .pkl cũ (đọc an toàn, chỉ chấp nhận dict/list/tuple/số).
+    """
+    final_dir = f"{MODEL_DIR}/final"
+    if os.path.isdir(resolve_checkpoint(final_dir)):
+        try:
+            q_tables, manifest = load_checkpoint(final_dir)
+            print(f">>> [LOAD] Đang nạp model cho Team {team_id} từ {final_dir} (ep {manifest.get('episode')})...")
+            return q_tables[f"team{team_id}"]
+        except Exception as e:
+            print(f">>> [LỖI] Không đọc được checkpoint: {e}")
+
     filename = f"{MODEL_DIR}/q_table_team{team_id}_final.pkl"
     if os.path.exists(filename):
         try:
-            with open(filename, 'rb') as f:
-                print(f">>> [LOAD] Đang nạp model cho Team {team_id} từ {filename}...")
-                return pickle.load(f)
+            print(f">>> [LOAD] Đang nạp model cho Team {team_id} từ {filename}...")
+            return load_legacy_q_table(filename)
         except Exception as e:
             print(f">>> [LỖI] Không đọc được file model: {e}")
     return {}
@@ -225,7 +236,7 @@ def run_gui_match(map_size=120, units_per_team=50, max_turns=2000):
         f"    Map: {map_size}x{map_size} | Units: {units_per_team} | Max Turns: {max_turns if max_turns != -1 else 'INFINITE'}")
 
     # 1. Init Map
-    game_map, tree_units = create_battle_map(width=map_size, height=map_size)
+    game_map = create_battle_map(width=map_size, height=map_size)
 
     # 2. Setup AI (Load Model)
     ai_1 = RLCommander(army_id=0, role_config="team1", learning=False)
@@ -254,7 +265,6 @@ def run_gui_match(map_size=120, units_per_team=50, max_turns=2000):
     # 4. Engine & View
     engine = RegicideEngine(game_map, army_1, army_2)
     view = CustomPygameView(game_map, engine.armies)
-    view.set_nature_units(tree_units)
 
     # 5. Xử lý max_turns
     if max_turns == -1:
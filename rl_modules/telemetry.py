@@ -0,0 +1,119 @@
+"""
+Telemetry huấn luyện: ghi số liệu từng episode ra file (JSONL hoặc CSV)
+ngay trong lúc train, và vẽ biểu đồ sau đó bằng `main.py train-report`.
+
+Vòng lặp huấn luyện không import matplotlib: chỉ render_report mới cần.
+"""
+import os
+import csv
+import json
+
+FIELDS = [
+    "episode", "winner", "ticks", "wall_time", "ticks_per_sec", "epsilon",
+    "q_size_team1", "q_size_team2", "reward_team1", "reward_team2", "win_rate",
+]
+
+
+class TelemetryWriter:
+    """
+    Ghi nối tiếp mỗi episode một dòng (flush ngay để đọc được khi đang train).
+    Định dạng theo đuôi file: .csv -> CSV, còn lại -> JSONL.
+    """
+
+    def __init__(self, path, append=False):
+        self.path = path
+        self.format = "csv" if path.endswith(".csv") else "jsonl"
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        write_header = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        self._file = open(path, "a" if append else "w", newline="", encoding="utf-8")
+        self._csv = None
+        if self.format == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=FIELDS, extrasaction="ignore")
+            if write_header:
+                self._csv.writeheader()
+
+    def write(self, record):
+        if self._csv is not None:
+            self._csv.writerow(record)
+        else:
+            self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_telemetry(path):
+    """Đọc lại file telemetry (JSONL hoặc CSV) -> list dict."""
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            records = []
+            for row in csv.DictReader(f):
+                record = {}
+                for key, value in row.items():
+                    if value in ("", None):
+                        record[key] = None
+                    else:
+                        try:
+                            record[key] = float(value) if "." in value or "e" in value else int(value)
+                        except ValueError:
+                            record[key] = value
+                records.append(record)
+            return records
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def render_report(path, output=None):
+    """
+    Vẽ biểu đồ từ file telemetry: win-rate, epsilon, tốc độ (ticks/s),
+    kích thước Q-table và tổng reward mỗi đội. Trả về đường dẫn ảnh.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    records = read_telemetry(path)
+    if not records:
+        raise ValueError(f"{path}: không có dữ liệu")
+    output = output or os.path.splitext(path)[0] + ".png"
+    episodes = [r["episode"] for r in records]
+
+    fig, axes = plt.subplots(2, 2, figsize=(12, 8))
+    ax = axes[0][0]
+    ax.plot(episodes, [r["win_rate"] for r in records], label="WR(T1) %")
+    ax.plot(episodes, [r["epsilon"] * 100 for r in records], "--", label="Epsilon x100")
+    ax.set_title("Win rate / Epsilon")
+    ax.legend()
+
+    ax = axes[0][1]
+    ax.plot(episodes, [r["ticks_per_sec"] for r in records])
+    ax.set_title("Ticks / sec")
+
+    ax = axes[1][0]
+    ax.plot(episodes, [r["q_size_team1"] for r in records], label="Team 1")
+    ax.plot(episodes, [r["q_size_team2"] for r in records], label="Team 2")
+    ax.set_title("Q-table size")
+    ax.legend()
+
+    ax = axes[1][1]
+    ax.plot(episodes, [r["reward_team1"] for r in records], label="Team 1")
+    ax.plot(episodes, [r["reward_team2"] for r in records], label="Team 2")
+    ax.set_title("Reward / episode")
+    ax.legend()
+
+    for ax in axes.flat:
+        ax.set_xlabel("Episode")
+        ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(output, dpi=120)
+    plt.close(fig)
+    return output
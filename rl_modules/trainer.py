@@ -1,23 +1,31 @@
 import os
 import sys
-import pickle
-import matplotlib.pyplot as plt
+import time
+import random
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 sys.path.append(os.getcwd())
 
 from engine import Engine
-from core.army import Army
-from extensions.map_builder import create_battle_map, generate_army_composition
 # Import đúng kiến trúc cũ
 from extensions.custom_units import GameCastle
+from core.rng import seed_all
+from core.profiler import TickProfiler
 from rl_modules.commander import RLCommander
+from rl_modules.checkpoint import save_checkpoint, load_checkpoint, latest_checkpoint
+from rl_modules.telemetry import TelemetryWriter
+from rl_modules.vec_env import (VecBattleEnv, make_battle,
+                                REWARD_WIN, REWARD_LOSS, REWARD_DRAW)
 
 # Các hằng số mặc định
 NUM_EPISODES = 500
 MAX_TURNS = 2000
 SAVE_INTERVAL = 50
 MODEL_DIR = "ai/rl/models"
+CHECKPOINT_DIR = f"{MODEL_DIR}/checkpoints"
+FINAL_MODEL_DIR = f"{MODEL_DIR}/final"
+TELEMETRY_PATH = f"{MODEL_DIR}/training_log.jsonl"
 EPSILON_START = 1.0
 EPSILON_END = 0.05
 EPSILON_DECAY = 0.995
@@ -37,88 +45,337 @@ def ensure_dir(directory):
     if not os.path.exists(directory): os.makedirs(directory)
 
 
-def save_q_table(q_table, filename):
-    with open(filename, 'wb') as f: pickle.dump(q_table, f)
+def save_training_checkpoint(directory, q_table_team1, q_table_team2, episode, epsilon,
+                             win_history, recent_wins, config):
+    """Checkpoint Q-table + trạng thái huấn luyện (xem rl_modules/checkpoint.py)."""
+    return save_checkpoint(directory, {"team1": q_table_team1, "team2": q_table_team2}, {
+        "episode": episode,
+        "epsilon": epsilon,
+        "win_history": win_history,
+        "recent_wins": list(recent_wins),
+        "config": config,
+    })
+
+
+def play_episode(q_table_team1, q_table_team2, epsilon, map_size=80, units_per_team=40,
+                 transitions=None, commander_kwargs=None, profiler=None):
+    """
+    Chơi một episode huấn luyện, cập nhật trực tiếp hai Q-table.
+    transitions: (list team1, list team2) -> không cập nhật Q-table mà ghi lại
+    các chuyển trạng thái (state, action, reward, next_state) vào hai list.
+    commander_kwargs: tham số thêm cho RLCommander (decision_interval, ...).
+    profiler: TickProfiler cộng dồn thời gian từng pha của tick (tùy chọn).
+    Trả về {"winner", "ticks", "wall", "rewards": [team1, team2]}.
+    """
+    commander_kwargs = commander_kwargs or {}
+    ai_1 = RLCommander(0, "team1", learning=True, **commander_kwargs)
+    ai_2 = RLCommander(1, "team2", learning=True, **commander_kwargs)
+    ai_1.q_table = q_table_team1
+    ai_2.q_table = q_table_team2
+    ai_1.epsilon = ai_2.epsilon = epsilon
+    if transitions is not None:
+        ai_1.transitions, ai_2.transitions = transitions
+
+    # Engine không chứa cây -> Cây không phải Unit -> Không tính vào stats/win-loss
+    started = time.perf_counter()
+    engine = make_battle(ai_1, ai_2, map_size, units_per_team, engine_cls=RegicideEngine)
+    if profiler is not None:
+        engine.enable_profiler(profiler)
+    engine.run_game(max_turns=MAX_TURNS, logic_speed=10, quiet=True)
+
+    # Reward Logic (Khuyến khích thắng)
+    winner = engine.winner
+    if winner == 0:
+        ai_1.learn_terminal_result(REWARD_WIN)
+        ai_2.learn_terminal_result(REWARD_LOSS)
+    elif winner == 1:
+        ai_1.learn_terminal_result(REWARD_LOSS)
+        ai_2.learn_terminal_result(REWARD_WIN)
+    else:
+        ai_1.learn_terminal_result(REWARD_DRAW)
+        ai_2.learn_terminal_result(REWARD_DRAW)
+    return {
+        "winner": winner,
+        "ticks": engine.turn_count,
+        "wall": time.perf_counter() - started,
+        "rewards": [ai_1.episode_reward, ai_2.episode_reward],
+    }
+
+
+def encode_q_table(q_table):
+    """Q-table (key tuple) -> list JSON [[key...], [q0, q1, q2]]."""
+    return [[list(k), v] for k, v in q_table.items()]
+
+
+def decode_q_table(entries):
+    return {tuple(k): list(v) for k, v in entries}
+
+
+def encode_transitions(transitions):
+    """(state, action, reward, next_state) -> list JSON."""
+    return [[list(s), a, r, list(ns) if ns is not None else None] for s, a, r, ns in transitions]
+
+
+def decode_transitions(entries):
+    return [(tuple(s), a, r, tuple(ns) if ns is not None else None) for s, a, r, ns in entries]
+
+
+def rollout_episode(q_table_team1, q_table_team2, epsilon, map_size, units_per_team, seed=None,
+                    commander_kwargs=None, profile=False):
+    """
+    Rollout worker: chơi một episode trên bản chụp Q-table (chỉ đọc) và trả về
+    (kết quả, transitions team1, transitions team2) để learner replay.
+    profile: thêm result["profile"] (TickProfiler.as_dict) để learner cộng dồn.
+    """
+    if seed is not None:
+        seed_all(seed)
+    transitions = ([], [])
+    profiler = TickProfiler() if profile else None
+    result = play_episode(q_table_team1, q_table_team2, epsilon, map_size, units_per_team,
+                          transitions=transitions, commander_kwargs=commander_kwargs, profiler=profiler)
+    if profiler is not None:
+        result["profile"] = profiler.as_dict()
+    return result, transitions[0], transitions[1]
+
+
+def replay_transitions(learner, transitions):
+    """Learner: áp dụng lần lượt các chuyển trạng thái qua RLCommander.update_q."""
+    for state, action, reward, next_state in transitions:
+        learner.update_q(state, action, reward, next_state)
+
+
+def run_episode_job(spec):
+    """
+    Handler cho worker phân tán (scripts/distributed.py).
+    Chơi một episode trên bản chụp Q-table và trả về các chuyển trạng thái.
+    """
+    result, t1, t2 = rollout_episode(decode_q_table(spec["q1"]), decode_q_table(spec["q2"]),
+                                     spec["epsilon"], spec["map_size"], spec["units"],
+                                     seed=spec.get("seed"), commander_kwargs=spec.get("commander"),
+                                     profile=spec.get("profile", False))
+    return dict(result, t1=encode_transitions(t1), t2=encode_transitions(t2))
+
+
+def vec_train_step(env, obs, learners, epsilon):
+    """
+    Một bước lockstep trên VecBattleEnv: chọn chiến thuật (epsilon-greedy)
+    cho mỗi trận/đội, chạy env một macro-action rồi cập nhật Q-table của
+    `learners` với phần thưởng cộng dồn trên cả bước.
+    Trả về (kết quả các trận vừa kết thúc, quan sát mới).
+    """
+    for learner in learners:
+        learner.epsilon = epsilon
+    strategies = [tuple(learner.choose_strategy(o[t]) for t, learner in enumerate(learners)) for o in obs]
+    next_obs, rewards, dones, infos = env.step(strategies)
+
+    results = []
+    for i in range(len(obs)):
+        for t, learner in enumerate(learners):
+            next_state = None if dones[i] else next_obs[i][t]
+            learner.update_q(obs[i][t], strategies[i][t], rewards[i][t], next_state)
+        if dones[i]:
+            info = infos[i]
+            results.append({"winner": info["winner"], "ticks": info["turns"],
+                            "wall": info["wall"], "rewards": info["rewards"]})
+    return results, next_obs
 
 
 # [ĐÃ SỬA] Hàm nhận tham số đầu vào từ main.py
-def train_agent(num_episodes=NUM_EPISODES, map_size=80, units_per_team=40):
+def train_agent(num_episodes=NUM_EPISODES, map_size=80, units_per_team=40, coordinator=None,
+                num_envs=0, env_workers=0, rollout_workers=0, sync_every=None,
+                decision_interval=1, decide_on_change=False, resume=False,
+                telemetry=TELEMETRY_PATH, profile=False):
+    """
+    coordinator: scripts.distributed.Coordinator (tùy chọn). Nếu có, mỗi lượt
+    chơi song song một episode trên mỗi worker từ cùng một bản chụp Q-table,
+    sau đó gộp các giá trị thay đổi theo thứ tự episode.
+    num_envs: nếu > 0, huấn luyện trên VecBattleEnv (num_envs trận lockstep,
+    chia cho env_workers tiến trình con nếu env_workers > 0).
+    rollout_workers: nếu > 0, K tiến trình chơi episode trên bản chụp Q-table
+    và gửi về các chuyển trạng thái; learner replay chúng qua update_q và
+    phát lại bản chụp mới mỗi `sync_every` episode (mặc định: K).
+    decision_interval / decide_on_change: macro-action của RLCommander
+    (quyết định mỗi K tick hoặc khi state key đổi).
+    resume: tiếp tục từ checkpoint mới nhất (Q-table, episode, epsilon, lịch sử).
+    telemetry: file JSONL/CSV nhận số liệu mỗi episode (None: tắt); vẽ biểu
+    đồ sau bằng `main.py train-report`.
+    profile: đo thời gian từng pha của tick (AI, di chuyển, va chạm...) trên
+    mọi episode và in bảng tổng hợp ở cuối (không hỗ trợ với num_envs).
+    """
+    commander_kwargs = {"decision_interval": decision_interval, "decide_on_change": decide_on_change}
     ensure_dir(MODEL_DIR)
     q_table_team1 = {}
     q_table_team2 = {}
+    learners = (RLCommander(0, "team1"), RLCommander(1, "team2"))
+    learners[0].q_table = q_table_team1
+    learners[1].q_table = q_table_team2
     recent_wins = deque(maxlen=50)
     win_history = []
     epsilon = EPSILON_START
+    episode = 0
+    # Episode worker bị lỗi: không tính là hòa, không vào win-rate/epsilon/telemetry
+    failed_episodes = 0
+    config = {"map_size": map_size, "units_per_team": units_per_team, **commander_kwargs}
+
+    if resume:
+        checkpoint = latest_checkpoint(CHECKPOINT_DIR)
+        if checkpoint is None:
+            print(f">>> Không có checkpoint trong {CHECKPOINT_DIR}, bắt đầu từ đầu.")
+        else:
+            q_tables, manifest = load_checkpoint(checkpoint)
+            q_table_team1.update(q_tables["team1"])
+            q_table_team2.update(q_tables["team2"])
+            episode = manifest["episode"]
+            epsilon = manifest["epsilon"]
+            win_history = manifest["win_history"]
+            recent_wins.extend(manifest["recent_wins"])
+            if manifest.get("config", config) != config:
+                print(f">>> [CẢNH BÁO] Cấu hình khác checkpoint: {manifest['config']}")
+            print(f">>> RESUME từ {checkpoint} | Ep {episode} | Eps {epsilon:.2f}")
+
+    writer = None
+    if telemetry:
+        # Khi resume: ghi tiếp vào file cũ
+        writer = TelemetryWriter(telemetry, append=resume and episode > 0)
+
+    profiler = TickProfiler() if profile else None
 
     print(f"TRAINING STARTED (Regicide Mode) | Episodes: {num_episodes} | Map: {map_size}x{map_size} | Units: {units_per_team}")
 
-    # Tính toán vị trí spawn dựa trên map_size (Margin 15 đơn vị)
-    # Để tránh spawn ngoài bản đồ nếu map nhỏ
-    margin = 15
-    spawn_1 = (margin, margin)
-    spawn_2 = (map_size - margin, map_size - margin)
-
-    for episode in range(1, num_episodes + 1):
-        # [THAM SỐ] Sử dụng map_size truyền vào
-        game_map, _ = create_battle_map(width=map_size, height=map_size)
-
-        ai_1 = RLCommander(0, "team1", learning=True)
-        ai_2 = RLCommander(1, "team2", learning=True)
-        ai_1.q_table = q_table_team1
-        ai_2.q_table = q_table_team2
-        ai_1.epsilon = ai_2.epsilon = epsilon
-
-        # [THAM SỐ] Sử dụng units_per_team truyền vào
-        army_1 = Army(0, generate_army_composition(0, spawn_1[0], spawn_1[1], units_per_team), ai_1)
-        army_2 = Army(1, generate_army_composition(1, spawn_2[0], spawn_2[1], units_per_team), ai_2)
-
-        # Engine không chứa cây -> Cây không phải Unit -> Không tính vào stats/win-loss
-        engine = RegicideEngine(game_map, army_1, army_2)
-        engine.run_game(max_turns=MAX_TURNS, logic_speed=10, quiet=True)
-
-        # Reward Logic (Khuyến khích thắng)
-        winner = engine.winner
-        REWARD_WIN = 5000
-        REWARD_LOSS = -2000
-        REWARD_DRAW = -1000
-
-        if winner == 0:
-            recent_wins.append(1)
-            res = "T1 WIN"
-            ai_1.learn_terminal_result(REWARD_WIN)
-            ai_2.learn_terminal_result(REWARD_LOSS)
-        elif winner == 1:
-            recent_wins.append(0)
-            res = "T2 WIN"
-            ai_1.learn_terminal_result(REWARD_LOSS)
-            ai_2.learn_terminal_result(REWARD_WIN)
+    env = None
+    if num_envs > 0:
+        env = VecBattleEnv(num_envs, map_size, units_per_team, workers=env_workers,
+                           decision_interval=decision_interval, decide_on_change=decide_on_change,
+                           engine_cls=RegicideEngine)
+        obs = env.reset()
+        print(f"VecBattleEnv: {num_envs} trận | {env.workers} tiến trình con")
+        if profiler is not None:
+            print(">>> [CẢNH BÁO] --profile không hỗ trợ VecBattleEnv, bỏ qua.")
+            profiler = None
+
+    pool = None
+    if env is None and coordinator is None and rollout_workers > 0:
+        pool = ProcessPoolExecutor(max_workers=rollout_workers)
+        sync_every = sync_every or rollout_workers
+        snapshot = ({}, {})
+        since_sync = sync_every
+        in_flight = deque()
+        submitted = episode
+        print(f"Rollout workers: {rollout_workers} | Đồng bộ Q-table mỗi {sync_every} episode")
+
+    while episode < num_episodes:
+        if env is not None:
+            results, obs = vec_train_step(env, obs, learners, epsilon)
+            results = results[:num_episodes - episode]
+        elif pool is not None:
+            # Giữ K episode đang chạy; epsilon ước lượng theo số episode đã gửi
+            while len(in_flight) < rollout_workers and submitted < num_episodes:
+                if since_sync >= sync_every:
+                    snapshot = ({k: list(v) for k, v in q_table_team1.items()},
+                                {k: list(v) for k, v in q_table_team2.items()})
+                    since_sync = 0
+                eps = max(EPSILON_END, epsilon * EPSILON_DECAY ** (submitted - episode))
+                in_flight.append(pool.submit(rollout_episode, snapshot[0], snapshot[1], eps,
+                                             map_size, units_per_team, random.randrange(2 ** 32),
+                                             commander_kwargs, profiler is not None))
+                submitted += 1
+            # Gộp theo thứ tự gửi (kết quả xác định)
+            result, t1, t2 = in_flight.popleft().result()
+            replay_transitions(learners[0], t1)
+            replay_transitions(learners[1], t2)
+            since_sync += 1
+            results = [result]
+        elif coordinator is not None:
+            batch = max(1, min(coordinator.worker_count(), num_episodes - episode))
+            spec = {
+                "q1": encode_q_table(q_table_team1),
+                "q2": encode_q_table(q_table_team2),
+                "epsilon": epsilon,
+                "map_size": map_size,
+                "units": units_per_team,
+                "commander": commander_kwargs,
+                "profile": profiler is not None,
+            }
+            jobs = [("rl_episode", dict(spec, seed=random.randrange(2 ** 32))) for _ in range(batch)]
+            results = []
+            for result in coordinator.run_jobs(jobs):
+                if "error" in result:
+                    failed_episodes += 1
+                    print(f">>> [LỖI] Worker: {result['error']} (episode bỏ qua, chơi lại)")
+                    continue
+                replay_transitions(learners[0], decode_transitions(result["t1"]))
+                replay_transitions(learners[1], decode_transitions(result["t2"]))
+                results.append(result)
+            if not results:
+                # Cả lượt đều lỗi (không còn worker...): dừng thay vì lặp mãi
+                print(">>> [LỖI] Không episode nào chạy được trên worker, dừng huấn luyện.")
+                break
         else:
-            recent_wins.append(0)
-            res = "DRAW"
-            ai_1.learn_terminal_result(REWARD_DRAW)
-            ai_2.learn_terminal_result(REWARD_DRAW)
+            results = [play_episode(q_table_team1, q_table_team2, epsilon, map_size, units_per_team,
+                                    commander_kwargs=commander_kwargs, profiler=profiler)]
+
+        for result in results:
+            if profiler is not None and "profile" in result:
+                profiler.merge(result["profile"])
+            winner = result["winner"]
+            episode_epsilon = epsilon
+            episode += 1
+            if winner == 0:
+                recent_wins.append(1)
+                res = "T1 WIN"
+            elif winner == 1:
+                recent_wins.append(0)
+                res = "T2 WIN"
+            else:
+                recent_wins.append(0)
+                res = "DRAW"
+
+            win_rate = sum(recent_wins) / len(recent_wins) * 100 if recent_wins else 0
+            win_history.append(win_rate)
+
+            if epsilon > EPSILON_END: epsilon *= EPSILON_DECAY
 
-        win_rate = sum(recent_wins) / len(recent_wins) * 100 if recent_wins else 0
-        win_history.append(win_rate)
+            print(f"Ep {episode:03d} | Eps {epsilon:.2f} | {res} | WR(T1): {win_rate:.1f}%")
 
-        if epsilon > EPSILON_END: epsilon *= EPSILON_DECAY
+            if writer is not None:
+                ticks = result.get("ticks", 0)
+                wall = result.get("wall", 0.0)
+                rewards = result.get("rewards", [None, None])
+                writer.write({
+                    "episode": episode,
+                    "winner": winner,
+                    "ticks": ticks,
+                    "wall_time": round(wall, 4),
+                    "ticks_per_sec": round(ticks / wall, 1) if wall > 0 else 0.0,
+                    "epsilon": round(episode_epsilon, 5),
+                    "q_size_team1": len(q_table_team1),
+                    "q_size_team2": len(q_table_team2),
+                    "reward_team1": rewards[0],
+                    "reward_team2": rewards[1],
+                    "win_rate": round(win_rate, 2),
+                })
 
-        print(f"Ep {episode:03d} | Eps {epsilon:.2f} | {res} | WR(T1): {win_rate:.1f}%")
+            if episode % SAVE_INTERVAL == 0:
+                save_training_checkpoint(f"{CHECKPOINT_DIR}/ep{episode:05d}", q_table_team1, q_table_team2,
+                                         episode, epsilon, win_history, recent_wins, config)
 
-        if episode % SAVE_INTERVAL == 0:
-            save_q_table(q_table_team1, f"{MODEL_DIR}/q_table_team1_ep{episode}.pkl")
-            save_q_table(q_table_team2, f"{MODEL_DIR}/q_table_team2_ep{episode}.pkl")
+    if env is not None:
+        env.close()
+    if pool is not None:
+        pool.shutdown()
+    if writer is not None:
+        writer.close()
 
-    save_q_table(q_table_team1, f"{MODEL_DIR}/q_table_team1_final.pkl")
-    save_q_table(q_table_team2, f"{MODEL_DIR}/q_table_team2_final.pkl")
+    save_training_checkpoint(FINAL_MODEL_DIR, q_table_team1, q_table_team2,
+                             episode, epsilon, win_history, recent_wins, config)
     print("DONE.")
-    try:
-        plt.plot(win_history)
-        plt.title(f"Training Progress (Map {map_size}, Units {units_per_team})")
-        plt.savefig(f"{MODEL_DIR}/training_chart.png")
-    except:
-        pass
+    if failed_episodes:
+        print(f">>> {failed_episodes} episode lỗi trên worker (không tính vào thống kê).")
+    if profiler is not None:
+        print(profiler.report())
+    if writer is not None:
+        print(f"Telemetry: {telemetry} (biểu đồ: python main.py train-report {telemetry})")
 
 
 if __name__ == "__main__":
-    train_agent()
\ No newline at end of file
+    train_agent()
@@ -0,0 +1,259 @@
+"""
+VecBattleEnv: chạy M trận huấn luyện song song theo kiểu lockstep.
+
+Mỗi bước (step) của môi trường là một điểm quyết định: nhận một cặp chiến
+thuật (team1, team2) cho mỗi trận, cho engine chạy `ticks_per_step` tick
+logic (mặc định: `decision_interval`, tức một macro-action), rồi trả về quan
+sát / phần thưởng cộng dồn trên cả bước theo lô. Với `decide_on_change`, bước
+dừng sớm ngay khi state key của một đội đổi. Trận kết thúc sẽ được reset tự
+động (quan sát trả về là của trận mới, kết quả nằm trong `infos`).
+
+Hai chế độ:
+- workers=0: mọi trận chạy trong cùng tiến trình.
+- workers=P: các trận được chia cho P tiến trình con (multiprocessing Pipe),
+  mỗi bước gửi lệnh cho tất cả rồi mới đọc kết quả -> tận dụng nhiều lõi.
+"""
+import time
+import random
+import multiprocessing as mp
+
+from engine import Engine
+from core.army import Army
+from core.rng import seed_all
+from extensions.map_builder import create_battle_map, generate_army_composition
+from rl_modules.commander import RLCommander
+
+MAX_TURNS = 2000
+LOGIC_SPEED = 10
+GAME_SPEED_MULTIPLIER = 2.0
+
+REWARD_WIN = 5000
+REWARD_LOSS = -2000
+REWARD_DRAW = -1000
+
+
+def make_battle(ai_1, ai_2, map_size=80, units_per_team=40, engine_cls=Engine):
+    """Tạo map + hai đội (castle, house, lính) như trong huấn luyện."""
+    # Margin 15 đơn vị để tránh spawn ngoài bản đồ nếu map nhỏ
+    margin = 15
+    spawn_1 = (margin, margin)
+    spawn_2 = (map_size - margin, map_size - margin)
+
+    game_map = create_battle_map(width=map_size, height=map_size)
+    army_1 = Army(0, generate_army_composition(0, spawn_1[0], spawn_1[1], units_per_team), ai_1)
+    army_2 = Army(1, generate_army_composition(1, spawn_2[0], spawn_2[1], units_per_team), ai_2)
+    return engine_cls(game_map, army_1, army_2)
+
+
+def terminal_rewards(winner):
+    """Phần thưởng cuối trận (team1, team2)."""
+    if winner == 0:
+        return REWARD_WIN, REWARD_LOSS
+    if winner == 1:
+        return REWARD_LOSS, REWARD_WIN
+    return REWARD_DRAW, REWARD_DRAW
+
+
+class _BattleSlot:
+    """Một trận trong lô: engine + hai commander nhận chiến thuật từ ngoài."""
+
+    def __init__(self, map_size, units_per_team, max_turns, ticks_per_step, dt, engine_cls,
+                 decision_interval=1, decide_on_change=False):
+        self.map_size = map_size
+        self.decision_interval = decision_interval
+        self.decide_on_change = decide_on_change
+        self.obs = None
+        self.units_per_team = units_per_team
+        self.max_turns = max_turns
+        self.ticks_per_step = ticks_per_step
+        self.dt = dt
+        self.engine_cls = engine_cls
+        self.engine = None
+        self.commanders = None
+        self.scores = [0, 0]
+        self.episode_rewards = [0.0, 0.0]
+        self.started = 0.0
+
+    def reset(self):
+        self.commanders = (RLCommander(0, "team1", learning=False, decision_interval=self.decision_interval),
+                           RLCommander(1, "team2", learning=False, decision_interval=self.decision_interval))
+        self.engine = make_battle(self.commanders[0], self.commanders[1],
+                                  self.map_size, self.units_per_team, self.engine_cls)
+        obs, self.scores = self._observe()
+        self.obs = obs
+        self.episode_rewards = [0.0, 0.0]
+        self.started = time.perf_counter()
+        return obs
+
+    def _observe(self):
+        """Trả về (state key mỗi đội, điểm mỗi đội) trên các lính còn sống."""
+        # Commander đã bind vào engine đọc tổng số O(1), không cần danh sách lính
+        if all(c.totals is not None for c in self.commanders):
+            living = [[], []]
+        else:
+            living = [[u for u in army.units if u.is_alive] for army in self.engine.armies]
+        obs = []
+        scores = []
+        for i, commander in enumerate(self.commanders):
+            mine, enemy = living[i], living[1 - i]
+            obs.append(commander._get_state_key(mine, enemy))
+            scores.append(commander.calculate_weighted_score(mine, enemy))
+        return tuple(obs), scores
+
+    def _state_changed(self):
+        """State key của một đội đã khác quan sát đầu bước chưa (O(1) nhờ ArmyTotals)."""
+        return any(commander.totals is not None and commander._get_state_key([], []) != self.obs[i]
+                   for i, commander in enumerate(self.commanders))
+
+    def step(self, strategies):
+        engine = self.engine
+        for commander, strategy in zip(self.commanders, strategies):
+            commander.forced_strategy = strategy
+            # Điểm quyết định: phát lệnh ngay ở tick đầu của bước
+            commander.last_decision_turn = None
+
+        ticks = 0
+        for _ in range(self.ticks_per_step):
+            if engine.turn_count >= self.max_turns or not engine.step(self.dt):
+                break
+            ticks += 1
+            if self.decide_on_change and self._state_changed():
+                break
+        # Ghi nhận ngay kết thúc trận (sinh ra ở tick cuối)
+        engine._reap_dead_units()
+        done = engine._check_game_over() or engine.turn_count >= self.max_turns
+
+        obs, scores = self._observe()
+        self.obs = obs
+        # Phạt thời gian: -1 mỗi tick đã chạy
+        rewards = [scores[i] - self.scores[i] - ticks for i in range(2)]
+        self.scores = scores
+
+        info = {}
+        if done:
+            bonus = terminal_rewards(engine.winner)
+            rewards = [rewards[0] + bonus[0], rewards[1] + bonus[1]]
+        self.episode_rewards = [self.episode_rewards[i] + rewards[i] for i in range(2)]
+        if done:
+            info = {"winner": engine.winner, "turns": engine.turn_count, "terminal_obs": obs,
+                    "wall": time.perf_counter() - self.started, "rewards": self.episode_rewards}
+            obs = self.reset()
+        return obs, tuple(rewards), done, info
+
+
+def _worker_loop(conn, slot_kwargs, count, seed):
+    """Tiến trình con: giữ `count` trận và trả lời các lệnh reset/step/close."""
+    seed_all(seed)
+    slots = [_BattleSlot(**slot_kwargs) for _ in range(count)]
+    try:
+        while True:
+            command, data = conn.recv()
+            if command == "reset":
+                conn.send([slot.reset() for slot in slots])
+            elif command == "step":
+                conn.send([slot.step(strategies) for slot, strategies in zip(slots, data)])
+            elif command == "close":
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        conn.close()
+
+
+class VecBattleEnv:
+    """
+    M trận độc lập chạy lockstep.
+
+    Một bước = một macro-action: `ticks_per_step` (mặc định `decision_interval`)
+    tick, phần thưởng cộng dồn trên các tick đó; `decide_on_change` kết thúc
+    bước sớm khi state key đổi.
+
+    API:
+        obs = env.reset()                   # [(state_team1, state_team2)] * M
+        obs, rewards, dones, infos = env.step(strategies)
+            strategies: [(chiến thuật team1, chiến thuật team2)] * M
+            rewards:    [(r_team1, r_team2)] * M (đã gồm thưởng thắng/thua khi done)
+            infos[i]:   {"winner", "turns", "terminal_obs", "wall", "rewards"}
+                        nếu trận i vừa kết thúc (rewards: tổng reward cả trận)
+    """
+
+    def __init__(self, num_envs, map_size=80, units_per_team=40, max_turns=MAX_TURNS,
+                 ticks_per_step=None, logic_speed=LOGIC_SPEED, workers=0, seed=None,
+                 engine_cls=Engine, decision_interval=1, decide_on_change=False):
+        self.num_envs = num_envs
+        self.workers = min(workers, num_envs)
+        slot_kwargs = {
+            "map_size": map_size,
+            "units_per_team": units_per_team,
+            "max_turns": max_turns,
+            "ticks_per_step": ticks_per_step or max(1, decision_interval),
+            "dt": logic_speed / 60.0 * GAME_SPEED_MULTIPLIER,
+            "engine_cls": engine_cls,
+            # Lệnh cho lính được phát lại mỗi `decision_interval` tick (hoặc khi đổi chiến thuật)
+            "decision_interval": decision_interval,
+            "decide_on_change": decide_on_change,
+        }
+
+        self._slots = []
+        self._pipes = []
+        self._processes = []
+        self._counts = []
+        if self.workers <= 0:
+            if seed is not None:
+                seed_all(seed)
+            self._slots = [_BattleSlot(**slot_kwargs) for _ in range(num_envs)]
+            return
+
+        # Chia đều các trận cho các tiến trình con; mỗi tiến trình có seed riêng
+        # (fork sao chép trạng thái random của tiến trình cha)
+        base_seed = seed if seed is not None else random.randrange(2 ** 32)
+        for w in range(self.workers):
+            count = num_envs // self.workers + (1 if w < num_envs % self.workers else 0)
+            parent_conn, child_conn = mp.Pipe()
+            process = mp.Process(target=_worker_loop,
+                                 args=(child_conn, slot_kwargs, count, base_seed + w),
+                                 daemon=True)
+            process.start()
+            child_conn.close()
+            self._pipes.append(parent_conn)
+            self._processes.append(process)
+            self._counts.append(count)
+
+    def reset(self):
+        if not self._pipes:
+            return [slot.reset() for slot in self._slots]
+        for conn in self._pipes:
+            conn.send(("reset", None))
+        return [obs for conn in self._pipes for obs in conn.recv()]
+
+    def step(self, strategies):
+        if not self._pipes:
+            results = [slot.step(s) for slot, s in zip(self._slots, strategies)]
+        else:
+            start = 0
+            for conn, count in zip(self._pipes, self._counts):
+                conn.send(("step", strategies[start:start + count]))
+                start += count
+            results = [r for conn in self._pipes for r in conn.recv()]
+
+        obs, rewards, dones, infos = zip(*results)
+        return list(obs), list(rewards), list(dones), list(infos)
+
+    def close(self):
+        for conn in self._pipes:
+            try:
+                conn.send(("close", None))
+            except (OSError, BrokenPipeError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._pipes = []
+        self._processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
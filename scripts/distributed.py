@@ -0,0 +1,434 @@
+# scripts/distributed.py
+"""
+Protocole coordinateur / worker pour distribuer des matchs sur plusieurs machines.
+
+Transport: TCP brut, un message JSON par ligne (UTF-8).
+
+Messages coordinateur -> worker:
+    {"type": "blob", "hash": str, "name": str, "content": str}
+        Fichier (scenario, armee) reference par son hash, contenu en base64
+        (les scenarios .bscen sont binaires). Envoye une seule fois par
+        worker, avant le premier job qui en a besoin.
+    {"type": "job", "job_id": int, "kind": str, "spec": dict}
+        Match a jouer. `kind` selectionne le handler (voir JOB_HANDLERS).
+    {"type": "shutdown"}
+
+Messages worker -> coordinateur:
+    {"type": "hello", "worker": str}
+    {"type": "result", "job_id": int, "result": dict}
+
+Un worker qui perd la connexion se reconnecte automatiquement; le job qu'il
+traitait est remis en file par le coordinateur et rejoue par un autre worker,
+au plus MAX_JOB_ATTEMPTS fois. Un job qui n'a pas pu etre joue (worker perdu
+trop souvent, plus aucun worker, delai depasse) recoit le resultat
+{"error": str}, comme un match en erreur.
+
+Usage (worker sur une autre machine):
+    python -m scripts.distributed --connect 192.168.1.10:5555
+    python main.py worker --connect 192.168.1.10:5555
+"""
+import sys
+import os
+import json
+import time
+import base64
+import queue
+import socket
+import hashlib
+import tempfile
+import threading
+import subprocess
+import argparse
+
+# Add project root to path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+DEFAULT_PORT = 5555
+# Tentatives par job: un job qui fait tomber son worker autant de fois est abandonne
+MAX_JOB_ATTEMPTS = 3
+# Duree sans aucun worker connecte au-dela de laquelle run_jobs abandonne le lot
+DEFAULT_WORKER_TIMEOUT = 120.0
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "battle_worker_cache")
+
+
+# =============================================================================
+# Transport
+# =============================================================================
+
+def send_message(sock: socket.socket, message: dict):
+    """Envoie un message JSON termine par un saut de ligne."""
+    data = json.dumps(message, separators=(",", ":")) + "\n"
+    sock.sendall(data.encode("utf-8"))
+
+
+def read_message(reader) -> dict | None:
+    """Lit un message depuis le fichier associe a la socket (None si fermee)."""
+    line = reader.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def parse_address(address: str, default_host: str = "127.0.0.1") -> tuple[str, int]:
+    """Parse 'HOST:PORT' (ou ':PORT', ou 'PORT')."""
+    if ":" in address:
+        host, port = address.rsplit(":", 1)
+    else:
+        host, port = "", address
+    return (host or default_host, int(port))
+
+
+def file_blob(path: str) -> tuple[str, dict]:
+    """Retourne (hash, blob) pour un fichier a envoyer aux workers."""
+    with open(path, "rb") as f:
+        content = f.read()
+    blob_hash = hashlib.sha256(content).hexdigest()[:16]
+    return blob_hash, {"name": os.path.basename(path), "content": base64.b64encode(content).decode("ascii")}
+
+
+# =============================================================================
+# Coordinateur
+# =============================================================================
+
+class Coordinator:
+    """
+    Distribue des jobs aux workers connectes et collecte leurs resultats.
+
+    Les workers peuvent se connecter a tout moment (avant ou pendant
+    `run_jobs`). Un job en cours sur un worker deconnecte est remis en file.
+    """
+
+    def __init__(self, host: str = "0.0.0.0", port: int = DEFAULT_PORT):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((host, port))
+        self.server.listen()
+        self.address: tuple[str, int] = self.server.getsockname()
+
+        self._pending: queue.Queue = queue.Queue()
+        self._results: dict[int, dict] = {}
+        # Tentatives par job du lot en cours (les ids sont uniques sur la vie du coordinateur)
+        self._attempts: dict[int, int] = {}
+        self._next_job_id = 0
+        self._blobs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._done = threading.Condition(self._lock)
+        self._workers: dict[str, socket.socket] = {}
+        self._closed = False
+        self.local_processes: list[subprocess.Popen] = []
+
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def worker_count(self) -> int:
+        """Nombre de workers actuellement connectes."""
+        with self._lock:
+            return len(self._workers)
+
+    def wait_for_workers(self, count: int, timeout: float = 30.0) -> bool:
+        """Attend qu'au moins `count` workers soient connectes."""
+        deadline = time.monotonic() + timeout
+        while self.worker_count() < count:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def run_jobs(self, jobs: list[tuple[str, dict]], blobs: dict[str, dict] = None,
+                 timeout: float = None, worker_timeout: float = DEFAULT_WORKER_TIMEOUT) -> list[dict]:
+        """
+        Execute une liste de jobs (kind, spec) et retourne les resultats
+        dans le meme ordre. Bloque jusqu'a ce que tous soient termines.
+
+        Les jobs restants recoivent {"error": str} si aucun worker n'est
+        connecte pendant `worker_timeout` secondes, des que tous les workers
+        locaux (spawn_local_workers) sont arretes sans autre worker connecte,
+        ou apres `timeout` secondes pour le lot entier (None = sans limite).
+        """
+        with self._lock:
+            first = self._next_job_id
+            self._next_job_id += len(jobs)
+            job_ids = range(first, first + len(jobs))
+            self._results = {}
+            self._attempts = {job_id: 0 for job_id in job_ids}
+            if blobs:
+                self._blobs.update(blobs)
+        for job_id, (kind, spec) in zip(job_ids, jobs):
+            self._pending.put({"type": "job", "job_id": job_id, "kind": kind, "spec": spec})
+
+        start = time.monotonic()
+        last_worker = start
+        with self._done:
+            while len(self._results) < len(jobs):
+                self._done.wait(timeout=0.5)
+                now = time.monotonic()
+                if self._workers:
+                    last_worker = now
+                error = None
+                if timeout is not None and now - start > timeout:
+                    error = f"delai du lot depasse ({timeout:g} s)"
+                elif not self._workers:
+                    if self.local_processes and all(p.poll() is not None for p in self.local_processes):
+                        error = "tous les workers locaux se sont arretes"
+                    elif now - last_worker > worker_timeout:
+                        error = f"aucun worker connecte depuis {worker_timeout:g} s"
+                if error is not None:
+                    self._abandon_pending(job_ids, error)
+            return [self._results[job_id] for job_id in job_ids]
+
+    def _abandon_pending(self, job_ids: range, error: str):
+        """Retire les jobs encore en file et donne une erreur a tous les jobs sans resultat (verrou tenu)."""
+        while True:
+            try:
+                self._pending.get_nowait()
+            except queue.Empty:
+                break
+        for job_id in job_ids:
+            self._results.setdefault(job_id, {"error": error})
+        self._done.notify_all()
+
+    def _requeue(self, job: dict):
+        """Remet en file un job interrompu, ou l'abandonne apres MAX_JOB_ATTEMPTS tentatives."""
+        job_id = job["job_id"]
+        with self._done:
+            if job_id not in self._attempts or job_id in self._results:
+                return  # Lot termine ou abandonne entre-temps
+            self._attempts[job_id] += 1
+            if self._attempts[job_id] >= MAX_JOB_ATTEMPTS:
+                self._results[job_id] = {
+                    "error": f"worker perdu pendant le job ({MAX_JOB_ATTEMPTS} tentatives)"}
+                self._done.notify_all()
+                return
+        self._pending.put(job)
+
+    def close(self):
+        """Arrete les workers (shutdown) et ferme le serveur."""
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers.values())
+        for sock in workers:
+            try:
+                send_message(sock, {"type": "shutdown"})
+            except OSError:
+                pass
+        try:
+            self.server.close()
+        except OSError:
+            pass
+        for proc in self.local_processes:
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.terminate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _accept_loop(self):
+        while not self._closed:
+            try:
+                sock, _ = self.server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve_worker, args=(sock,), daemon=True).start()
+
+    def _serve_worker(self, sock: socket.socket):
+        """Boucle de dialogue avec un worker: un job a la fois."""
+        reader = sock.makefile("r", encoding="utf-8")
+        worker_name = None
+        sent_blobs: set[str] = set()
+        job = None
+        try:
+            hello = read_message(reader)
+            if not hello or hello.get("type") != "hello":
+                return
+            worker_name = hello.get("worker") or f"worker-{id(sock)}"
+            with self._lock:
+                self._workers[worker_name] = sock
+
+            while not self._closed:
+                try:
+                    job = self._pending.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+
+                for key in ("scenario", "army"):
+                    blob_hash = job["spec"].get(key)
+                    if blob_hash and blob_hash not in sent_blobs:
+                        blob = self._blobs[blob_hash]
+                        send_message(sock, {"type": "blob", "hash": blob_hash, **blob})
+                        sent_blobs.add(blob_hash)
+
+                send_message(sock, job)
+                reply = read_message(reader)
+                if reply is None:
+                    raise ConnectionError("worker deconnecte")
+
+                with self._done:
+                    # Resultat tardif d'un lot abandonne: ignore
+                    if reply["job_id"] in self._attempts:
+                        self._results.setdefault(reply["job_id"], reply["result"])
+                        self._done.notify_all()
+                job = None
+        except (OSError, ConnectionError, ValueError):
+            pass
+        finally:
+            # Remettre en file le job interrompu (nombre de tentatives limite)
+            if job is not None:
+                self._requeue(job)
+            with self._lock:
+                if worker_name and self._workers.get(worker_name) is sock:
+                    del self._workers[worker_name]
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+
+def spawn_local_workers(count: int, address: tuple[str, int]) -> list[subprocess.Popen]:
+    """Lance `count` processus workers locaux connectes a `address`."""
+    host, port = address
+    if host in ("0.0.0.0", ""):
+        host = "127.0.0.1"
+    processes = []
+    for i in range(count):
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "scripts.distributed",
+             "--connect", f"{host}:{port}", "--name", f"local-{i}"],
+            cwd=PROJECT_ROOT,
+        ))
+    return processes
+
+
+def open_coordinator(listen: str = None, local_workers: int = 0) -> Coordinator | None:
+    """
+    Cree un coordinateur pour les options CLI `--listen` / `--workers`.
+    Retourne None si aucune des deux options n'est utilisee (mode local).
+    """
+    if not listen and local_workers <= 0:
+        return None
+
+    # ':5555' -> ecouter sur toutes les interfaces
+    host, port = parse_address(listen, default_host="0.0.0.0") if listen else ("127.0.0.1", 0)
+    coordinator = Coordinator(host, port)
+    print(f"Coordinateur en ecoute sur {coordinator.address[0]}:{coordinator.address[1]}")
+
+    if local_workers > 0:
+        coordinator.local_processes = spawn_local_workers(local_workers, coordinator.address)
+        if not coordinator.wait_for_workers(local_workers):
+            print(f"Attention: seulement {coordinator.worker_count()}/{local_workers} workers connectes.")
+    return coordinator
+
+
+# =============================================================================
+# Worker
+# =============================================================================
+
+def run_match_job(spec: dict, blob_paths: dict[str, str]) -> dict:
+    """Handler 'match': joue un match de tournoi headless."""
+    from scripts.tournament import run_headless_match
+
+    return run_headless_match(
+        blob_paths[spec["scenario"]],
+        spec["p0"], spec["p1"],
+        army_file=blob_paths.get(spec.get("army")),
+        max_turns=spec.get("max_turns", 5000),
+        seed=spec.get("seed"),
+        profile=spec.get("profile", False),
+    )
+
+
+def run_rl_episode_job(spec: dict, blob_paths: dict[str, str]) -> dict:
+    """Handler 'rl_episode': joue un episode d'entrainement RL."""
+    from rl_modules.trainer import run_episode_job
+
+    return run_episode_job(spec)
+
+
+JOB_HANDLERS = {
+    "match": run_match_job,
+    "rl_episode": run_rl_episode_job,
+}
+
+
+class Worker:
+    """
+    Worker headless: se connecte au coordinateur, joue les jobs recus et
+    renvoie des resultats compacts. Se reconnecte apres une deconnexion.
+    """
+
+    def __init__(self, host: str, port: int, name: str = None,
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0):
+        self.host = host
+        self.port = port
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        # hash -> chemin local du fichier recu
+        self.blob_paths: dict[str, str] = {}
+
+    def run(self):
+        """Boucle principale avec reconnexion (backoff exponentiel)."""
+        delay = self.reconnect_delay
+        while True:
+            try:
+                with socket.create_connection((self.host, self.port)) as sock:
+                    delay = self.reconnect_delay
+                    if self._serve(sock):
+                        return
+            except OSError:
+                pass
+            time.sleep(delay)
+            delay = min(self.max_reconnect_delay, delay * 2)
+
+    def _serve(self, sock: socket.socket) -> bool:
+        """Traite les messages d'une connexion. Retourne True sur shutdown."""
+        reader = sock.makefile("r", encoding="utf-8")
+        send_message(sock, {"type": "hello", "worker": self.name})
+        while True:
+            message = read_message(reader)
+            if message is None:
+                return False
+
+            msg_type = message.get("type")
+            if msg_type == "shutdown":
+                return True
+            elif msg_type == "blob":
+                self._store_blob(message)
+            elif msg_type == "job":
+                handler = JOB_HANDLERS.get(message["kind"])
+                try:
+                    if handler is None:
+                        raise ValueError(f"Type de job inconnu: {message['kind']}")
+                    result = handler(message["spec"], self.blob_paths)
+                except Exception as e:
+                    result = {"error": str(e)}
+                send_message(sock, {"type": "result", "job_id": message["job_id"], "result": result})
+
+    def _store_blob(self, message: dict):
+        """Ecrit un fichier recu dans le cache local (nom = hash + extension)."""
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _, ext = os.path.splitext(message["name"])
+        path = os.path.join(CACHE_DIR, f"{message['hash']}{ext}")
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(base64.b64decode(message["content"]))
+        self.blob_paths[message["hash"]] = path
+
+
+def main(args: list[str] = None):
+    parser = argparse.ArgumentParser(description="Worker de matchs distribues")
+    parser.add_argument("--connect", type=str, default=f"127.0.0.1:{DEFAULT_PORT}",
+                        help="Adresse du coordinateur (HOST:PORT)")
+    parser.add_argument("--name", type=str, default=None, help="Nom du worker")
+    parsed = parser.parse_args(args)
+
+    host, port = parse_address(parsed.connect)
+    Worker(host, port, name=parsed.name).run()
+
+
+if __name__ == "__main__":
+    main()
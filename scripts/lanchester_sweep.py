@@ -0,0 +1,119 @@
+# scripts/lanchester_sweep.py
+"""
+Balayage Lanchester parallele (N x seeds) pour la commande `plot`.
+
+Chaque point (unite, general, N, seed) est une bataille headless independante,
+executee dans un pool de processus. Les resultats sont mis en cache sur disque:
+re-tracer un graphique ou etendre le range ne simule que les nouveaux points.
+La cle de cache contient aussi max_turns et la mise en place de la bataille
+(carte, zone de formation, jitter): changer l'un d'eux re-simule les points.
+"""
+import sys
+import os
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from scripts.run_scenario import (run_lanchester_battle, FORMATION_JITTER,
+                                  LANCHESTER_FORMATION_SIZE, LANCHESTER_MAP_SIZE)
+
+DEFAULT_CACHE_PATH = "cache/lanchester_sweep.json"
+
+
+def _cache_key(unit_type: str, general_name: str, n: int, seed: int, max_turns: int) -> str:
+    map_w, map_h = LANCHESTER_MAP_SIZE
+    formation_w, formation_h = LANCHESTER_FORMATION_SIZE
+    return (f"{unit_type}|{general_name}|{n}|{seed}|{max_turns}"
+            f"|{map_w}x{map_h}|{formation_w}x{formation_h}|{FORMATION_JITTER}")
+
+
+def load_cache(path: str) -> dict:
+    """Charge le cache des resultats (dict vide si absent ou illisible)."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_cache(cache: dict, path: str):
+    """Ecrit le cache (fichier temporaire puis renommage)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Percentile q (0-100) par interpolation lineaire."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * q / 100.0
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def run_sweep(unit_type: str, general_name: str, values: list[int], seeds: list[int],
+              workers: int = None, cache_path: str = DEFAULT_CACHE_PATH,
+              max_turns: int = 2000) -> dict[int, list[dict]]:
+    """
+    Execute toutes les batailles (N, seed) manquantes dans le cache.
+
+    Returns:
+        {N: [resultat par seed]} dans l'ordre de `seeds`.
+    """
+    cache = load_cache(cache_path) if cache_path else {}
+
+    missing = [(n, seed) for n in values for seed in seeds
+               if _cache_key(unit_type, general_name, n, seed, max_turns) not in cache]
+    cached = len(values) * len(seeds) - len(missing)
+    print(f"Points: {len(values) * len(seeds)} ({cached} en cache, {len(missing)} a simuler)")
+
+    if missing:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(run_lanchester_battle, unit_type, general_name, n, seed, max_turns): (n, seed)
+                for n, seed in missing
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                n, seed = futures[future]
+                result = future.result()
+                cache[_cache_key(unit_type, general_name, n, seed, max_turns)] = result
+                print(f"  [{done}/{len(missing)}] N={n} seed={seed}: "
+                      f"gagnant perd {result['casualties'][1]}/{2 * n}")
+
+        if cache_path:
+            save_cache(cache, cache_path)
+
+    return {n: [cache[_cache_key(unit_type, general_name, n, seed, max_turns)] for seed in seeds]
+            for n in values}
+
+
+def summarize(results: dict[int, list[dict]], low: float = 10, high: float = 90) -> dict:
+    """
+    Agrege les pertes par N: moyenne et percentiles [low, high].
+
+    Returns:
+        {"N": [...], "winner_mean": [...], "winner_low": [...], "winner_high": [...],
+         "loser_mean": [...], "loser_low": [...], "loser_high": [...]}
+    """
+    summary = {key: [] for key in ("N", "winner_mean", "winner_low", "winner_high",
+                                   "loser_mean", "loser_low", "loser_high")}
+    for n in sorted(results):
+        # Armee 2 (2N) = gagnant attendu, armee 1 (N) = perdant attendu
+        winner_losses = [r["casualties"][1] for r in results[n]]
+        loser_losses = [r["casualties"][0] for r in results[n]]
+        summary["N"].append(n)
+        summary["winner_mean"].append(sum(winner_losses) / len(winner_losses))
+        summary["winner_low"].append(percentile(winner_losses, low))
+        summary["winner_high"].append(percentile(winner_losses, high))
+        summary["loser_mean"].append(sum(loser_losses) / len(loser_losses))
+        summary["loser_low"].append(percentile(loser_losses, low))
+        summary["loser_high"].append(percentile(loser_losses, high))
+    return summary
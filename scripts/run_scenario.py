@@ -5,14 +5,27 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 import math
+import random
+from core.map import Map
 from core.army import Army
 from core.unit import Unit
+from engine import Engine
+from core.rng import seed_all
 from ai.generals import MajorDAFT
 from core.definitions import GENERAL_CLASS_MAP, UNIT_CLASS_MAP
 
-def lanchester_scenario(unit_class: type[Unit], n: int, general_class=MajorDAFT):
+# Amplitude (en tuiles) du décalage aléatoire appliqué aux formations seedées
+FORMATION_JITTER = 0.25
+
+# Bataille Lanchester: zone de placement des formations et carte jouee
+LANCHESTER_FORMATION_SIZE = (40, 40)
+LANCHESTER_MAP_SIZE = (60, 60)
+
+def lanchester_scenario(unit_class: type[Unit], n: int, general_class=MajorDAFT,
+                        rng: random.Random = None):
     """
     Creates a scenario for testing Lanchester's Laws.
+    rng: if given, jitters the formations so that each seed is a distinct sample.
     """
     comp1 = {unit_class.__name__: n}
     comp2 = {unit_class.__name__: 2*n}
@@ -20,16 +33,43 @@ def lanchester_scenario(unit_class: type[Unit], n: int, general_class=MajorDAFT)
     return custom_battle_scenario(
         comp1, comp2, 
         general_class, general_class, 
-        (40, 40)
+        LANCHESTER_FORMATION_SIZE,
+        rng=rng
     )
 
+def run_lanchester_battle(unit_type: str, general_name: str, n: int, seed: int,
+                          max_turns: int = 2000) -> dict:
+    """
+    Runs one headless N vs 2N battle and returns a compact result.
+    Used by the parallel `plot` sweep (scripts/lanchester_sweep.py).
+    """
+    seed_all(seed)
+    unit_class = UNIT_CLASS_MAP[unit_type]
+    general_class = GENERAL_CLASS_MAP[general_name]
+
+    army1, army2 = lanchester_scenario(unit_class, n, general_class, rng=random.Random(seed))
+    engine = Engine(Map(*LANCHESTER_MAP_SIZE), army1, army2, seed=seed)
+    engine.run_game(max_turns=max_turns, view=None, logic_speed=1, quiet=True)
+
+    alive = [sum(1 for u in army.units if u.is_alive) for army in (army1, army2)]
+    return {
+        "winner": engine.winner,
+        "turns": engine.turn_count,
+        "alive": alive,
+        "casualties": [n - alive[0], 2 * n - alive[1]],
+    }
+
 def custom_battle_scenario(comp1: dict[str, int], 
                            comp2: dict[str, int],
                            general_class1: type, 
                            general_class2: type,
-                           map_size: tuple[int, int] = (120, 120)):
+                           map_size: tuple[int, int] = (120, 120),
+                           rng: random.Random = None):
     
     width, height = map_size
+
+    def jitter() -> float:
+        return rng.uniform(-FORMATION_JITTER, FORMATION_JITTER) if rng else 0.0
     # FIX 1: Increased spacing to 2.5 to accommodate Elephants and prevent "stuck" collisions
     spacing = 2.5 
     
@@ -69,8 +109,8 @@ def custom_battle_scenario(comp1: dict[str, int],
         for _ in range(comp1[unit_name]):
             row, col = divmod(current_idx, cols1)
             # Front line is the highest row index
-            pos_x = start_x1 + col * spacing
-            pos_y = start_y1 + row * spacing
+            pos_x = start_x1 + col * spacing + jitter()
+            pos_y = start_y1 + row * spacing + jitter()
             army1_units.append(u_class(unit_id=current_idx, army_id=0, pos=(pos_x, pos_y)))
             current_idx += 1
 
@@ -85,8 +125,8 @@ def custom_battle_scenario(comp1: dict[str, int],
         u_class = UNIT_CLASS_MAP[unit_name]
         for _ in range(comp2[unit_name]):
             row, col = divmod(current_idx_2, cols2)
-            pos_x = start_x2 - col * spacing
-            pos_y = start_y2 - row * spacing
+            pos_x = start_x2 - col * spacing + jitter()
+            pos_y = start_y2 - row * spacing + jitter()
             army2_units.append(u_class(unit_id=10000 + current_idx_2, army_id=1, pos=(pos_x, pos_y)))
             current_idx_2 += 1
 
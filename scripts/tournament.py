@@ -6,6 +6,7 @@ Génère un rapport HTML complet avec matrices de scores.
 import sys
 import os
 import itertools
+from io import StringIO
 from collections import defaultdict
 from datetime import datetime
 
@@ -17,6 +18,8 @@ from core.definitions import GENERAL_CLASS_MAP, UNIT_CLASS_MAP
 from utils.unified_loader import load_scenario
 from utils.loaders import load_map_from_file
 from engine import Engine
+from core.rng import derive_seed, new_seed, seed_all
+from core.profiler import TickProfiler
 
 
 class Tournament:
@@ -31,7 +34,8 @@ class Tournament:
     
     def __init__(self, general_names: list[str], scenario_paths: list[str], 
                  rounds: int = 10, alternate_positions: bool = True,
-                 army_file: str = None):
+                 army_file: str = None, coordinator=None, seed: int = None,
+                 record_dir: str = None, profile: bool = False):
         """
         Args:
             general_names: Liste des noms de generaux a combattre
@@ -39,15 +43,31 @@ class Tournament:
             rounds: Nombre de rounds par matchup
             alternate_positions: Si True, alterne les positions (P0/P1) sur les rounds
             army_file: Fichier armee a utiliser (defaut: 10 Knights)
+            coordinator: Coordinateur distribue (scripts.distributed.Coordinator).
+                Si None, les matchs sont joues localement.
+            seed: Graine du tournoi (tiree au hasard si None). Chaque match recoit
+                une graine derivee, enregistree dans l'historique: un match peut
+                etre rejoue a l'identique avec `battle run ... --seed`.
+            record_dir: Si defini, chaque match local est enregistre en replay
+                binaire dans ce dossier (voir `battle replay`).
+            profile: Si True, cumule le profil par phase du tick de tous les
+                matchs (core/profiler.py) et l'affiche a la fin.
         """
         self.general_names = general_names
         self.scenario_paths = scenario_paths
         self.rounds = rounds
         self.alternate_positions = alternate_positions
         self.army_file = army_file
+        self.coordinator = coordinator
+        self.seed = seed if seed is not None else new_seed()
+        self.record_dir = record_dir
+        self.profiler = TickProfiler() if profile else None
         
         # Historique des matchs
-        # Format: {"scenario": str, "gen_p0": str, "gen_p1": str, "winner": str|None}
+        # Format: {"scenario": str, "gen_p0": str, "gen_p1": str, "winner": str|None, "seed": int,
+        #          "replay": str|None, "error": str|None}
+        # Un match en erreur (moteur, scenario) n'est ni une victoire ni une egalite:
+        # il est compte a part et exclu des statistiques.
         self.match_history: list[dict] = []
         
     def run(self):
@@ -56,21 +76,37 @@ class Tournament:
         """
         n_gens = len(self.general_names)
         total_matchups = len(self.scenario_paths) * n_gens * (n_gens - 1) * self.rounds
-        current = 0
         
         print(f"\nTotal de matchs a jouer: {total_matchups}")
+        print(f"Graine du tournoi: {self.seed}")
         print("-" * 60)
         
+        schedule = self._build_schedule()
+        
+        if self.coordinator is not None:
+            self._run_distributed(schedule)
+        else:
+            self._run_local(schedule)
+        
+        print("\n" + "=" * 60)
+        print("Tournoi termine!")
+        print("=" * 60)
+        
+        self._print_console_summary()
+        self._generate_html_report()
+        if self.profiler is not None:
+            print("\n" + self.profiler.report())
+    
+    def _build_schedule(self) -> list[tuple[str, str, str]]:
+        """
+        Construit la liste ordonnee des matchs (scenario, P0, P1).
+        """
+        schedule = []
         for scenario_path in self.scenario_paths:
-            scenario_name = os.path.basename(scenario_path)
-            print(f"\n[SCENARIO] {scenario_name}")
-            
             # Toutes les paires sans reflexifs (A vs B, B vs A, mais pas A vs A)
             for gen1_name, gen2_name in itertools.permutations(self.general_names, 2):
                 
                 for round_num in range(self.rounds):
-                    current += 1
-                    
                     # Déterminer qui est player 0 / player 1
                     if self.alternate_positions:
                         # Alterner: rounds pairs = gen1 en P0, rounds impairs = gen1 en P1
@@ -82,133 +118,133 @@ class Tournament:
                         # Pas d'alternance: gen1 toujours en P0
                         p0_name, p1_name = gen1_name, gen2_name
                     
-                    progress = f"[{current}/{total_matchups}]"
-                    print(f"  {progress} {p0_name} (P0) vs {p1_name} (P1)... ", end="", flush=True)
-                    
-                    # Charger et exécuter le match
-                    winner_name = self._run_match(scenario_path, p0_name, p1_name)
-                    
-                    # Enregistrer le résultat
-                    self.match_history.append({
-                        "scenario": scenario_path,
-                        "gen_p0": p0_name,
-                        "gen_p1": p1_name,
-                        "winner": winner_name
-                    })
-                    
-                    if winner_name:
-                        print(f"-> Gagnant: {winner_name}")
-                    else:
-                        print("-> Egalite")
-        
-        print("\n" + "=" * 60)
-        print("Tournoi termine!")
-        print("=" * 60)
-        
-        self._print_console_summary()
-        self._generate_html_report()
+                    schedule.append((scenario_path, p0_name, p1_name))
+        return schedule
     
-    def _run_match(self, scenario_path: str, p0_name: str, p1_name: str) -> str | None:
-        """
-        Execute un match unique et retourne le nom du gagnant (ou None pour egalite).
-        """
-        try:
-            # Charger le scenario (sans prints)
-            import sys
-            from io import StringIO
-            old_stdout = sys.stdout
-            sys.stdout = StringIO()  # Capturer les prints du loader
+    def _match_seed(self, index: int) -> int:
+        """Graine (32 bits) du match numero `index` du calendrier."""
+        return derive_seed(self.seed, "match", index) % (2 ** 32)
+    
+    def _replay_path(self, index: int, scenario_path: str, p0_name: str, p1_name: str) -> str | None:
+        """Chemin du replay du match numero `index` (None si pas d'enregistrement)."""
+        if not self.record_dir:
+            return None
+        scenario = os.path.splitext(os.path.basename(scenario_path))[0]
+        return os.path.join(self.record_dir, f"{index:04d}_{scenario}_{p0_name}_vs_{p1_name}.replay")
+    
+    def _record_match(self, scenario_path: str, p0_name: str, p1_name: str, winner_name: str | None,
+                      seed: int = None, replay: str = None, error: str = None):
+        """Enregistre le résultat d'un match dans l'historique."""
+        self.match_history.append({
+            "scenario": scenario_path,
+            "gen_p0": p0_name,
+            "gen_p1": p1_name,
+            "winner": winner_name,
+            "seed": seed,
+            "replay": replay,
+            "error": error
+        })
+
+    def _played_matches(self) -> list[dict]:
+        """Matchs joues jusqu'au bout (sans erreur), base de toutes les statistiques."""
+        return [m for m in self.match_history if not m.get("error")]
+    
+    def _run_local(self, schedule: list[tuple[str, str, str]]):
+        """Joue les matchs un par un dans ce processus."""
+        total_matchups = len(schedule)
+        last_scenario = None
+        if self.record_dir:
+            os.makedirs(self.record_dir, exist_ok=True)
+        
+        for current, (scenario_path, p0_name, p1_name) in enumerate(schedule, 1):
+            if scenario_path != last_scenario:
+                print(f"\n[SCENARIO] {os.path.basename(scenario_path)}")
+                last_scenario = scenario_path
             
-            try:
-                if scenario_path.endswith('.scen'):
-                    game_map, army1, army2 = load_scenario(scenario_path, p0_name, p1_name)
-                elif scenario_path.endswith('.map'):
-                    game_map = load_map_from_file(scenario_path)
-                    if self.army_file:
-                        # Utiliser le fichier armee specifie
-                        army1, army2 = self._create_armies_from_file(game_map, p0_name, p1_name)
-                    else:
-                        # Armee par defaut (10 Knights)
-                        army1, army2 = self._create_default_armies(game_map, p0_name, p1_name)
-                else:
-                    sys.stdout = old_stdout
-                    return None
-            finally:
-                sys.stdout = old_stdout
+            progress = f"[{current}/{total_matchups}]"
+            print(f"  {progress} {p0_name} (P0) vs {p1_name} (P1)... ", end="", flush=True)
             
-            # Executer le match (headless, rapide, quiet)
-            engine = Engine(game_map, army1, army2)
-            engine.run_game(max_turns=5000, view=None, logic_speed=1, quiet=True)
+            # Charger et exécuter le match
+            seed = self._match_seed(current - 1)
+            replay = self._replay_path(current - 1, scenario_path, p0_name, p1_name)
+            winner_name, error = self._run_match(scenario_path, p0_name, p1_name, seed, replay)
             
-            # Determiner le gagnant
-            if engine.winner is not None:
-                return p0_name if engine.winner == 0 else p1_name
-            return None  # Egalite
+            # Enregistrer le résultat (le replay d'un match en erreur est incomplet)
+            self._record_match(scenario_path, p0_name, p1_name, winner_name, seed,
+                               None if error else replay, error)
             
-        except Exception as e:
-            return None
+            if error:
+                print(f"-> ERREUR: {error}")
+            elif winner_name:
+                print(f"-> Gagnant: {winner_name}")
+            else:
+                print("-> Egalite")
     
-    def _create_default_armies(self, game_map: Map, p0_name: str, p1_name: str):
-        """Cree des armees par defaut pour les fichiers .map"""
-        from core.army import Army
-        from core.unit import Knight
-        
-        gen0_cls = GENERAL_CLASS_MAP[p0_name]
-        gen1_cls = GENERAL_CLASS_MAP[p1_name]
-        
-        # Positions proches du centre pour garantir un combat rapide
-        w, h = game_map.width, game_map.height
-        cx, cy = w // 2, h // 2
-        
-        units0 = []
-        units1 = []
-        
-        # 10 Knights par camp, positionnes proches l'un de l'autre
-        for i in range(10):
-            # Armee 0: a gauche du centre
-            units0.append(Knight(i, 0, (cx - 8 + (i % 5), cy - 2 + (i // 5))))
-            # Armee 1: a droite du centre
-            units1.append(Knight(10000 + i, 1, (cx + 4 + (i % 5), cy - 2 + (i // 5))))
+    def _run_distributed(self, schedule: list[tuple[str, str, str]]):
+        """
+        Distribue les matchs aux workers connectes au coordinateur.
+        Les scenarios (et le fichier armee) sont envoyes une seule fois par
+        worker, identifies par leur hash.
+        """
+        from scripts.distributed import file_blob
         
-        army0 = Army(0, units0, gen0_cls(0))
-        army1 = Army(1, units1, gen1_cls(1))
+        if self.record_dir:
+            print("Attention: les replays ne sont pas enregistres en mode distribue "
+                  "(rejouer un match avec `battle run ... --seed --record`).")
         
-        return army0, army1
+        blobs = {}
+        scenario_hashes = {}
+        for scenario_path in self.scenario_paths:
+            blob_hash, blob = file_blob(scenario_path)
+            blobs[blob_hash] = blob
+            scenario_hashes[scenario_path] = blob_hash
+        
+        army_hash = None
+        if self.army_file:
+            army_hash, blob = file_blob(self.army_file)
+            blobs[army_hash] = blob
+        
+        jobs = []
+        for index, (scenario_path, p0_name, p1_name) in enumerate(schedule):
+            jobs.append(("match", {
+                "scenario": scenario_hashes[scenario_path],
+                "army": army_hash,
+                "p0": p0_name,
+                "p1": p1_name,
+                "seed": self._match_seed(index),
+                "profile": self.profiler is not None,
+            }))
+        
+        print(f"Distribution de {len(jobs)} matchs sur les workers...")
+        results = self.coordinator.run_jobs(jobs, blobs)
+        
+        total_matchups = len(schedule)
+        for current, ((scenario_path, p0_name, p1_name), result) in enumerate(zip(schedule, results), 1):
+            winner_name = _winner_name(result, p0_name, p1_name)
+            error = result.get("error")
+            if self.profiler is not None and "profile" in result:
+                self.profiler.merge(result["profile"])
+            self._record_match(scenario_path, p0_name, p1_name, winner_name, self._match_seed(current - 1),
+                               error=error)
+            
+            progress = f"[{current}/{total_matchups}]"
+            if error:
+                outcome = f"ERREUR: {error}"
+            else:
+                outcome = f"Gagnant: {winner_name}" if winner_name else "Egalite"
+            print(f"  {progress} {os.path.basename(scenario_path)}: {p0_name} (P0) vs {p1_name} (P1) -> {outcome}")
     
-    def _create_armies_from_file(self, game_map: Map, p0_name: str, p1_name: str):
-        """Cree des armees a partir d'un fichier armee specifie"""
-        from core.army import Army
-        from utils.loaders import load_army_from_file
-        
-        gen0_cls = GENERAL_CLASS_MAP[p0_name]
-        gen1_cls = GENERAL_CLASS_MAP[p1_name]
-        
-        # Charger la configuration d'armee depuis le fichier
-        # On utilise le meme fichier pour les deux armees mais avec des generaux differents
-        base_army = load_army_from_file(self.army_file, 0, p0_name)
-        
-        # Positions proches du centre
-        w, h = game_map.width, game_map.height
-        cx, cy = w // 2, h // 2
-        
-        units0 = []
-        units1 = []
-        
-        # Recree les unites avec des positions centrees
-        unit_types = [type(u) for u in base_army.units]
-        n_units = len(unit_types)
-        
-        for i, unit_cls in enumerate(unit_types):
-            # Armee 0: a gauche du centre
-            row, col = i // 5, i % 5
-            units0.append(unit_cls(i, 0, (cx - 8 + col, cy - 2 + row)))
-            # Armee 1: a droite du centre
-            units1.append(unit_cls(10000 + i, 1, (cx + 4 + col, cy - 2 + row)))
-        
-        army0 = Army(0, units0, gen0_cls(0))
-        army1 = Army(1, units1, gen1_cls(1))
-        
-        return army0, army1
+    def _run_match(self, scenario_path: str, p0_name: str, p1_name: str, seed: int = None,
+                   replay: str = None) -> tuple[str | None, str | None]:
+        """
+        Execute un match unique et retourne (nom du gagnant ou None pour
+        egalite, message d'erreur ou None si le match a ete joue).
+        """
+        result = run_headless_match(scenario_path, p0_name, p1_name, army_file=self.army_file,
+                                    seed=seed, record=replay, profile=self.profiler is not None)
+        if self.profiler is not None and "profile" in result:
+            self.profiler.merge(result["profile"])
+        return _winner_name(result, p0_name, p1_name), result.get("error")
     
     def _print_console_summary(self):
         """Affiche un résumé dans la console."""
@@ -218,7 +254,7 @@ class Tournament:
         stats = {g: {"wins": 0, "draws": 0, "losses": 0, "total": 0} 
                  for g in self.general_names}
         
-        for m in self.match_history:
+        for m in self._played_matches():
             p0, p1, winner = m["gen_p0"], m["gen_p1"], m["winner"]
             
             # Stats pour P0
@@ -244,6 +280,12 @@ class Tournament:
             win_rate = (s["wins"] / s["total"] * 100) if s["total"] > 0 else 0
             print(f"  {g}: {s['wins']}W / {s['draws']}D / {s['losses']}L "
                   f"({win_rate:.1f}% victoires)")
+
+        errors = [m for m in self.match_history if m.get("error")]
+        if errors:
+            print(f"\n  ATTENTION: {len(errors)} match(s) en erreur, exclus des statistiques:")
+            for m in errors:
+                print(f"    {os.path.basename(m['scenario'])}: {m['gen_p0']} vs {m['gen_p1']} -> {m['error']}")
     
     def _generate_html_report(self, filename: str = "tournament_report.html"):
         """Génère le rapport HTML complet."""
@@ -342,7 +384,7 @@ class Tournament:
     <h1>Rapport de Tournoi</h1>
 """]
         
-        html.append(f'<p class="subtitle">Généré le {timestamp}</p>')
+        html.append(f'<p class="subtitle">Généré le {timestamp} — graine {self.seed}</p>')
         
         # Configuration
         html.append('<div class="config">')
@@ -384,12 +426,15 @@ class Tournament:
     
     def _html_global_table(self) -> str:
         """Génère le tableau de score global."""
-        stats = {g: {"w": 0, "d": 0, "l": 0, "t": 0} for g in self.general_names}
+        stats = {g: {"w": 0, "d": 0, "l": 0, "t": 0, "e": 0} for g in self.general_names}
         
         for m in self.match_history:
             p0, p1, winner = m["gen_p0"], m["gen_p1"], m["winner"]
             
             for p in [p0, p1]:
+                if m.get("error"):
+                    stats[p]["e"] += 1
+                    continue
                 stats[p]["t"] += 1
                 if winner == p:
                     stats[p]["w"] += 1
@@ -400,7 +445,7 @@ class Tournament:
         
         rows = ['<table>',
                 '<tr><th>Général</th><th>Victoires</th><th>Égalités</th>'
-                '<th>Défaites</th><th>Total</th><th>% Victoires</th></tr>']
+                '<th>Défaites</th><th>Erreurs</th><th>Total</th><th>% Victoires</th></tr>']
         
         # Trier par win rate
         sorted_gens = sorted(self.general_names, 
@@ -416,6 +461,7 @@ class Tournament:
                        f'<td class="win">{s["w"]}</td>'
                        f'<td class="draw">{s["d"]}</td>'
                        f'<td class="lose">{s["l"]}</td>'
+                       f'<td>{s["e"]}</td>'
                        f'<td>{s["t"]}</td>'
                        f'<td>{rate:.1f}%</td></tr>')
         
@@ -426,7 +472,7 @@ class Tournament:
         """Génère une matrice général vs général."""
         
         # Filtrer les matchs si nécessaire
-        matches = self.match_history
+        matches = self._played_matches()
         if scenario_filter:
             matches = [m for m in matches if m["scenario"] == scenario_filter]
         
@@ -477,7 +523,7 @@ class Tournament:
         # Calculer les stats
         stats = defaultdict(lambda: defaultdict(lambda: {"w": 0, "t": 0}))
         
-        for m in self.match_history:
+        for m in self._played_matches():
             scenario = m["scenario"]
             p0, p1, winner = m["gen_p0"], m["gen_p1"], m["winner"]
             
@@ -508,6 +554,156 @@ class Tournament:
         return "\n".join(rows)
 
 
+def load_match(scenario_path: str, p0_name: str, p1_name: str, army_file: str = None):
+    """
+    Charge un scenario de match (.scen, .bscen, ou .map + armees) sans prints.
+    
+    Returns:
+        (game_map, army1, army2). Leve ValueError si le format n'est pas supporte.
+    """
+    old_stdout = sys.stdout
+    sys.stdout = StringIO()  # Capturer les prints du loader
+    
+    try:
+        if scenario_path.endswith(('.scen', '.bscen')):
+            return load_scenario(scenario_path, p0_name, p1_name)
+        elif scenario_path.endswith('.map'):
+            game_map = load_map_from_file(scenario_path)
+            if army_file:
+                # Utiliser le fichier armee specifie
+                army1, army2 = _create_armies_from_file(game_map, p0_name, p1_name, army_file)
+            else:
+                # Armee par defaut (10 Knights)
+                army1, army2 = _create_default_armies(game_map, p0_name, p1_name)
+            return game_map, army1, army2
+        raise ValueError(f"Format de scenario non supporte: {scenario_path}")
+    finally:
+        sys.stdout = old_stdout
+
+
+def run_headless_match(scenario_path: str, p0_name: str, p1_name: str,
+                       army_file: str = None, max_turns: int = 5000,
+                       seed: int = None, record: str = None, profile: bool = False) -> dict:
+    """
+    Execute un match headless (sans vue, quiet) et retourne un resultat compact.
+
+    Utilise par le tournoi local et par les workers distribues
+    (voir scripts/distributed.py).
+
+    seed: graine de la partie (core.rng.seed_all avant le chargement, puis
+    Engine(seed=...)): meme scenario + memes generaux + meme graine => meme match.
+    record: chemin d'un replay binaire a ecrire (voir core/replay.py). Le
+    fichier est toujours ferme; si le match echoue, il s'arrete au dernier
+    tick joue et n'est pas reference dans l'historique du tournoi.
+    profile: ajoute le profil par phase du tick ("profile", TickProfiler.as_dict).
+
+    Returns:
+        {"winner": 0|1|None, "turns": int, "alive": [int, int], "seed": int|None}
+        ou {"error": str} si le scenario n'a pas pu etre joue.
+    """
+    if seed is not None:
+        seed_all(seed)
+
+    engine = None
+    try:
+        game_map, army1, army2 = load_match(scenario_path, p0_name, p1_name, army_file)
+        
+        # Executer le match (headless, rapide, quiet)
+        engine = Engine(game_map, army1, army2, seed=seed)
+        if record:
+            engine.record_replay(record)
+        if profile:
+            engine.enable_profiler()
+        engine.run_game(max_turns=max_turns, view=None, logic_speed=1, quiet=True)
+        
+        result = {
+            "winner": engine.winner,
+            "turns": engine.turn_count,
+            "alive": [sum(1 for u in army.units if u.is_alive) for army in engine.armies],
+            "seed": seed,
+        }
+        if profile:
+            result["profile"] = engine.profiler.as_dict()
+        return result
+        
+    except Exception as e:
+        return {"error": str(e)}
+    finally:
+        if engine is not None:
+            engine.stop_recording()
+
+
+def _winner_name(result: dict, p0_name: str, p1_name: str) -> str | None:
+    """Traduit un resultat compact en nom de general gagnant (None = egalite)."""
+    winner = result.get("winner")
+    if winner is None:
+        return None
+    return p0_name if winner == 0 else p1_name
+
+
+def _create_default_armies(game_map: Map, p0_name: str, p1_name: str):
+    """Cree des armees par defaut pour les fichiers .map"""
+    from core.army import Army
+    from core.unit import Knight
+    
+    gen0_cls = GENERAL_CLASS_MAP[p0_name]
+    gen1_cls = GENERAL_CLASS_MAP[p1_name]
+    
+    # Positions proches du centre pour garantir un combat rapide
+    w, h = game_map.width, game_map.height
+    cx, cy = w // 2, h // 2
+    
+    units0 = []
+    units1 = []
+    
+    # 10 Knights par camp, positionnes proches l'un de l'autre
+    for i in range(10):
+        # Armee 0: a gauche du centre
+        units0.append(Knight(i, 0, (cx - 8 + (i % 5), cy - 2 + (i // 5))))
+        # Armee 1: a droite du centre
+        units1.append(Knight(10000 + i, 1, (cx + 4 + (i % 5), cy - 2 + (i // 5))))
+    
+    army0 = Army(0, units0, gen0_cls(0))
+    army1 = Army(1, units1, gen1_cls(1))
+    
+    return army0, army1
+
+def _create_armies_from_file(game_map: Map, p0_name: str, p1_name: str, army_file: str):
+    """Cree des armees a partir d'un fichier armee specifie"""
+    from core.army import Army
+    from utils.loaders import load_army_from_file
+    
+    gen0_cls = GENERAL_CLASS_MAP[p0_name]
+    gen1_cls = GENERAL_CLASS_MAP[p1_name]
+    
+    # Charger la configuration d'armee depuis le fichier
+    # On utilise le meme fichier pour les deux armees mais avec des generaux differents
+    base_army = load_army_from_file(army_file, 0, p0_name)
+    
+    # Positions proches du centre
+    w, h = game_map.width, game_map.height
+    cx, cy = w // 2, h // 2
+    
+    units0 = []
+    units1 = []
+    
+    # Recree les unites avec des positions centrees
+    unit_types = [type(u) for u in base_army.units]
+    n_units = len(unit_types)
+    
+    for i, unit_cls in enumerate(unit_types):
+        # Armee 0: a gauche du centre
+        row, col = i // 5, i % 5
+        units0.append(unit_cls(i, 0, (cx - 8 + col, cy - 2 + row)))
+        # Armee 1: a droite du centre
+        units1.append(unit_cls(10000 + i, 1, (cx + 4 + col, cy - 2 + row)))
+    
+    army0 = Army(0, units0, gen0_cls(0))
+    army1 = Army(1, units1, gen1_cls(1))
+    
+    return army0, army1
+
+
 # Point d'entrée pour tests directs
 if __name__ == "__main__":
     # Test rapide
@@ -0,0 +1,91 @@
+# scripts/verify_digest.py
+"""
+Verification qu'une variante du moteur (chemin optimise de mouvement,
+collisions, IA...) ne change pas l'issue des batailles.
+
+Deux configurations sont construites a partir du meme scenario, des memes
+generaux et de la meme graine, puis avancees en lockstep. Leurs digests
+d'etat (core/digest.py) sont compares tous les K ticks: le premier tick
+divergent est rapporte. Un flux de reference peut aussi etre sauvegarde
+(--save) puis compare plus tard (--against), par exemple en CI.
+"""
+import sys
+import os
+import importlib
+from typing import Optional
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from core.digest import DigestRecorder, first_divergence
+from core.rng import seed_all
+from scripts.tournament import load_match
+
+DEFAULT_ENGINE = "engine:Engine"
+LOGIC_DT = 1 / 60.0
+
+
+def resolve_engine_class(spec: str) -> type:
+    """'module:Classe' -> classe de moteur (ex: 'engine:Engine')."""
+    module_name, _, class_name = spec.partition(":")
+    if not class_name:
+        raise ValueError(f"Format attendu 'module:Classe', recu '{spec}'")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def build_engine(engine_spec: str, scenario_path: str, p0_name: str, p1_name: str,
+                 seed: int, every: int, army_file: str = None):
+    """Charge le scenario avec la graine donnee et active le flux de digests."""
+    seed_all(seed)
+    game_map, army1, army2 = load_match(scenario_path, p0_name, p1_name, army_file)
+    engine = resolve_engine_class(engine_spec)(game_map, army1, army2, seed=seed)
+    engine.enable_digest(every)
+    return engine
+
+
+def run_digest(engine_spec: str, scenario_path: str, p0_name: str, p1_name: str,
+               seed: int = 0, every: int = 10, max_turns: int = 2000,
+               army_file: str = None) -> DigestRecorder:
+    """Joue une bataille headless et retourne son flux de digests."""
+    engine = build_engine(engine_spec, scenario_path, p0_name, p1_name, seed, every, army_file)
+    while engine.turn_count < max_turns and engine.step(LOGIC_DT):
+        pass
+    return engine.digest
+
+
+def verify_digest(scenario_path: str, p0_name: str, p1_name: str,
+                  engine_a: str = DEFAULT_ENGINE, engine_b: str = DEFAULT_ENGINE,
+                  seed: int = 0, every: int = 10, max_turns: int = 2000,
+                  army_file: str = None) -> dict:
+    """
+    Avance les deux configurations en lockstep et s'arrete au premier
+    echantillon divergent.
+
+    Returns:
+        {"diverged_at": tick|None, "ticks": int, "samples": int,
+         "digests": (DigestRecorder A, DigestRecorder B)}
+    """
+    # Les deux moteurs sont construits l'un apres l'autre avec la meme graine
+    # (seed_all dans build_engine): etats initiaux et generaux identiques.
+    a = build_engine(engine_a, scenario_path, p0_name, p1_name, seed, every, army_file)
+    b = build_engine(engine_b, scenario_path, p0_name, p1_name, seed, every, army_file)
+
+    diverged_at: Optional[int] = first_divergence(a.digest, b.digest)
+    while diverged_at is None and a.turn_count < max_turns:
+        running_a = a.step(LOGIC_DT)
+        running_b = b.step(LOGIC_DT)
+        if running_a != running_b:
+            # Une configuration a fini la partie, pas l'autre
+            diverged_at = min(a.turn_count, b.turn_count)
+            break
+        if not running_a:
+            break
+        # Les echantillons precedents sont egaux: seul le dernier est compare
+        if a.turn_count % every == 0 and a.digest.digests[-1] != b.digest.digests[-1]:
+            diverged_at = a.turn_count
+
+    return {
+        "diverged_at": diverged_at,
+        "ticks": a.turn_count,
+        "samples": len(a.digest),
+        "digests": (a.digest, b.digest),
+    }
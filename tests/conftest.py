@@ -0,0 +1,61 @@
+# tests/conftest.py
+"""
+Fixtures communes: petites batailles headless seedees.
+
+Aucune dependance optionnelle (pygame, numpy): les tests tournent avec la
+seule bibliotheque standard et pytest.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from core.army import Army
+from core.map import Map
+from core.rng import seed_all
+from core.definitions import GENERAL_CLASS_MAP, UNIT_CLASS_MAP
+from engine import Engine
+
+LOGIC_DT = 1 / 60.0
+SEED = 7
+# Colonnes par armee, de l'avant vers l'arriere: les arbaletriers sont a
+# portee des le premier tick, la melee s'engage en quelques dizaines de ticks.
+FORMATION = ("Knight", "Pikeman", "Crossbowman")
+ROWS = 5
+
+
+def build_battle(p0="MajorDAFT", p1="ColonelKAISER", seed: int = SEED,
+                 engine_class: type = Engine) -> Engine:
+    """
+    Deux blocs de 15 unites face a face sur une carte 24x24. p0/p1: nom de
+    general (GENERAL_CLASS_MAP) ou instance deja construite.
+    """
+    seed_all(seed)
+    armies = []
+    unit_id = 0
+    for army_id, (front, general) in enumerate(((10, p0), (12, p1))):
+        if isinstance(general, str):
+            general = GENERAL_CLASS_MAP[general](army_id)
+        direction = -1 if army_id == 0 else 1
+        units = []
+        for depth, name in enumerate(FORMATION):
+            for row in range(ROWS):
+                pos = (float(front + direction * depth), 8.0 + 1.5 * row)
+                units.append(UNIT_CLASS_MAP[name](unit_id=unit_id, army_id=army_id, pos=pos))
+                unit_id += 1
+        armies.append(Army(army_id, units, general))
+    return engine_class(Map(24, 24), armies[0], armies[1], seed=seed)
+
+
+def advance(engine: Engine, ticks: int) -> None:
+    """Joue jusqu'a `ticks` ticks logiques (moins si la partie se termine)."""
+    for _ in range(ticks):
+        if not engine.step(LOGIC_DT):
+            break
+
+
+@pytest.fixture
+def battle() -> Engine:
+    return build_battle()
@@ -0,0 +1,26 @@
+# tests/test_bench.py
+from benchmarks.suite import save_baseline, load_results, compare
+
+
+def _results(date, **cases):
+    return {"meta": {"date": date}, "cases": cases}
+
+
+def test_save_baseline_merges_the_replayed_cases(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    save_baseline(_results("d1", a={"ticks_per_sec": 10.0}, b={"ticks_per_sec": 20.0}), path)
+    save_baseline(_results("d2", b={"ticks_per_sec": 25.0}), path)
+
+    baseline = load_results(path)
+    assert baseline["meta"] == {"date": "d2"}
+    assert baseline["cases"] == {"a": {"ticks_per_sec": 10.0}, "b": {"ticks_per_sec": 25.0}}
+
+
+def test_compare_flags_regressions_against_the_baseline(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    save_baseline(_results("d1", a={"ticks_per_sec": 10.0, "peak_rss_mb": 50.0}), path)
+    current = _results("d2", a={"ticks_per_sec": 8.0, "peak_rss_mb": 52.0})
+
+    rows = {row["metric"]: row for row in compare(current, load_results(path), threshold=0.10)}
+    assert rows["ticks_per_sec"]["regression"]
+    assert not rows["peak_rss_mb"]["regression"]
@@ -0,0 +1,76 @@
+# tests/test_carlo.py
+from conftest import build_battle, LOGIC_DT, SEED
+from ai.generals import MarshalCARLO, MajorDAFT
+from core.army import Army
+from core.definitions import UNIT_CLASS_MAP
+from core.digest import state_digest
+from core.map import Map
+from engine import Engine
+
+TICKS = 40
+
+
+def _play(engine, ticks=TICKS):
+    digests = []
+    for _ in range(ticks):
+        if not engine.step(LOGIC_DT):
+            break
+        digests.append(state_digest(engine))
+    return digests
+
+
+def test_default_budget_is_reproducible():
+    # Nombre de simulations fixe par defaut: meme graine => meme partie
+    first = _play(build_battle(MarshalCARLO(0), "ColonelKAISER"))
+    second = _play(build_battle(MarshalCARLO(0), "ColonelKAISER"))
+    assert first == second
+
+
+def test_search_runs_and_leaves_the_engine_untouched():
+    carlo = MarshalCARLO(0, max_rollouts=8)
+    engine = build_battle(carlo, "ColonelKAISER")
+    digest = engine.enable_digest(every=1)
+    listeners = list(engine.listeners)
+    generals = [army.general for army in engine.armies]
+    engine.enable_parallel_decisions("thread")
+    decider = engine.decider
+    try:
+        assert engine.step(LOGIC_DT)
+        assert engine.decider is decider
+    finally:
+        engine.stop_parallel_decisions()
+
+    assert sum(n for n, _ in carlo.plan_stats.values()) == 8
+    assert carlo.plan in MarshalCARLO.PLANS
+    assert engine.listeners == listeners
+    assert [army.general for army in engine.armies] == generals
+    # Les ticks simules n'ont pas ete echantillonnes
+    assert list(digest.ticks) == [0, 1]
+    assert engine.turn_count == 1
+
+
+def _skirmish():
+    """Deux arbaletriers ecartes (hors du rayon de regroupement), a portee d'un chevalier a 1 HP."""
+    carlo = MarshalCARLO(0)
+    crossbow = UNIT_CLASS_MAP["Crossbowman"]
+    knight = UNIT_CLASS_MAP["Knight"]
+    archers = [crossbow(unit_id=0, army_id=0, pos=(11.0, 7.5)),
+               crossbow(unit_id=1, army_id=0, pos=(11.0, 16.5))]
+    weak = knight(unit_id=2, army_id=1, pos=(13.0, 12.0))
+    weak.current_hp = 1
+    healthy = knight(unit_id=3, army_id=1, pos=(22.0, 12.0))
+    engine = Engine(Map(24, 24), Army(0, archers, carlo), Army(1, [weak, healthy], MajorDAFT(1)), seed=SEED)
+    return engine, carlo
+
+
+def test_rollout_kills_are_scored():
+    engine, carlo = _skirmish()
+    token = engine.snapshot()
+    # "engage": les arbaletriers tirent et tuent le chevalier affaibli
+    engaged = carlo._rollout(engine, "engage", None)
+    assert 2 not in engine.units_by_id  # Retire du moteur pendant la simulation
+    engine.restore(token)
+    # "regroup": trop eloignes du centre, ils marchent sans tirer
+    regrouped = carlo._rollout(engine, "regroup", None)
+    assert 2 in engine.units_by_id
+    assert engaged > regrouped
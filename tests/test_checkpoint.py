@@ -0,0 +1,127 @@
+# tests/test_checkpoint.py
+import os
+import pickle
+import collections
+
+import pytest
+
+from rl_modules import checkpoint
+from rl_modules.checkpoint import (write_npy, read_npy, save_checkpoint, load_checkpoint,
+                                   latest_checkpoint, load_legacy_q_table, MANIFEST)
+
+Q_TABLES = {
+    "team1": {(0, 1, 2): [0.5, -1.25, 2.0], (3, -4, 5): [0.0, 1e-9, 3.5]},
+    "team2": {(7, 8, 9): [1.0, 2.0, 3.0]},
+}
+
+
+def test_npy_round_trip(tmp_path):
+    path = str(tmp_path / "a.npy")
+    write_npy(path, "<f8", (2, 3), [0.5, -1.0, 2.0, 3.0, 4.5, 1e300])
+    assert read_npy(path) == ((2, 3), [0.5, -1.0, 2.0, 3.0, 4.5, 1e300])
+
+    write_npy(path, "<i8", (1, 2), [-(1 << 63), (1 << 63) - 1])
+    assert read_npy(path) == ((1, 2), [-(1 << 63), (1 << 63) - 1])
+
+
+def test_npy_header_is_aligned(tmp_path):
+    # NPY v1.0: magic, version 1.0, en-tete termine par '\n' et aligne sur 64 octets
+    path = str(tmp_path / "a.npy")
+    write_npy(path, "<i8", (4, 3), list(range(12)))
+    with open(path, "rb") as f:
+        raw = f.read()
+    assert raw[:8] == b"\x93NUMPY\x01\x00"
+    header_len = int.from_bytes(raw[8:10], "little")
+    assert (10 + header_len) % 64 == 0
+    assert raw[10 + header_len - 1:10 + header_len] == b"\n"
+    assert len(raw) == 10 + header_len + 12 * 8
+
+
+def test_npy_rejects_other_files(tmp_path):
+    path = tmp_path / "a.npy"
+    path.write_bytes(b"not a numpy file")
+    with pytest.raises(ValueError):
+        read_npy(str(path))
+
+
+def test_checkpoint_round_trip(tmp_path):
+    directory = save_checkpoint(str(tmp_path / "ep_10"), Q_TABLES, {"episode": 10, "epsilon": 0.25})
+    q_tables, manifest = load_checkpoint(directory)
+    assert q_tables == Q_TABLES
+    assert manifest["episode"] == 10
+    assert manifest["epsilon"] == 0.25
+    assert sorted(os.listdir(tmp_path)) == ["ep_10"]
+
+
+def test_overwrite_replaces_previous_checkpoint(tmp_path):
+    directory = str(tmp_path / "final")
+    save_checkpoint(directory, Q_TABLES, {"episode": 1})
+    save_checkpoint(directory, {"team1": {}}, {"episode": 2})
+    q_tables, manifest = load_checkpoint(directory)
+    assert q_tables == {"team1": {}}
+    assert manifest["episode"] == 2
+    assert sorted(os.listdir(tmp_path)) == ["final"]
+
+
+def test_latest_checkpoint(tmp_path):
+    assert latest_checkpoint(str(tmp_path / "missing")) is None
+    for episode in (5, 20, 10):
+        save_checkpoint(str(tmp_path / f"ep_{episode}"), Q_TABLES, {"episode": episode})
+    os.makedirs(tmp_path / "ep_99.tmp")  # Ecriture abandonnee: ignoree
+    assert latest_checkpoint(str(tmp_path)) == str(tmp_path / "ep_20")
+
+
+def test_interrupted_swap_keeps_previous_checkpoint(tmp_path, monkeypatch):
+    directory = str(tmp_path / "ep_1")
+    save_checkpoint(directory, Q_TABLES, {"episode": 1})
+
+    # Arret entre les deux renommages: seule la copie .old reste
+    replace = os.replace
+
+    def interrupted(src, dst):
+        if dst == directory:
+            raise KeyboardInterrupt
+        replace(src, dst)
+
+    monkeypatch.setattr(checkpoint.os, "replace", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        save_checkpoint(directory, {"team1": {}}, {"episode": 2})
+    monkeypatch.undo()
+
+    assert not os.path.exists(os.path.join(directory, MANIFEST))
+    assert latest_checkpoint(str(tmp_path)) == directory
+    q_tables, manifest = load_checkpoint(directory)
+    assert (q_tables, manifest["episode"]) == (Q_TABLES, 1)
+
+    # L'ecriture suivante remet tout en ordre
+    save_checkpoint(directory, {"team1": {}}, {"episode": 3})
+    assert load_checkpoint(directory)[1]["episode"] == 3
+    assert sorted(os.listdir(tmp_path)) == ["ep_1"]
+
+
+def test_failed_swap_restores_previous_checkpoint(tmp_path, monkeypatch):
+    directory = str(tmp_path / "ep_1")
+    save_checkpoint(directory, Q_TABLES, {"episode": 1})
+    replace = os.replace
+
+    def failing(src, dst):
+        if dst == directory and src.endswith(".tmp"):
+            raise OSError("disque plein")
+        replace(src, dst)
+
+    monkeypatch.setattr(checkpoint.os, "replace", failing)
+    with pytest.raises(OSError):
+        save_checkpoint(directory, {"team1": {}}, {"episode": 2})
+    monkeypatch.undo()
+    assert load_checkpoint(directory)[1]["episode"] == 1
+
+
+def test_legacy_pickle_accepts_plain_data_only(tmp_path):
+    plain = tmp_path / "plain.pkl"
+    plain.write_bytes(pickle.dumps({(1, 2, 3): [0.0, 1.0, 2.0]}))
+    assert load_legacy_q_table(str(plain)) == {(1, 2, 3): [0.0, 1.0, 2.0]}
+
+    hostile = tmp_path / "hostile.pkl"
+    hostile.write_bytes(pickle.dumps(collections.OrderedDict()))
+    with pytest.raises(pickle.UnpicklingError):
+        load_legacy_q_table(str(hostile))
@@ -0,0 +1,121 @@
+# tests/test_commander.py
+from conftest import LOGIC_DT
+from core.rng import seed_all
+from rl_modules.commander import RLCommander, ArmyTotals
+from rl_modules.vec_env import make_battle
+
+
+def _rescan(engine):
+    """Totaux recalcules par un parcours complet des unites vivantes."""
+    totals = {}
+    for army in engine.armies:
+        living = [u for u in army.units if u.is_alive]
+        totals[army.army_id] = (sum(u.current_hp for u in living),
+                                sum(u.current_hp * ArmyTotals.weight(u) for u in living),
+                                sum(1 for u in living if ArmyTotals.weight(u) == 50),
+                                sum(1 for u in living if ArmyTotals.weight(u) == 10))
+    return totals
+
+
+def _incremental(totals, army_id):
+    return (totals.hp[army_id], totals.weighted_hp[army_id],
+            totals.castles[army_id], totals.houses[army_id])
+
+
+def test_army_totals_match_a_full_rescan_after_a_battle():
+    seed_all(3)
+    commanders = (RLCommander(0, "team1", learning=False), RLCommander(1, "team2", learning=False))
+    engine = make_battle(commanders[0], commanders[1], map_size=40, units_per_team=12)
+    totals = commanders[0].totals
+    assert totals is not None and totals in engine.listeners
+    assert {army_id: _incremental(totals, army_id) for army_id in totals.hp} == _rescan(engine)
+
+    start = _rescan(engine)
+    while engine.turn_count < 1500 and engine.step(LOGIC_DT):
+        pass
+    rescan = _rescan(engine)
+    # La bataille a bien coute des PV aux deux camps
+    assert all(rescan[army_id][0] < start[army_id][0] for army_id in start)
+    for commander in commanders:
+        assert {army_id: _incremental(commander.totals, army_id) for army_id in rescan} == rescan
+
+
+def test_state_key_and_score_agree_with_the_unit_scan():
+    seed_all(4)
+    commanders = (RLCommander(0, "team1", learning=False), RLCommander(1, "team2", learning=False))
+    engine = make_battle(commanders[0], commanders[1], map_size=40, units_per_team=12)
+    for _ in range(400):
+        if not engine.step(LOGIC_DT):
+            break
+
+    living = [[u for u in army.units if u.is_alive] for army in engine.armies]
+    for i, commander in enumerate(commanders):
+        mine, enemy = living[i], living[1 - i]
+        incremental = (commander._get_state_key([], []), commander.calculate_weighted_score([], []))
+        commander.totals = None
+        assert (commander._get_state_key(mine, enemy), commander.calculate_weighted_score(mine, enemy)) == incremental
+
+
+def test_should_decide_every_interval():
+    commander = RLCommander(0, learning=False, decision_interval=5)
+    assert [turn for turn in range(16) if commander.should_decide(turn)] == [0, 5, 10, 15]
+    assert commander.ticks_since_decision == 5
+
+
+def test_forced_strategy_change_decides_early():
+    commander = RLCommander(0, learning=False, decision_interval=10)
+    commander.forced_strategy = commander.issued_strategy = 1
+    assert commander.should_decide(0)
+    assert not commander.should_decide(3)
+    commander.forced_strategy = 2
+    assert commander.should_decide(4)
+    assert commander.ticks_since_decision == 4
+
+
+def _counting(commander):
+    calls = []
+    decide = commander.decide_actions
+
+    def counted(*args):
+        calls.append(args)
+        return decide(*args)
+    commander.decide_actions = counted
+    return calls
+
+
+def test_engine_reuses_the_last_actions_between_decisions():
+    seed_all(5)
+    commanders = (RLCommander(0, "team1", learning=False, decision_interval=4),
+                  RLCommander(1, "team2", learning=False))
+    engine = make_battle(commanders[0], commanders[1], map_size=40, units_per_team=12)
+    calls = [_counting(commander) for commander in commanders]
+
+    issued = []
+    for _ in range(12):
+        assert engine.step(LOGIC_DT)
+        issued.append(engine._last_actions[0])
+    assert (len(calls[0]), len(calls[1])) == (3, 12)
+    # Entre deux decisions, le moteur rejoue la meme liste d'ordres (pas de nouvel appel)
+    for start in (0, 4, 8):
+        assert all(actions is issued[start] for actions in issued[start:start + 4])
+    assert issued[0] is not issued[4]
+
+
+def test_q_update_uses_the_reward_accumulated_over_the_interval():
+    seed_all(6)
+    commander = RLCommander(0, "team1", learning=True, decision_interval=6)
+    engine = make_battle(commander, RLCommander(1, "team2", learning=False), map_size=40, units_per_team=12)
+    commander.transitions = []
+    scores = []
+    decide = commander.decide_actions
+
+    def scored(current_map, my_units, enemy_units):
+        scores.append(commander.calculate_weighted_score(my_units, enemy_units))
+        return decide(current_map, my_units, enemy_units)
+    commander.decide_actions = scored
+
+    for _ in range(13):
+        engine.step(LOGIC_DT)
+    assert len(scores) == 3
+    rewards = [reward for _, _, reward, _ in commander.transitions]
+    assert rewards == [scores[1] - scores[0] - 6, scores[2] - scores[1] - 6]
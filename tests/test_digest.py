@@ -0,0 +1,58 @@
+# tests/test_digest.py
+import os
+
+from conftest import build_battle, advance
+from core.digest import DigestRecorder, first_divergence, state_digest
+from scripts.verify_digest import verify_digest
+
+SCENARIO = os.path.join(os.path.dirname(__file__), "..", "scenarios", "tourney_battle.scen")
+
+
+def test_digest_sees_any_state_change(battle):
+    before = state_digest(battle)
+    unit = battle.armies[0].units[0]
+    unit.current_hp -= 1
+    assert state_digest(battle) != before
+    unit.current_hp += 1
+    assert state_digest(battle) == before
+    x, y = unit.pos
+    unit.pos = (x + 0.01, y)
+    assert state_digest(battle) != before
+
+
+def test_recorder_samples_every_k_ticks(battle):
+    recorder = battle.enable_digest(every=10)
+    advance(battle, 55)
+    assert list(recorder.ticks) == [0, 10, 20, 30, 40, 50]
+
+
+def test_recorder_save_load(battle, tmp_path):
+    recorder = battle.enable_digest(every=5)
+    advance(battle, 30)
+    path = str(tmp_path / "digests.txt")
+    recorder.save(path)
+    loaded = DigestRecorder.load(path)
+    assert loaded.every == 5
+    assert loaded.items() == recorder.items()
+    assert first_divergence(loaded, recorder) is None
+
+
+def test_first_divergence():
+    engine_a, engine_b = build_battle(), build_battle()
+    a, b = engine_a.enable_digest(every=10), engine_b.enable_digest(every=10)
+    advance(engine_a, 40)
+    advance(engine_b, 20)
+    # b s'arrete apres l'echantillon du tick 20: divergence au tick suivant
+    assert first_divergence(a, b) == 21
+
+    advance(engine_b, 10)
+    engine_b.armies[1].units[0].current_hp -= 1
+    advance(engine_b, 10)
+    assert first_divergence(a, b) == 40
+
+
+def test_verify_digest_same_engine():
+    result = verify_digest(SCENARIO, "MajorDAFT", "ColonelKAISER", seed=3, every=10, max_turns=100)
+    assert result["diverged_at"] is None
+    assert result["ticks"] == 100
+    assert result["samples"] == 11
@@ -0,0 +1,103 @@
+# tests/test_distributed.py
+import sys
+import socket
+import threading
+import subprocess
+
+import pytest
+
+from scripts import distributed
+from scripts.distributed import (Coordinator, Worker, MAX_JOB_ATTEMPTS, send_message, read_message,
+                                 file_blob)
+
+
+@pytest.fixture
+def coordinator():
+    with Coordinator("127.0.0.1", 0) as coordinator:
+        yield coordinator
+
+
+@pytest.fixture
+def echo_handler(monkeypatch):
+    handlers = dict(distributed.JOB_HANDLERS, echo=lambda spec, blobs: {"value": spec["value"]})
+    monkeypatch.setattr(distributed, "JOB_HANDLERS", handlers)
+
+
+def _start_worker(coordinator, name):
+    host, port = coordinator.address
+    threading.Thread(target=Worker(host, port, name=name, reconnect_delay=0.05).run, daemon=True).start()
+
+
+def _crashing_worker(coordinator, jobs_seen: list):
+    """Faux worker qui se deconnecte a chaque job recu (comme un worker qui plante)."""
+    while not coordinator._closed:
+        try:
+            with socket.create_connection(coordinator.address) as sock:
+                reader = sock.makefile("r", encoding="utf-8")
+                send_message(sock, {"type": "hello", "worker": f"crash-{len(jobs_seen)}"})
+                message = read_message(reader)
+                if message is None or message["type"] == "shutdown":
+                    return
+                jobs_seen.append(message["job_id"])
+        except OSError:
+            return
+
+
+def test_results_come_back_in_order(coordinator, echo_handler):
+    for i in range(2):
+        _start_worker(coordinator, f"w{i}")
+    assert coordinator.wait_for_workers(2, timeout=5)
+    jobs = [("echo", {"value": i}) for i in range(10)]
+    assert coordinator.run_jobs(jobs) == [{"value": i} for i in range(10)]
+    # Un second lot reutilise les memes workers
+    assert coordinator.run_jobs(jobs[:3]) == [{"value": i} for i in range(3)]
+
+
+def test_handler_errors_are_results(coordinator, echo_handler):
+    _start_worker(coordinator, "w")
+    results = coordinator.run_jobs([("echo", {}), ("unknown", {})], worker_timeout=5)
+    assert set(results[0]) == {"error"} and set(results[1]) == {"error"}
+
+
+def test_no_worker_gives_errors(coordinator):
+    results = coordinator.run_jobs([("echo", {"value": 1})] * 2, worker_timeout=0.2)
+    assert [set(r) for r in results] == [{"error"}, {"error"}]
+    assert "aucun worker" in results[0]["error"]
+
+
+def test_dead_local_workers_give_errors(coordinator):
+    # Worker local arrete avant de s'etre connecte: pas d'attente de worker_timeout
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    coordinator.local_processes = [process]
+    results = coordinator.run_jobs([("echo", {"value": 1})])
+    assert "workers locaux" in results[0]["error"]
+
+
+def test_batch_timeout(coordinator):
+    host, port = coordinator.address
+    # Worker connecte mais muet: seul le delai global termine le lot
+    with socket.create_connection((host, port)) as sock:
+        send_message(sock, {"type": "hello", "worker": "mute"})
+        assert coordinator.wait_for_workers(1, timeout=5)
+        results = coordinator.run_jobs([("echo", {"value": 1})], timeout=0.5)
+    assert "delai" in results[0]["error"]
+
+
+def test_job_crashing_its_worker_is_abandoned(coordinator):
+    jobs_seen = []
+    threading.Thread(target=_crashing_worker, args=(coordinator, jobs_seen), daemon=True).start()
+    results = coordinator.run_jobs([("echo", {"value": 1})], worker_timeout=5)
+    assert "error" in results[0]
+    assert len(jobs_seen) == MAX_JOB_ATTEMPTS
+
+
+def test_file_blob_is_binary_safe(tmp_path, monkeypatch):
+    monkeypatch.setattr(distributed, "CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "scenario.bscen"
+    path.write_bytes(bytes(range(256)))
+    blob_hash, blob = file_blob(str(path))
+    worker = Worker("127.0.0.1", 0)
+    worker._store_blob({"type": "blob", "hash": blob_hash, **blob})
+    with open(worker.blob_paths[blob_hash], "rb") as f:
+        assert f.read() == bytes(range(256))
@@ -0,0 +1,72 @@
+# tests/test_engine.py
+from conftest import build_battle, advance, LOGIC_DT
+from core.digest import state_digest
+
+
+class CountingListener:
+    """Listener qui compte les evenements recus du moteur."""
+
+    def __init__(self):
+        self.ticks = []
+        self.damage = 0
+        self.deaths = 0
+
+    def on_damage(self, attacker, target, amount):
+        self.damage += amount
+
+    def on_death(self, attacker, target):
+        self.deaths += 1
+
+    def on_heal(self, healer, target, amount):
+        self.damage -= amount
+
+    def on_convert(self, unit, old_army_id, new_army_id):
+        pass
+
+    def on_tick(self, engine):
+        self.ticks.append(engine.turn_count)
+
+
+def _army_hp(engine):
+    return sum(u.current_hp for army in engine.armies for u in army.units if u.is_alive)
+
+
+def test_step_advances_one_tick(battle):
+    assert battle.step(LOGIC_DT)
+    assert battle.turn_count == 1
+    assert abs(battle.time_elapsed - LOGIC_DT) < 1e-12
+
+
+def test_listeners_receive_every_tick_and_event(battle):
+    listener = CountingListener()
+    battle.add_listener(listener)
+    hp_before = _army_hp(battle)
+    alive_before = sum(1 for army in battle.armies for u in army.units if u.is_alive)
+
+    advance(battle, 300)
+
+    assert listener.ticks == list(range(1, battle.turn_count + 1))
+    assert listener.damage > 0
+    alive_after = sum(1 for army in battle.armies for u in army.units if u.is_alive)
+    assert listener.deaths == alive_before - alive_after
+    # Les degats notifies sont les degats reels (plafonnes aux HP restants)
+    assert listener.damage == hp_before - _army_hp(battle)
+
+
+def test_metrics_follow_the_engine(battle):
+    metrics = battle.enable_metrics()
+    advance(battle, 200)
+    history = metrics.history()
+    assert history["tick"][-1] == battle.turn_count
+    for i, army in enumerate(battle.armies):
+        assert history["alive"][i][-1] == sum(1 for u in army.units if u.is_alive)
+
+
+def test_seeded_battles_are_identical():
+    a, b = build_battle(), build_battle()
+    for _ in range(200):
+        running = a.step(LOGIC_DT)
+        assert running == b.step(LOGIC_DT)
+        assert state_digest(a) == state_digest(b)
+        if not running:
+            break
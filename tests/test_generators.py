@@ -0,0 +1,86 @@
+# tests/test_generators.py
+import struct
+
+import pytest
+
+from core.rng import seed_all
+from utils.generators import generate_stress_scenario, open_scenario_writer
+from utils.unified_loader import (load_scenario, read_binary_scenario, BINARY_HEADER,
+                                  BINARY_RECORD, BINARY_SCENARIO_MAGIC)
+
+MIX = {"Knight": 0.5, "Pikeman": 0.3, "Crossbowman": 0.2}
+
+
+def _units(army):
+    return [(type(unit).__name__, unit.army_id, unit.pos) for unit in army.units]
+
+
+def _generate(path, units_per_army, **kwargs):
+    seed_all(5)
+    return generate_stress_scenario(str(path), units_per_army, MIX, **kwargs)
+
+
+def test_scen_and_bscen_give_the_same_units(tmp_path):
+    text, binary = tmp_path / "stress.scen", tmp_path / "stress.bscen"
+    assert _generate(text, 200, formation="scatter", obstacle_density=0.05) == \
+        _generate(binary, 200, formation="scatter", obstacle_density=0.05)
+
+    text_map, *text_armies = load_scenario(str(text))
+    binary_map, *binary_armies = load_scenario(str(binary))
+    for text_army, binary_army in zip(text_armies, binary_armies):
+        assert [unit.unit_id for unit in text_army.units] == [unit.unit_id for unit in binary_army.units]
+        for (t_type, t_army, t_pos), (b_type, b_army, b_pos) in zip(_units(text_army), _units(binary_army)):
+            assert (t_type, t_army) == (b_type, b_army)
+            # .scen: 2 decimales, .bscen: float32
+            assert t_pos == pytest.approx(b_pos, abs=0.006)
+    assert text_map.obstacles == binary_map.obstacles
+    assert len(text_map.obstacles) > 0
+
+
+def test_bscen_type_table_and_header(tmp_path):
+    path = tmp_path / "mixed.bscen"
+    writer = open_scenario_writer(str(path), 30, 20)
+    writer.unit("Pikeman", 1.5, 2.5, 0)
+    writer.unit("Knight", 3.0, 4.0, 1)
+    writer.unit("Pikeman", 5.0, 6.0, 1)
+    writer.resource("Rock", 10, 11)
+    writer.close()
+
+    raw = path.read_bytes()
+    assert raw.startswith(BINARY_SCENARIO_MAGIC)
+    _, width, height, count, table_offset = BINARY_HEADER.unpack_from(raw, len(BINARY_SCENARIO_MAGIC))
+    # Nombre d'entites et offset de la table ecrits a la fermeture
+    assert (width, height, count) == (30, 20, 4)
+    assert table_offset == len(BINARY_SCENARIO_MAGIC) + BINARY_HEADER.size + 4 * BINARY_RECORD.size
+    # Table des types dans l'ordre de premiere apparition
+    assert struct.unpack_from("<H", raw, table_offset) == (3,)
+    assert raw[table_offset + 2:] == b"\x07Pikeman\x06Knight\x04Rock"
+
+    assert read_binary_scenario(str(path)) == (
+        30, 20,
+        [("Pikeman", 1.5, 2.5, 0), ("Knight", 3.0, 4.0, 1), ("Pikeman", 5.0, 6.0, 1)],
+        [],
+        [("Rock", 10.0, 11.0)],
+    )
+
+
+def test_unclosed_bscen_has_no_entities(tmp_path):
+    path = tmp_path / "partial.bscen"
+    writer = open_scenario_writer(str(path), 10, 10)
+    writer.unit("Knight", 1.0, 1.0, 0)
+    writer._file.flush()
+    _, _, _, count, table_offset = BINARY_HEADER.unpack_from(path.read_bytes(), len(BINARY_SCENARIO_MAGIC))
+    assert (count, table_offset) == (0, 0)
+    writer.close()
+    assert len(read_binary_scenario(str(path))[2]) == 1
+
+
+def test_side_one_ids_follow_a_large_side_zero(tmp_path):
+    path = tmp_path / "big.bscen"
+    _generate(path, 10050, map_size=(400, 400))
+    _, army1, army2 = load_scenario(str(path))
+
+    ids_0 = [unit.unit_id for unit in army1.units]
+    ids_1 = [unit.unit_id for unit in army2.units]
+    assert ids_0 == list(range(10050))
+    assert ids_1 == list(range(10050, 20100))
@@ -0,0 +1,75 @@
+# tests/test_lanchester.py
+import math
+
+import pytest
+
+from conftest import build_battle
+from core import lanchester
+from core.rng import seed_all, get_rng
+from core.lanchester import (predict_battle, predict_lanchester, approach_time, effective_dps,
+                             evaluate_engagement, unit_stats)
+
+
+@pytest.mark.parametrize("unit_type", ["Knight", "Pikeman", "Crossbowman"])
+def test_square_law_survivors(unit_type):
+    # Loi carree, memes unites: N_B^2 - N_A^2 constant => sqrt(3) N survivants
+    n = 10
+    result = predict_lanchester(unit_type, n)
+    assert result["winner"] == 1
+    assert result["remaining"][0] == 0.0
+    assert result["remaining"][1] == pytest.approx(math.sqrt(3) * n, rel=0.01)
+
+
+def test_linear_law_survivors():
+    # Loi lineaire, memes unites: N_B - N_A constant => N survivants
+    result = predict_lanchester("Knight", 10, law="linear")
+    assert result["winner"] == 1
+    assert result["remaining"][1] == pytest.approx(10, rel=0.1)
+
+
+def test_symmetric_battle_is_a_draw():
+    result = predict_battle({"Knight": 10}, {"Knight": 10})
+    assert result["winner"] is None
+    assert result["remaining"][0] == pytest.approx(result["remaining"][1])
+
+
+def test_empty_side_loses_at_once():
+    result = predict_battle({"Knight": 5}, {})
+    assert result == {"winner": 0, "time": 0.0, "remaining": [5.0, 0.0],
+                      "casualties": [0.0, 0.0], "laws": ["square", "square"]}
+
+
+def test_unit_names_and_classes_are_equivalent():
+    knight = type(unit_stats("Knight")["unit"])
+    assert effective_dps("Knight", "Pikeman") == effective_dps(knight, "Pikeman")
+    assert predict_lanchester(knight, 5) == predict_lanchester("Knight", 5)
+
+
+def test_approach_time():
+    reach = unit_stats("Knight")["range"]
+    assert approach_time("Knight", "Knight", reach / 2) == 0.0
+    speed = unit_stats("Knight")["speed"]
+    assert approach_time("Knight", "Knight", reach + 2 * speed) == pytest.approx(1.0)
+
+
+def test_unknown_unit_type():
+    with pytest.raises(ValueError):
+        predict_lanchester("Dragon", 3)
+
+
+def test_evaluate_engagement_is_antisymmetric(battle):
+    army0, army1 = (army.units for army in battle.armies)
+    score = evaluate_engagement(army0, army1)
+    assert -1.0 <= score <= 1.0
+    assert evaluate_engagement(army1, army0) == pytest.approx(-score)
+    assert evaluate_engagement(army0, []) == 1.0
+    assert evaluate_engagement([], army1) == -1.0
+
+
+def test_unit_stats_leave_the_units_stream_alone(monkeypatch):
+    monkeypatch.setattr(lanchester, "_STATS_CACHE", {})
+    seed_all(3)
+    expected = get_rng("units").random()
+    seed_all(3)
+    unit_stats("Knight")  # Premier appel: construit l'unite gabarit
+    assert get_rng("units").random() == expected
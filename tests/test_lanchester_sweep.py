@@ -0,0 +1,35 @@
+# tests/test_lanchester_sweep.py
+import pytest
+
+from scripts.lanchester_sweep import percentile, run_sweep, summarize
+
+
+def test_percentile():
+    assert percentile([], 50) == 0.0
+    assert percentile([3.0], 90) == 3.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 0) == 1.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 100) == 4.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 50) == pytest.approx(2.5)
+
+
+def test_summarize():
+    results = {2: [{"casualties": [2, 1]}, {"casualties": [2, 3]}]}
+    summary = summarize(results)
+    assert summary["N"] == [2]
+    assert summary["winner_mean"] == [2.0]
+    assert summary["loser_mean"] == [2.0]
+
+
+def test_cache_is_keyed_on_max_turns(tmp_path, capsys):
+    cache = str(tmp_path / "sweep.json")
+    short = run_sweep("Knight", "MajorDAFT", [1], [1], workers=1, cache_path=cache, max_turns=3)
+    assert short[1][0]["turns"] == 3
+
+    # Autre max_turns: les points sont re-simules, pas relus du cache
+    longer = run_sweep("Knight", "MajorDAFT", [1], [1], workers=1, cache_path=cache, max_turns=6)
+    assert longer[1][0]["turns"] == 6
+
+    capsys.readouterr()
+    again = run_sweep("Knight", "MajorDAFT", [1], [1], workers=1, cache_path=cache, max_turns=6)
+    assert again == longer
+    assert "(1 en cache, 0 a simuler)" in capsys.readouterr().out
@@ -0,0 +1,55 @@
+# tests/test_map.py
+import json
+
+from conftest import build_battle
+from core.map import Map
+from core.rng import seed_all
+from engine import Engine
+from extensions.map_builder import create_battle_map
+from utils.serialization import save_game, load_game
+
+
+def _props_map():
+    game_map = Map(20, 10)
+    game_map.add_prop(1, 3, 4, 5)
+    game_map.add_prop(3, 19, 9)
+    game_map.add_prop(2, 3, 4, 1)  # Meme tuile qu'un autre prop
+    game_map.add_obstacle("Rock", 7, 2)
+    game_map.add_obstacle("Tree", 8, 2)
+    return game_map
+
+
+def test_props_are_stored_as_compact_arrays():
+    game_map = _props_map()
+    assert list(game_map.iter_props()) == [(3, 4, 1, 5), (19, 9, 3, 0), (3, 4, 2, 1)]
+    assert (game_map.prop_x.typecode, game_map.prop_kind.typecode) == ('H', 'B')
+    assert game_map.prop_cells() == {(3, 4), (19, 9)}
+
+
+def test_props_survive_a_dict_round_trip():
+    game_map = _props_map()
+    loaded = Map.from_dict(json.loads(json.dumps(game_map.to_dict())))
+    assert list(loaded.iter_props()) == list(game_map.iter_props())
+    assert loaded.obstacles == game_map.obstacles
+    assert (loaded.width, loaded.height) == (20, 10)
+
+
+def test_engine_obstacle_set_includes_props():
+    engine = Engine(_props_map(), *build_battle().armies)
+    # Les obstacles "Tree" historiques ne bloquent pas; les props et rochers si
+    assert engine.obstacle_set == {(3, 4), (19, 9), (7, 2)}
+
+
+def test_battle_map_trees_are_props_not_units(tmp_path):
+    seed_all(2)
+    game_map = create_battle_map(60, 60)
+    assert 0 < len(game_map.prop_x) <= 300
+    assert all(not tile.units for column in game_map.grid for tile in column)
+
+    engine = Engine(game_map, *build_battle().armies)
+    assert game_map.prop_cells() <= engine.obstacle_set
+    assert len(engine.units_by_id) == 30
+
+    path = str(tmp_path / "forest.bsav")
+    save_game(engine, path)
+    assert list(load_game(path).map.iter_props()) == list(game_map.iter_props())
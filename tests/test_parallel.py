@@ -0,0 +1,47 @@
+# tests/test_parallel.py
+import pytest
+
+from conftest import build_battle, LOGIC_DT
+from ai.generals import MarshalCARLO
+from core.digest import state_digest
+
+TICKS = 60
+
+
+def _digests(mode, p0, p1, ticks=TICKS):
+    engine = build_battle(p0(0) if callable(p0) else p0, p1(1) if callable(p1) else p1)
+    engine.enable_parallel_decisions(mode)
+    digests = []
+    try:
+        for _ in range(ticks):
+            if not engine.step(LOGIC_DT):
+                break
+            digests.append(state_digest(engine))
+    finally:
+        engine.stop_parallel_decisions()
+    return digests
+
+
+def _carlo(army_id):
+    # Budget fixe et petit: deterministe et rapide
+    return MarshalCARLO(army_id, max_rollouts=4)
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_parallel_matches_sequential(mode):
+    assert _digests(mode, "ColonelKAISER", "MajorDAFT") == _digests("sequential", "ColonelKAISER", "MajorDAFT")
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_parallel_with_a_search_general(mode):
+    # MarshalCARLO simule sur le moteur vivant: l'autre general ne doit pas le lire pendant ce temps
+    expected = _digests("sequential", _carlo, "ColonelKAISER")
+    assert _digests(mode, _carlo, "ColonelKAISER") == expected
+
+
+def test_sequential_mode_removes_the_decider(battle):
+    battle.enable_parallel_decisions("thread")
+    assert battle.decider is not None
+    battle.enable_parallel_decisions("sequential")
+    assert battle.decider is None
+    assert battle.step(LOGIC_DT)
@@ -0,0 +1,64 @@
+# tests/test_profiler.py
+from conftest import advance, build_battle
+from core.profiler import TickProfiler, PHASES
+from engine import Engine
+
+
+def _phase_methods(engine):
+    return {name: getattr(engine, name).__func__ for name in [method for _, method, _ in PHASES] + ["step"]}
+
+
+def test_attach_and_detach_restore_the_engine_methods(battle):
+    original = _phase_methods(battle)
+    assert all(original[name] is getattr(Engine, name) for name in original)
+
+    profiler = battle.enable_profiler()
+    assert battle.profiler is profiler
+    assert all(name in vars(battle) for name in original)
+
+    battle.disable_profiler()
+    assert battle.profiler is None
+    assert not any(name in vars(battle) for name in original)
+    assert _phase_methods(battle) == original
+
+
+def test_phase_totals_are_filled(battle):
+    profiler = battle.enable_profiler()
+    advance(battle, 30)
+    data = profiler.as_dict()
+    assert data["ticks"] == 30
+    for name in ("ai", "timers", "movement", "attacks", "status", "reap"):
+        assert data["phases"][name]["calls"] == 30, name
+        assert data["phases"][name]["ns"] > 0, name
+    assert data["phases"]["attacks"]["units"] > 0
+    # 30 unites au depart, certaines meurent en route
+    assert 0 < data["phases"]["timers"]["units"] <= 30 * 30
+    # Temps exclusifs: la somme des phases ne depasse pas le temps des ticks
+    assert sum(phase["ns"] for phase in data["phases"].values()) <= data["total_ns"]
+    assert "30 ticks" in battle.profile_report()
+
+
+def test_detached_engine_stops_counting(battle):
+    profiler = battle.enable_profiler()
+    advance(battle, 10)
+    battle.disable_profiler()
+    before = profiler.as_dict()
+    advance(battle, 10)
+    assert profiler.as_dict() == before
+    assert battle.profile_report().startswith("Profilage non active")
+
+
+def test_one_profiler_accumulates_across_engines(battle):
+    profiler = TickProfiler()
+    other = build_battle(seed=8)
+    battle.enable_profiler(profiler)
+    other.enable_profiler(profiler)
+    advance(battle, 5)
+    advance(other, 7)
+    assert profiler.ticks == 12
+
+    merged = TickProfiler()
+    merged.merge(profiler.as_dict())
+    merged.merge(profiler.as_dict())
+    assert merged.as_dict()["ticks"] == 24
+    assert merged.calls == [2 * calls for calls in profiler.calls]
@@ -0,0 +1,88 @@
+# tests/test_replay.py
+import pytest
+
+from conftest import build_battle, advance, LOGIC_DT
+from core.digest import state_digest
+from core.replay import ReplayEngine, read_replay
+
+
+def _digests_while_playing(engine, ticks):
+    digests = []
+    for _ in range(ticks):
+        if not engine.step(LOGIC_DT):
+            break
+        digests.append(state_digest(engine))
+    return digests
+
+
+def _digests_while_replaying(replay):
+    digests = []
+    while replay.step(0.0):
+        digests.append(state_digest(replay))
+    return digests
+
+
+def test_replay_reproduces_every_tick(tmp_path):
+    path = str(tmp_path / "match.replay")
+    engine = build_battle()
+    engine.record_replay(path)
+    played = _digests_while_playing(engine, 400)
+    engine.stop_recording()
+
+    replay = ReplayEngine.load(path)
+    assert replay.seed == engine.seed
+    assert _digests_while_replaying(replay) == played
+    assert replay.turn_count == engine.turn_count
+
+
+def test_replay_to_the_end_of_the_game(tmp_path):
+    path = str(tmp_path / "match.replay")
+    engine = build_battle("MajorDAFT", "CaptainBRAINDEAD")
+    engine.record_replay(path)
+    engine.run_game(max_turns=5000, view=None, logic_speed=1, quiet=True)
+    assert engine.game_over and engine.winner is not None
+
+    replay = ReplayEngine.load(path)
+    _digests_while_replaying(replay)
+    assert state_digest(replay) == state_digest(engine)
+    assert replay.winner == engine.winner
+
+
+def test_recording_mid_game(tmp_path):
+    path = str(tmp_path / "match.replay")
+    engine = build_battle()
+    advance(engine, 50)
+    engine.record_replay(path)
+    played = _digests_while_playing(engine, 100)
+    engine.stop_recording()
+
+    replay = ReplayEngine.load(path)
+    assert replay.turn_count == 50
+    assert _digests_while_replaying(replay) == played
+
+
+def test_fast_forward(tmp_path):
+    path = str(tmp_path / "match.replay")
+    engine = build_battle()
+    engine.record_replay(path)
+    played = _digests_while_playing(engine, 100)
+    engine.stop_recording()
+
+    replay = ReplayEngine.load(path)
+    replay.fast_forward(60)
+    assert replay.turn_count == 60
+    assert state_digest(replay) == played[59]
+
+
+@pytest.mark.parametrize("seed", [None, 0, 7, -3, (1 << 63) + 5, 1 << 70])
+def test_seed_survives_recording(tmp_path, seed):
+    path = str(tmp_path / "match.replay")
+    engine = build_battle(seed=seed)
+    engine.record_replay(path)
+    advance(engine, 5)
+    engine.stop_recording()
+
+    _, read_seed, ticks = read_replay(path)
+    assert read_seed == seed
+    assert len(ticks) == 5
+    assert ReplayEngine.load(path).seed == seed
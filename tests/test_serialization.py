@@ -0,0 +1,84 @@
+# tests/test_serialization.py
+import io
+
+import pytest
+
+from conftest import advance, LOGIC_DT
+from core.digest import state_digest
+from utils.serialization import (save_game, load_game, write_binary_save, read_binary_save,
+                                 BINARY_SAVE_HEADER)
+
+
+def _unit_fields(engine):
+    return {unit_id: (type(unit).__name__, unit.army_id, unit.is_alive, unit.pos, unit.current_hp,
+                      unit.current_cooldown, getattr(unit, 'target_id', None))
+            for unit_id, unit in engine.units_by_id.items()}
+
+
+def _binary(engine):
+    buffer = io.BytesIO()
+    write_binary_save(engine, buffer)
+    return buffer.getvalue()
+
+
+def test_bsav_round_trip_keeps_the_digest(battle, tmp_path):
+    advance(battle, 400)
+    path = str(tmp_path / "quick.bsav")
+    save_game(battle, path)
+    loaded = load_game(path)
+
+    assert state_digest(loaded) == state_digest(battle)
+    assert _unit_fields(loaded) == _unit_fields(battle)
+    assert loaded.turn_count == battle.turn_count
+    assert loaded.time_elapsed == battle.time_elapsed
+    assert loaded.seed == battle.seed
+    for army, loaded_army in zip(battle.armies, loaded.armies):
+        assert type(loaded_army.general) is type(army.general)
+        assert [u.unit_id for u in loaded_army.units] == [u.unit_id for u in army.units]
+        assert loaded_army.initial_count == army.initial_count
+        assert loaded_army.initial_total_hp == army.initial_total_hp
+
+
+def test_bsav_matches_json(battle, tmp_path):
+    advance(battle, 200)
+    save_game(battle, str(tmp_path / "a.bsav"))
+    save_game(battle, str(tmp_path / "a.json"))
+    from_binary = load_game(str(tmp_path / "a.bsav"))
+    from_json = load_game(str(tmp_path / "a.json"))
+    assert state_digest(from_binary) == state_digest(from_json)
+
+    # Les deux chargements jouent la meme suite de la partie
+    for _ in range(200):
+        running = from_binary.step(LOGIC_DT)
+        assert running == from_json.step(LOGIC_DT)
+        assert state_digest(from_binary) == state_digest(from_json)
+        if not running:
+            break
+
+
+def test_bsav_is_stable(battle):
+    # Sauvegarder un chargement redonne exactement les memes octets
+    advance(battle, 100)
+    data = _binary(battle)
+    assert _binary(read_binary_save(data)) == data
+
+
+def test_bsav_rejects_bad_input(battle):
+    data = _binary(battle)
+    with pytest.raises(ValueError):
+        read_binary_save(data[:BINARY_SAVE_HEADER.size - 1])
+    with pytest.raises(ValueError):
+        read_binary_save(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        read_binary_save(data[:-1])
+    newer = bytearray(data)
+    newer[4:6] = (0xFFFF).to_bytes(2, "little")
+    with pytest.raises(ValueError):
+        read_binary_save(bytes(newer))
+
+
+def test_corrupt_save_exits(tmp_path):
+    path = tmp_path / "broken.bsav"
+    path.write_bytes(b"BSAV")
+    with pytest.raises(SystemExit):
+        load_game(str(path))
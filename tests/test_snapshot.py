@@ -0,0 +1,94 @@
+# tests/test_snapshot.py
+from conftest import advance, LOGIC_DT
+from core.digest import state_digest
+
+
+def _play(engine, ticks):
+    digests = []
+    for _ in range(ticks):
+        if not engine.step(LOGIC_DT):
+            break
+        digests.append(state_digest(engine))
+    return digests
+
+
+def test_restore_returns_to_the_captured_state(battle):
+    advance(battle, 20)
+    token = battle.snapshot()
+    captured = state_digest(battle)
+    time_elapsed = battle.time_elapsed
+
+    _play(battle, 300)
+    assert state_digest(battle) != captured
+
+    battle.restore(token)
+    assert state_digest(battle) == captured
+    assert battle.turn_count == 20
+    assert battle.time_elapsed == time_elapsed
+
+
+def test_play_after_restore_is_identical(battle):
+    advance(battle, 20)
+    token = battle.snapshot()
+    first = _play(battle, 300)
+    battle.restore(token)
+    assert _play(battle, 300) == first
+
+
+def test_dead_units_come_back(battle):
+    token = battle.snapshot()
+    alive = [sum(1 for u in army.units if u.is_alive) for army in battle.armies]
+    count = len(battle.units_by_id)
+    _play(battle, 600)
+    assert len(battle.units_by_id) < count  # Morts retires (_reap_dead_units)
+
+    battle.restore(token)
+    assert len(battle.units_by_id) == count
+    assert [sum(1 for u in army.units if u.is_alive) for army in battle.armies] == alive
+    for unit in battle.units_by_id.values():
+        tile = battle.map.get_tile(int(unit.pos[0]), int(unit.pos[1]))
+        assert unit in tile.units
+
+
+def test_token_is_reused(battle):
+    token = battle.snapshot()
+    advance(battle, 30)
+    assert battle.snapshot(token) is token
+    captured = state_digest(battle)
+    advance(battle, 30)
+    battle.restore(token)
+    assert battle.turn_count == 30
+    assert state_digest(battle) == captured
+
+
+def test_listeners_are_rolled_back(battle):
+    metrics = battle.enable_metrics()
+    digest = battle.enable_digest(every=10)
+    advance(battle, 20)
+    token = battle.snapshot()
+    kills, samples = list(metrics.kills), len(digest)
+
+    advance(battle, 600)
+    battle.restore(token)
+    assert list(metrics.kills) == kills
+    assert len(digest) == samples
+
+    # Apres restauration, le flux reprend comme s'il n'y avait pas eu de detour
+    advance(battle, 100)
+    replayed = digest.items()
+    battle.restore(token)
+    advance(battle, 100)
+    assert digest.items() == replayed
+
+
+def test_metrics_history_survives_a_wrapped_rollout(battle):
+    metrics = battle.enable_metrics(capacity=16)
+    advance(battle, 40)
+    token = battle.snapshot()
+    history = metrics.history()
+
+    # Le detour fait plus d'un tour du buffer circulaire
+    advance(battle, 40)
+    battle.restore(token)
+    assert metrics.history() == history
+    assert metrics.history()["tick"] == list(range(25, 41))
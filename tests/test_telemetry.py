@@ -0,0 +1,80 @@
+# tests/test_telemetry.py
+import os
+
+import pytest
+
+from rl_modules.telemetry import TelemetryWriter, read_telemetry, render_report, FIELDS
+
+
+def _record(episode, **overrides):
+    record = {
+        "episode": episode, "winner": episode % 2, "ticks": 100 * episode, "wall_time": 0.25,
+        "ticks_per_sec": 400.0 * episode, "epsilon": 0.995 ** episode, "q_size_team1": 3 * episode,
+        "q_size_team2": 2 * episode, "reward_team1": 1.5, "reward_team2": -2.0, "win_rate": 50.0,
+    }
+    record.update(overrides)
+    return record
+
+
+@pytest.mark.parametrize("name", ["log.jsonl", "log.csv"])
+def test_round_trip(tmp_path, name):
+    path = str(tmp_path / "logs" / name)  # Dossier cree par le writer
+    records = [_record(1), _record(2, winner=None, reward_team1=None), _record(3, epsilon=1e-5)]
+    with TelemetryWriter(path) as writer:
+        for record in records:
+            writer.write(record)
+    assert read_telemetry(path) == records
+
+
+def test_csv_types(tmp_path):
+    path = str(tmp_path / "log.csv")
+    with TelemetryWriter(path) as writer:
+        writer.write(_record(1, winner=None, wall_time=2.0, extra="ignored"))
+    (record,) = read_telemetry(path)
+    assert list(record) == FIELDS  # Colonnes hors FIELDS ignorees
+    assert record["winner"] is None
+    assert isinstance(record["episode"], int)
+    assert isinstance(record["wall_time"], float) and record["wall_time"] == 2.0
+
+
+def test_lines_are_flushed_while_writing(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    writer = TelemetryWriter(path)
+    writer.write(_record(1))
+    assert read_telemetry(path) == [_record(1)]
+    writer.close()
+
+
+@pytest.mark.parametrize("name", ["log.jsonl", "log.csv"])
+def test_append_on_resume(tmp_path, name):
+    path = str(tmp_path / name)
+    with TelemetryWriter(path) as writer:
+        writer.write(_record(1))
+    with TelemetryWriter(path, append=True) as writer:
+        writer.write(_record(2))
+    assert [r["episode"] for r in read_telemetry(path)] == [1, 2]  # Un seul en-tete CSV
+
+    with TelemetryWriter(path) as writer:  # Sans append: fichier recommence
+        writer.write(_record(3))
+    assert [r["episode"] for r in read_telemetry(path)] == [3]
+
+
+def test_render_report(tmp_path):
+    pytest.importorskip("matplotlib")
+    path = str(tmp_path / "log.csv")
+    with TelemetryWriter(path) as writer:
+        for episode in range(1, 6):
+            writer.write(_record(episode))
+    output = render_report(path)
+    assert output == str(tmp_path / "log.png")
+    with open(output, "rb") as f:
+        assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+
+
+def test_render_report_needs_data(tmp_path):
+    pytest.importorskip("matplotlib")
+    path = str(tmp_path / "empty.jsonl")
+    TelemetryWriter(path).close()
+    with pytest.raises(ValueError):
+        render_report(path)
+    assert not os.path.exists(str(tmp_path / "empty.png"))
@@ -0,0 +1,94 @@
+# tests/test_tournament.py
+import pytest
+
+from core.replay import read_replay
+from scripts.tournament import Tournament, run_headless_match
+
+# Escarmouche au contact: un match dure quelques centaines de ticks
+SKIRMISH = """SIZE: 20 20
+UNITS:
+Knight, 8, 8, 0
+Knight, 8, 10, 0
+Crossbowman, 6, 9, 0
+Knight, 11, 8, 1
+Knight, 11, 10, 1
+Crossbowman, 13, 9, 1
+"""
+
+
+@pytest.fixture
+def scenario(tmp_path):
+    path = tmp_path / "skirmish.scen"
+    path.write_text(SKIRMISH)
+    return str(path)
+
+
+def test_headless_match_is_reproducible(scenario):
+    first = run_headless_match(scenario, "MajorDAFT", "CaptainBRAINDEAD", seed=11)
+    second = run_headless_match(scenario, "MajorDAFT", "CaptainBRAINDEAD", seed=11)
+    assert "error" not in first
+    assert first == second
+
+
+def test_unplayable_scenario_is_an_error(tmp_path):
+    bad = tmp_path / "bad.txt"
+    bad.write_text("x")
+    result = run_headless_match(str(bad), "MajorDAFT", "CaptainBRAINDEAD")
+    assert set(result) == {"error"}
+
+
+def test_errors_are_not_draws(scenario, tmp_path, monkeypatch, capsys):
+    bad = tmp_path / "bad.txt"
+    bad.write_text("x")
+    monkeypatch.chdir(tmp_path)  # Rapport HTML ecrit dans le dossier courant
+    tournament = Tournament(["MajorDAFT", "CaptainBRAINDEAD"], [scenario, str(bad)],
+                            rounds=1, seed=5)
+    tournament.run()
+    out = capsys.readouterr().out
+
+    errors = [m for m in tournament.match_history if m["error"]]
+    assert len(errors) == 2
+    assert all(m["winner"] is None and m["scenario"] == str(bad) for m in errors)
+    assert "-> ERREUR:" in out
+    assert "2 match(s) en erreur" in out
+    # Seuls les deux matchs joues comptent: aucun ne peut etre une egalite "fantome"
+    played = tournament._played_matches()
+    assert len(played) == 2
+    draws = sum(1 for m in played if m["winner"] is None)
+    assert f"/ {draws}D /" in out
+
+    with open(tmp_path / "tournament_report.html", encoding="utf-8") as f:
+        assert "<th>Erreurs</th>" in f.read()
+
+
+@pytest.fixture
+def crash_after_50_ticks(monkeypatch):
+    """Le moteur leve une exception au 51e tick de chaque match."""
+    from engine import Engine
+    execute = Engine._execute_actions
+
+    def crashing(self, actions, dt):
+        if self.turn_count >= 50:
+            raise RuntimeError("panne moteur")
+        execute(self, actions, dt)
+
+    monkeypatch.setattr(Engine, "_execute_actions", crashing)
+
+
+def test_failed_match_closes_its_replay(scenario, tmp_path, crash_after_50_ticks):
+    path = str(tmp_path / "match.replay")
+    result = run_headless_match(scenario, "MajorDAFT", "CaptainBRAINDEAD", seed=3, record=path)
+    assert result == {"error": "panne moteur"}
+    # Fichier ferme (tampon ecrit): les 50 ticks joues et celui qui a echoue se relisent
+    _, seed, ticks = read_replay(path)
+    assert seed == 3
+    assert len(ticks) == 51
+
+
+def test_failed_match_has_no_replay_in_history(scenario, tmp_path, monkeypatch, crash_after_50_ticks, capsys):
+    monkeypatch.chdir(tmp_path)
+    tournament = Tournament(["MajorDAFT", "CaptainBRAINDEAD"], [scenario], rounds=1, seed=5,
+                            record_dir=str(tmp_path / "replays"))
+    tournament.run()
+    assert [m["error"] for m in tournament.match_history] == ["panne moteur"] * 2
+    assert [m["replay"] for m in tournament.match_history] == [None, None]
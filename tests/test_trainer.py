@@ -0,0 +1,60 @@
+# tests/test_trainer.py
+import pytest
+
+from rl_modules import trainer
+from rl_modules.telemetry import read_telemetry
+
+MAP_SIZE = 30
+UNITS = 4
+
+
+class FakeCoordinator:
+    """Coordinateur en memoire: joue les episodes sur place, `failures` premiers jobs en erreur."""
+
+    def __init__(self, failures=0, workers=2):
+        self.failures = failures
+        self.workers = workers
+        self.batches = 0
+
+    def worker_count(self):
+        return self.workers
+
+    def run_jobs(self, jobs):
+        self.batches += 1
+        results = []
+        for _, spec in jobs:
+            if self.failures > 0:
+                self.failures -= 1
+                results.append({"error": "worker perdu"})
+            else:
+                results.append(trainer.run_episode_job(spec))
+        return results
+
+
+@pytest.fixture
+def model_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(trainer, "MODEL_DIR", str(tmp_path))
+    monkeypatch.setattr(trainer, "CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    monkeypatch.setattr(trainer, "FINAL_MODEL_DIR", str(tmp_path / "final"))
+    return tmp_path
+
+
+def test_failed_worker_episodes_are_not_draws(model_dir, capsys):
+    log = str(model_dir / "log.jsonl")
+    trainer.train_agent(num_episodes=3, map_size=MAP_SIZE, units_per_team=UNITS,
+                        coordinator=FakeCoordinator(failures=1), telemetry=log)
+    records = read_telemetry(log)
+    # L'episode en erreur est rejoue: 3 episodes joues, aucun enregistrement pour l'erreur
+    assert [r["episode"] for r in records] == [1, 2, 3]
+    assert all(r["ticks"] > 0 for r in records)
+    assert records[0]["epsilon"] == trainer.EPSILON_START
+    assert "1 episode" in capsys.readouterr().out
+
+
+def test_training_stops_when_every_worker_episode_fails(model_dir):
+    log = str(model_dir / "log.jsonl")
+    coordinator = FakeCoordinator(failures=10 ** 6)
+    trainer.train_agent(num_episodes=3, map_size=MAP_SIZE, units_per_team=UNITS,
+                        coordinator=coordinator, telemetry=log)
+    assert coordinator.batches == 1
+    assert read_telemetry(log) == []
@@ -0,0 +1,65 @@
+# tests/test_vec_env.py
+import pytest
+
+from rl_modules.vec_env import VecBattleEnv
+from rl_modules.commander import STRATEGY_HUNT_UNITS, STRATEGY_MIXED
+
+SMALL = {"map_size": 40, "units_per_team": 6, "seed": 11}
+
+
+def _check_step(result, num_envs):
+    obs, rewards, dones, infos = result
+    assert len(obs) == len(rewards) == len(dones) == len(infos) == num_envs
+    for state_keys, reward in zip(obs, rewards):
+        assert len(state_keys) == 2 and all(len(key) == 3 for key in state_keys)
+        assert len(reward) == 2
+    assert all(isinstance(done, bool) for done in dones)
+    return obs, rewards, dones, infos
+
+
+def test_reset_and_step_shapes():
+    with VecBattleEnv(3, **SMALL) as env:
+        obs = env.reset()
+        assert len(obs) == 3
+        assert all(len(state_keys) == 2 for state_keys in obs)
+        _, _, dones, infos = _check_step(env.step([(STRATEGY_HUNT_UNITS, STRATEGY_MIXED)] * 3), 3)
+        assert dones == [False] * 3
+        assert infos == [{}] * 3
+
+
+def test_battles_advance_in_lockstep():
+    with VecBattleEnv(3, ticks_per_step=4, **SMALL) as env:
+        env.reset()
+        for step in range(1, 4):
+            env.step([(STRATEGY_HUNT_UNITS, STRATEGY_HUNT_UNITS)] * 3)
+            assert [slot.engine.turn_count for slot in env._slots] == [4 * step] * 3
+
+
+def test_macro_action_defaults_to_the_decision_interval():
+    with VecBattleEnv(2, decision_interval=5, **SMALL) as env:
+        env.reset()
+        env.step([(STRATEGY_MIXED, STRATEGY_MIXED)] * 2)
+        assert [slot.engine.turn_count for slot in env._slots] == [5, 5]
+
+
+def test_finished_battles_reset_with_their_result_in_infos():
+    with VecBattleEnv(2, max_turns=6, ticks_per_step=3, **SMALL) as env:
+        env.reset()
+        _, _, dones, _ = env.step([(STRATEGY_HUNT_UNITS, STRATEGY_HUNT_UNITS)] * 2)
+        assert dones == [False, False]
+        obs, _, dones, infos = env.step([(STRATEGY_HUNT_UNITS, STRATEGY_HUNT_UNITS)] * 2)
+        assert dones == [True, True]
+        for info in infos:
+            assert info["turns"] == 6
+            assert set(info) == {"winner", "turns", "terminal_obs", "wall", "rewards"}
+        # La bataille suivante commence au tick 0
+        assert [slot.engine.turn_count for slot in env._slots] == [0, 0]
+        assert obs == [slot.obs for slot in env._slots]
+
+
+def test_worker_processes_split_the_battles():
+    with VecBattleEnv(3, workers=2, ticks_per_step=2, **SMALL) as env:
+        assert env._counts == [2, 1]
+        assert len(env.reset()) == 3
+        _check_step(env.step([(STRATEGY_HUNT_UNITS, STRATEGY_MIXED)] * 3), 3)
+    assert env._processes == []
@@ -1,6 +1,10 @@
-import random
 import os
+import math
+import struct
+from core.rng import get_rng
 from typing import Dict, List, Tuple
+from utils.unified_loader import (BINARY_SCENARIO_EXT, BINARY_SCENARIO_MAGIC, BINARY_SCENARIO_VERSION,
+                                  BINARY_HEADER, BINARY_RECORD, BINARY_SECTIONS)
 
 def generate_map_file(filename: str, width: int, height: int, noise_level: float = 0.1) -> None:
     """
@@ -24,6 +28,7 @@ def generate_army_file(filename: str, general_name: str, units_config: Dict[str,
     print(f"Génération de l'armée pour {general_name} dans '{filename}'...")
     
     width, height = map_size
+    rng = get_rng("armies")
     
     # Spawn zones
     margin = 5
@@ -41,8 +46,178 @@ def generate_army_file(filename: str, general_name: str, units_config: Dict[str,
         
         for unit_type, count in units_config.items():
             for _ in range(count):
-                x = random.uniform(x_min, x_max)
-                y = random.uniform(y_min, y_max)
+                x = rng.uniform(x_min, x_max)
+                y = rng.uniform(y_min, y_max)
                 f.write(f"{unit_type}, {x:.2f}, {y:.2f}\n")
                 
     print(f"Armée créée : {filename}")
+
+
+# --- Scenarios de stress (10k-100k unites) ---
+
+STRESS_FORMATIONS = ("blocks", "lines", "scatter")
+STRESS_SPACING = 1.5  # Ecart entre deux unites d'une formation
+STRESS_AREA_PER_UNIT = 6.0  # Surface de carte par unite (taille automatique)
+
+
+class _TextScenarioWriter:
+    """Ecrit un .scen ligne par ligne (en-tete de section a chaque changement)."""
+
+    def __init__(self, filename: str, width: int, height: int):
+        self._file = open(filename, 'w')
+        self._file.write("# Stress scenario generated by Medieval Battle CLI\n")
+        self._file.write(f"SIZE: {width} {height}\n")
+        self._section = None
+
+    def _enter(self, section: str):
+        if section != self._section:
+            self._file.write(f"{section}:\n")
+            self._section = section
+
+    def unit(self, unit_type: str, x: float, y: float, owner: int, section: str = "UNITS"):
+        self._enter(section)
+        self._file.write(f"{unit_type}, {x:.2f}, {y:.2f}, {owner}\n")
+
+    def resource(self, resource_type: str, x: int, y: int):
+        self._enter("RESOURCES")
+        self._file.write(f"{resource_type}, {x}, {y}\n")
+
+    def close(self):
+        self._file.close()
+
+
+class _BinaryScenarioWriter:
+    """
+    Ecrit un .bscen enregistrement par enregistrement (voir
+    utils/unified_loader.py); le nombre d'entites et la table des types sont
+    fixes a la fermeture.
+    """
+
+    def __init__(self, filename: str, width: int, height: int):
+        self._file = open(filename, 'wb')
+        self._width, self._height = width, height
+        self._types: dict[str, int] = {}
+        self._count = 0
+        self._file.write(BINARY_SCENARIO_MAGIC)
+        self._file.write(BINARY_HEADER.pack(BINARY_SCENARIO_VERSION, width, height, 0, 0))
+
+    def _record(self, section: int, type_name: str, x: float, y: float, owner: int):
+        type_index = self._types.setdefault(type_name, len(self._types))
+        self._file.write(BINARY_RECORD.pack(section, type_index, x, y, owner))
+        self._count += 1
+
+    def unit(self, unit_type: str, x: float, y: float, owner: int, section: str = "UNITS"):
+        self._record(BINARY_SECTIONS.index(section), unit_type, x, y, owner)
+
+    def resource(self, resource_type: str, x: int, y: int):
+        self._record(2, resource_type, x, y, -1)
+
+    def close(self):
+        table_offset = self._file.tell()
+        self._file.write(struct.pack("<H", len(self._types)))
+        for name in self._types:
+            encoded = name.encode("utf-8")
+            self._file.write(bytes([len(encoded)]) + encoded)
+        self._file.seek(len(BINARY_SCENARIO_MAGIC))
+        self._file.write(BINARY_HEADER.pack(BINARY_SCENARIO_VERSION, self._width, self._height,
+                                            self._count, table_offset))
+        self._file.close()
+
+
+def open_scenario_writer(filename: str, width: int, height: int):
+    """Writer en flux, texte (.scen) ou binaire (.bscen) selon l'extension."""
+    if filename.endswith(BINARY_SCENARIO_EXT):
+        return _BinaryScenarioWriter(filename, width, height)
+    return _TextScenarioWriter(filename, width, height)
+
+
+def parse_unit_mix(spec: str) -> Dict[str, float]:
+    """'Knight:0.5,Pikeman:0.3,Crossbowman:0.2' -> poids par type (normalises)."""
+    weights = {}
+    for item in spec.split(','):
+        name, _, weight = item.strip().partition(':')
+        weights[name.strip()] = float(weight) if weight else 1.0
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError(f"Melange d'unites invalide: '{spec}'")
+    return {name: weight / total for name, weight in weights.items()}
+
+
+def _split_counts(total: int, mix: Dict[str, float]) -> List[Tuple[str, int]]:
+    """Repartit `total` unites selon le melange (plus grands restes)."""
+    exact = [(name, total * weight) for name, weight in mix.items()]
+    counts = {name: int(value) for name, value in exact}
+    remainder = total - sum(counts.values())
+    for name, value in sorted(exact, key=lambda item: item[1] - int(item[1]), reverse=True)[:remainder]:
+        counts[name] += 1
+    return [(name, counts[name]) for name, _ in exact]
+
+
+def _formation_positions(formation: str, count: int, area: Tuple[float, float, float, float], rng):
+    """Positions (x, y) de `count` unites dans la zone (x0, y0, x1, y1), en flux."""
+    x0, y0, x1, y1 = area
+    if formation == "scatter":
+        for _ in range(count):
+            yield rng.uniform(x0, x1), rng.uniform(y0, y1)
+        return
+
+    # blocks: grille compacte centree; lines: rangs sur toute la hauteur de la zone
+    if formation == "lines":
+        rows = max(1, int((y1 - y0) / STRESS_SPACING) + 1)
+        cols = (count + rows - 1) // rows
+    else:
+        max_cols = int((x1 - x0) / STRESS_SPACING) + 1
+        cols = max(1, min(max_cols, int(math.ceil(math.sqrt(count)))))
+        rows = (count + cols - 1) // cols
+    start_x = (x0 + x1) / 2 - (cols - 1) * STRESS_SPACING / 2
+    start_y = (y0 + y1) / 2 - (rows - 1) * STRESS_SPACING / 2
+    for index in range(count):
+        col, row = divmod(index, rows)
+        yield (min(x1, max(x0, start_x + col * STRESS_SPACING)),
+               min(y1, max(y0, start_y + row * STRESS_SPACING)))
+
+
+def generate_stress_scenario(filename: str, units_per_army: int, unit_mix: Dict[str, float],
+                             formation: str = "blocks", obstacle_density: float = 0.0,
+                             map_size: Tuple[int, int] = None) -> Tuple[int, int]:
+    """
+    Genere un scenario de stress (.scen ou .bscen selon l'extension): deux
+    armees de `units_per_army` unites (melange `unit_mix`, formation
+    `formation`), chacune dans sa moitie de carte, et une densite d'obstacles
+    (rochers, fraction des tuiles du no man's land). Ecriture en flux: la
+    memoire ne depend pas du nombre d'unites. Retourne la taille de la carte.
+    """
+    if formation not in STRESS_FORMATIONS:
+        raise ValueError(f"Formation inconnue: {formation} (disponibles: {', '.join(STRESS_FORMATIONS)})")
+    if map_size is None:
+        side = int(math.ceil(math.sqrt(2 * units_per_army * STRESS_AREA_PER_UNIT))) + 20
+        map_size = (side, side)
+    width, height = map_size
+    rng = get_rng("armies")
+    map_rng = get_rng("map")
+
+    # Chaque armee occupe un tiers de la largeur; le tiers central est le no man's land
+    margin = 2
+    third = width / 3
+    areas = [(margin, margin, third - margin, height - margin),
+             (width - third + margin, margin, width - margin, height - margin)]
+
+    print(f"Génération du scénario de stress {width}x{height} ({2 * units_per_army} unités) dans '{filename}'...")
+    writer = open_scenario_writer(filename, width, height)
+    try:
+        for owner, area in enumerate(areas):
+            positions = _formation_positions(formation, units_per_army, area, rng)
+            for unit_type, count in _split_counts(units_per_army, unit_mix):
+                for _ in range(count):
+                    x, y = next(positions)
+                    writer.unit(unit_type, x, y, owner)
+
+        if obstacle_density > 0:
+            for x in range(int(third), int(width - third)):
+                for y in range(height):
+                    if map_rng.random() < obstacle_density:
+                        writer.resource("Rock", x, y)
+    finally:
+        writer.close()
+    print(f"Scénario créé : {filename}")
+    return width, height
@@ -1,28 +1,273 @@
 # utils/serialization.py
+"""
+Sauvegarde et chargement d'une partie complete.
+
+Deux formats, choisis par l'extension a l'ecriture et par le contenu a la
+lecture (nombre magique):
+    .bsav   binaire versionne, format de la sauvegarde rapide (F11)
+    .json   Engine.to_dict() (export lisible, commande `export`)
+
+Format binaire (petit-boutiste), version BINARY_SAVE_VERSION:
+    en-tete     BINARY_SAVE_HEADER: magic, version, reserve, nombre d'unites N,
+                tick, temps ecoule, taille des extras
+    colonnes    BINARY_SAVE_COLUMNS, N valeurs chacune, unites de l'armee 0
+                puis de l'armee 1 (ordre de army.units):
+                unit_id (i64) | army_id (i8) | type (u16, indice dans la table
+                des types) | alive (i8) | pos_x, pos_y (f64) | hp (i64) |
+                cooldown (f64)
+    extras      JSON: graine, table des types, armees (general, effectif,
+                stats initiales), carte (Map.to_dict), et champs d'unite hors
+                colonnes qui different du gabarit de leur type (cible,
+                deplacement en cours, etat d'un Trebuchet...), par indice.
+
+Au chargement, chaque type d'unite est construit une seule fois (gabarit);
+une unite est une copie du __dict__ du gabarit completee par les colonnes,
+sans appel au constructeur par unite. Non sauvegarde: l'animation
+(cosmetique, decalages tires au chargement comme dans le constructeur).
+"""
 import json
+import os
 import sys
+import struct
+from array import array
+from core.map import Map
+from core.army import Army
+from core.rng import get_rng
 from engine import Engine
 
+BINARY_SAVE_EXT = ".bsav"
+BINARY_SAVE_MAGIC = b"BSAV"
+BINARY_SAVE_VERSION = 1
+BINARY_SAVE_HEADER = struct.Struct("<4sHHIqdI")
+
+# (colonne, code array), dans l'ordre du fichier
+BINARY_SAVE_COLUMNS = (
+    ("unit_id", 'q'),
+    ("army_id", 'b'),
+    ("type", 'H'),
+    ("alive", 'b'),
+    ("pos_x", 'd'),
+    ("pos_y", 'd'),
+    ("hp", 'q'),
+    ("cooldown", 'd'),
+)
+
+# Champs d'unite jamais ecrits en extras: ceux des colonnes et l'etat d'animation
+_NOT_EXTRAS = frozenset(("unit_id", "army_id", "pos", "last_pos", "current_hp",
+                         "current_cooldown", "is_alive", "statut", "death_anim_finished"))
+_EXTRA_TYPES = (bool, int, float, str)
+
+
+def _template(unit_class) -> dict:
+    """__dict__ d'une instance neuve de `unit_class` (generateur "units" inchange)."""
+    anim_rng = get_rng("units")
+    state = anim_rng.getstate()
+    try:
+        return vars(unit_class(unit_id=0, army_id=0, pos=(0.0, 0.0)))
+    finally:
+        anim_rng.setstate(state)
+
+
+def _unit_extras(unit, template: dict) -> dict:
+    """Champs scalaires de l'unite, hors colonnes, qui different du gabarit."""
+    extras = {}
+    for name, value in vars(unit).items():
+        if name in _NOT_EXTRAS or name.startswith("anim"):
+            continue
+        if value is not None and not isinstance(value, _EXTRA_TYPES):
+            continue
+        if name in template:
+            if template[name] == value:
+                continue
+        elif value is None or value is False:
+            continue  # Attribut pose en cours de partie, a sa valeur "absente"
+        extras[name] = value
+    return extras
+
+
+def _little_endian(column: array) -> bytes:
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def write_binary_save(engine: Engine, f):
+    """Ecrit l'etat du moteur au format binaire dans le fichier ouvert `f`."""
+    from core.definitions import UNIT_CLASS_MAP
+
+    columns = {name: array(code) for name, code in BINARY_SAVE_COLUMNS}
+    unit_ids, army_ids, type_ids, alive, pos_x, pos_y, hp, cooldown = columns.values()
+    types: list[str] = []
+    type_index: dict[type, int] = {}
+    templates: list[dict] = []
+    sparse = {}
+    armies = []
+    for army in engine.armies:
+        for unit in army.units:
+            unit_class = type(unit)
+            index = type_index.get(unit_class)
+            if index is None:
+                if UNIT_CLASS_MAP.get(unit_class.__name__) is not unit_class:
+                    raise ValueError(f"Type d'unité non sauvegardable: {unit_class.__name__}")
+                index = type_index[unit_class] = len(types)
+                types.append(unit_class.__name__)
+                templates.append(_template(unit_class))
+            extras = _unit_extras(unit, templates[index])
+            if extras:
+                sparse[len(unit_ids)] = extras
+            unit_ids.append(unit.unit_id)
+            army_ids.append(unit.army_id)
+            type_ids.append(index)
+            alive.append(1 if unit.is_alive else 0)
+            x, y = unit.pos
+            pos_x.append(x)
+            pos_y.append(y)
+            hp.append(unit.current_hp)
+            cooldown.append(unit.current_cooldown)
+        armies.append({
+            'army_id': army.army_id,
+            'general_type': army.general.__class__.__name__,
+            'count': len(army.units),
+            'initial_stats': {
+                'count': army.initial_count,
+                'hp': army.initial_total_hp,
+                'breakdown': army.initial_units_breakdown,
+            },
+        })
+
+    extras = json.dumps({
+        'seed': engine.seed,
+        'types': types,
+        'armies': armies,
+        'map': engine.map.to_dict(),
+        'units': sparse,
+    }, separators=(",", ":")).encode("utf-8")
+
+    f.write(BINARY_SAVE_HEADER.pack(BINARY_SAVE_MAGIC, BINARY_SAVE_VERSION, 0, len(unit_ids),
+                                    engine.turn_count, engine.time_elapsed, len(extras)))
+    for column in columns.values():
+        f.write(_little_endian(column))
+    f.write(extras)
+
+
+def read_binary_save(data: bytes) -> Engine:
+    """Reconstruit le moteur depuis le contenu d'une sauvegarde binaire."""
+    from core.definitions import UNIT_CLASS_MAP
+
+    if len(data) < BINARY_SAVE_HEADER.size:
+        raise ValueError("sauvegarde binaire tronquée (en-tête)")
+    magic, version, _, count, turn_count, time_elapsed, extras_size = BINARY_SAVE_HEADER.unpack_from(data)
+    if magic != BINARY_SAVE_MAGIC:
+        raise ValueError("ce n'est pas une sauvegarde binaire")
+    if version > BINARY_SAVE_VERSION:
+        raise ValueError(f"version de sauvegarde {version} non supportée (max {BINARY_SAVE_VERSION})")
+
+    view = memoryview(data)
+    offset = BINARY_SAVE_HEADER.size
+    columns = []
+    for _, code in BINARY_SAVE_COLUMNS:
+        column = array(code)
+        end = offset + count * column.itemsize
+        if end > len(data):
+            raise ValueError("sauvegarde binaire tronquée (colonnes)")
+        column.frombytes(view[offset:end])
+        if sys.byteorder == "big":
+            column.byteswap()
+        columns.append(column)
+        offset = end
+    if offset + extras_size > len(data):
+        raise ValueError("sauvegarde binaire tronquée (extras)")
+    extras = json.loads(bytes(view[offset:offset + extras_size]))
+
+    classes = []
+    for name in extras['types']:
+        unit_class = UNIT_CLASS_MAP.get(name)
+        if not unit_class:
+            raise ValueError(f"Type d'unité inconnu lors du chargement: {name}")
+        classes.append(unit_class)
+    templates = [_template(unit_class) for unit_class in classes]
+    # Conteneurs du gabarit (armor_classes, bonus_damage...): copies propres a chaque unite
+    mutables = [[name for name, value in template.items() if isinstance(value, (list, dict, set))]
+                for template in templates]
+
+    sparse = {int(index): fields for index, fields in extras.get('units', {}).items()}
+    anim_random = get_rng("units").random
+    new = object.__new__
+    units = []
+    for i, (unit_id, army_id, type_id, alive, x, y, hp, cooldown) in enumerate(zip(*columns)):
+        template = templates[type_id]
+        state = template.copy()
+        for name in mutables[type_id]:
+            state[name] = template[name].copy()
+        pos = (x, y)
+        state['unit_id'] = unit_id
+        state['army_id'] = army_id
+        state['pos'] = pos
+        state['last_pos'] = pos
+        state['current_hp'] = hp
+        state['current_cooldown'] = cooldown
+        # Decalage d'animation aleatoire, memes bornes que Unit.__init__
+        state['anim_index'] = int(anim_random() * 30)
+        state['anim_elapsed'] = int(anim_random() * 101)
+        if not alive:
+            state['is_alive'] = False
+            state['statut'] = 'death'
+            state['death_anim_finished'] = True  # Skip anim si chargé mort
+        unit_extras = sparse.get(i)
+        if unit_extras:
+            state.update(unit_extras)
+        unit = new(classes[type_id])
+        unit.__dict__ = state
+        units.append(unit)
+
+    armies = []
+    start = 0
+    for army_data in extras['armies']:
+        # Army.from_dict: general (repli sur MajorDAFT) et stats initiales, unites ajoutees ensuite
+        army = Army.from_dict({**army_data, 'units': []})
+        army.units = units[start:start + army_data['count']]
+        start += army_data['count']
+        armies.append(army)
+
+    engine = Engine(Map.from_dict(extras['map']), armies[0], armies[1], seed=extras.get('seed'))
+    engine.turn_count = turn_count
+    engine.time_elapsed = time_elapsed
+    # Engine.__init__ recalcule les stats initiales depuis les unites presentes
+    for army, army_data in zip(engine.armies, extras['armies']):
+        stats = army_data['initial_stats']
+        army.initial_count = stats['count']
+        army.initial_total_hp = stats['hp']
+        army.initial_units_breakdown = stats['breakdown']
+    return engine
+
+
 def save_game(engine: Engine, filename: str):
     """
-    Sauvegarde l'etat complet du moteur de jeu dans un fichier JSON.
+    Sauvegarde l'etat complet du moteur de jeu: binaire si l'extension est
+    BINARY_SAVE_EXT, JSON sinon.
     """
     # Force extension .json if .sav is passed (migration)
     if filename.endswith(".sav"):
         filename = filename[:-4] + ".json"
-        
+
     print(f"Sauvegarde de la partie dans '{filename}'...")
     try:
-        data = engine.to_dict()
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=None) # Compact save
+        if filename.endswith(BINARY_SAVE_EXT):
+            with open(filename, 'wb') as f:
+                write_binary_save(engine, f)
+        else:
+            data = engine.to_dict()
+            with open(filename, 'w') as f:
+                json.dump(data, f, indent=None) # Compact save
         print("Sauvegarde réussie !")
-    except IOError as e:
+    except (IOError, ValueError) as e:
         print(f"Erreur lors de la sauvegarde : {e}", file=sys.stderr)
 
 def load_game(filename: str) -> Engine:
     """
-    Charge un moteur de jeu complet depuis un fichier JSON (.json).
+    Charge un moteur de jeu complet depuis une sauvegarde binaire (.bsav) ou
+    JSON (.json), reconnue a son contenu.
     """
     # Support legacy .sav extension in CLI but warn
     if filename.endswith(".sav"):
@@ -37,16 +282,19 @@ def load_game(filename: str) -> Engine:
 
     print(f"Chargement de la partie depuis '{filename}'...")
     try:
-        with open(filename, 'r') as f:
-            data = json.load(f)
-            
-        engine = Engine.from_dict(data)
-        
+        with open(filename, 'rb') as f:
+            data = f.read()
+
+        if data.startswith(BINARY_SAVE_MAGIC):
+            engine = read_binary_save(data)
+        else:
+            engine = Engine.from_dict(json.loads(data))
+
         print(f"Chargement reussi ! Tick actuel : {engine.turn_count}")
         return engine
     except FileNotFoundError:
         print(f"Erreur : Fichier de sauvegarde '{filename}' introuvable.", file=sys.stderr)
         sys.exit(1)
-    except (json.JSONDecodeError, KeyError, ValueError) as e:
+    except (json.JSONDecodeError, UnicodeDecodeError, KeyError, ValueError, struct.error) as e:
         print(f"Erreur : Le fichier de sauvegarde est corrompu ou invalide: {e}", file=sys.stderr)
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -1,6 +1,7 @@
 # utils/unified_loader.py
 
 import sys
+import struct
 from typing import Tuple
 from core.map import Map
 from core.army import Army
@@ -8,6 +9,47 @@ from core.unit import Unit
 from ai.general import General
 from core.definitions import GENERAL_CLASS_MAP, UNIT_CLASS_MAP
 
+# Forme binaire d'un scenario (.bscen), ecrite par utils/generators.py:
+#   en-tete  MAGIC | version u16 | largeur u32 | hauteur u32 | nb entites u32 | offset table u64
+#   entite   section u8 (0 unite, 1 structure, 2 ressource) | type u16 | x f32 | y f32 | camp i8
+#   table    nb types u16 | (longueur u8 + nom utf-8) par type
+BINARY_SCENARIO_EXT = ".bscen"
+BINARY_SCENARIO_MAGIC = b"BTLSCEN\0"
+BINARY_SCENARIO_VERSION = 1
+BINARY_HEADER = struct.Struct("<HIIIQ")
+BINARY_RECORD = struct.Struct("<BHffb")
+BINARY_SECTIONS = ("UNITS", "STRUCTURES", "RESOURCES")
+
+
+def read_binary_scenario(filepath: str):
+    """Lit un .bscen -> (largeur, hauteur, unites, structures, ressources)."""
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    if raw[:len(BINARY_SCENARIO_MAGIC)] != BINARY_SCENARIO_MAGIC:
+        raise ValueError("pas un scenario binaire")
+    version, width, height, count, table_offset = BINARY_HEADER.unpack_from(raw, len(BINARY_SCENARIO_MAGIC))
+    if version > BINARY_SCENARIO_VERSION:
+        raise ValueError(f"version {version} non supportee (max {BINARY_SCENARIO_VERSION})")
+
+    (type_count,) = struct.unpack_from("<H", raw, table_offset)
+    offset = table_offset + 2
+    types = []
+    for _ in range(type_count):
+        length = raw[offset]
+        types.append(raw[offset + 1:offset + 1 + length].decode("utf-8"))
+        offset += 1 + length
+
+    start = len(BINARY_SCENARIO_MAGIC) + BINARY_HEADER.size
+    records = raw[start:start + count * BINARY_RECORD.size]
+    sections = ([], [], [])
+    for section, type_index, x, y, owner in BINARY_RECORD.iter_unpack(records):
+        if section == 2:
+            sections[2].append((types[type_index], x, y))
+        else:
+            sections[section].append((types[type_index], x, y, owner))
+    return width, height, sections[0], sections[1], sections[2]
+
+
 def load_scenario(filepath: str, general1_name: str = "MajorDAFT", general2_name: str = "MajorDAFT") -> Tuple[Map, Army, Army]:
     """
     Charges un scénario complet depuis un fichier (.scen ou text).
@@ -21,6 +63,17 @@ def load_scenario(filepath: str, general1_name: str = "MajorDAFT", general2_name
     """
     print(f"Chargement du scénario unifié depuis {filepath}...")
 
+    if filepath.endswith(BINARY_SCENARIO_EXT):
+        try:
+            scenario = read_binary_scenario(filepath)
+        except FileNotFoundError:
+            print(f"Erreur: Fichier scénario introuvable '{filepath}'", file=sys.stderr)
+            sys.exit(1)
+        except (ValueError, struct.error) as e:
+            print(f"Erreur parsage '{filepath}': {e}", file=sys.stderr)
+            sys.exit(1)
+        return _build_scenario(*scenario, general1_name, general2_name)
+
     width, height = 120, 120
     elevation_data = []
     units_data = [] # (TYPE, X, Y, OWNER_ID)
@@ -84,7 +137,14 @@ def load_scenario(filepath: str, general1_name: str = "MajorDAFT", general2_name
     except Exception as e:
         print(f"Erreur parsage '{filepath}': {e}", file=sys.stderr)
         sys.exit(1)
-    
+
+    return _build_scenario(width, height, units_data, structures_data, resources_data,
+                           general1_name, general2_name)
+
+
+def _build_scenario(width: int, height: int, units_data: list, structures_data: list, resources_data: list,
+                    general1_name: str, general2_name: str) -> Tuple[Map, Army, Army]:
+    """Construit la carte et les deux armees a partir des entites lues."""
     # 1. Create Map
     game_map = Map(width, height)
     
@@ -106,7 +166,8 @@ def load_scenario(filepath: str, general1_name: str = "MajorDAFT", general2_name
     all_entities = units_data + structures_data
     
     id_counter_0 = 0
-    id_counter_1 = 10000
+    # Les IDs du camp 1 commencent a 10000, ou apres ceux du camp 0 s'il en a plus
+    id_counter_1 = max(10000, sum(1 for entity in all_entities if entity[3] == 0))
     
     for u_type, u_x, u_y, u_owner in all_entities:
         u_cls = UNIT_CLASS_MAP.get(u_type)
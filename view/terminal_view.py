@@ -247,119 +247,137 @@ class TerminalView:
     def _render_with_curses(self, armies: list[Army], time_elapsed: float, paused: bool, speed_multiplier: float):
         """Rendu avec curses pour un affichage lisse."""
         try:
-            self.stdscr.clear()
-            term_height, term_width = self.stdscr.getmaxyx()
-            
-            # Adapter dynamiquement les dimensions d'affichage a la taille du terminal
-            # Reserver: header(1) + controles(1) + position(1) + bordure_haut(1) + bordure_bas(1) + stats(2) + marge(1) = 8 lignes
-            reserved_lines = 8
-            available_height = max(5, term_height - reserved_lines)
-            available_width = max(20, term_width - 4)  # -4 pour les bordures
-            
-            # Limiter les dimensions d'affichage
-            self.max_display_width = min(available_width, self.width)
-            self.max_display_height = min(available_height, self.height)
-            
-            # Corriger le scroll si nécessaire (après redimensionnement)
-            self.scroll_x = max(0, min(self.scroll_x, self.width - self.max_display_width))
-            self.scroll_y = max(0, min(self.scroll_y, self.height - self.max_display_height))
-            
-            # Ligne 0: Header
-            status = "PAUSE" if paused else "EN COURS"
-            header = f"=== TEMPS {time_elapsed:.1f}s === [{status}] === x{speed_multiplier:.1f} ==="
-            self.stdscr.addstr(0, 0, header[:term_width-1], curses.A_BOLD)
-            
-            # Ligne 1: Controles
-            controls = "[P/ESPACE] Pause | [TAB] Infos | [ZQSD] Scroll | [Esc] Quitter"
-            self.stdscr.addstr(1, 0, controls[:term_width-1])
-            
-            # Ligne 2: Position et dimensions
-            pos_info = f"Position: ({self.scroll_x}, {self.scroll_y}) | Affichage: {self.max_display_width}x{self.max_display_height}"
-            self.stdscr.addstr(2, 0, pos_info[:term_width-1])
-            
-            # Calculer les dimensions visibles pour ce frame
-            visible_width = min(self.max_display_width, self.width - self.scroll_x)
-            visible_height = min(self.max_display_height, self.height - self.scroll_y)
-            
-            map_start_y = 4
-            
-            # Afficher la grille
-            grid = [[self.SYMBOL_EMPTY for _ in range(visible_width)] for _ in range(visible_height)]
-            grid_colors = [[0 for _ in range(visible_width)] for _ in range(visible_height)]  # 0 = aucune couleur
-            
-            # Obstacles
-            for type_name, x, y in self.map.obstacles:
-                ix, iy = int(x) - self.scroll_x, int(y) - self.scroll_y
-                if 0 <= ix < visible_width and 0 <= iy < visible_height:
-                    if type_name == "Tree":
-                        grid[iy][ix] = self.SYMBOL_TREE
-                        grid_colors[iy][ix] = 3  # Couleur verte
-                    elif type_name == "Rock":
-                        grid[iy][ix] = self.SYMBOL_ROCK
-                        grid_colors[iy][ix] = 4  # Couleur grise
-            
-            # Unités
-            for army in armies:
-                color_pair = 1 if army.army_id == 0 else 2  # Bleu ou Rouge
-                for unit in army.units:
-                    if not unit.is_alive:
-                        continue
-                    ix = int(unit.pos[0]) - self.scroll_x
-                    iy = int(unit.pos[1]) - self.scroll_y
-                    if 0 <= ix < visible_width and 0 <= iy < visible_height:
-                        symbol = self._get_unit_symbol(unit)
-                        grid[iy][ix] = symbol
-                        grid_colors[iy][ix] = color_pair
-            
-            # Afficher la bordure et la grille
-            self.stdscr.addstr(map_start_y, 0, "+" + "-" * visible_width + "+")
-            for iy, row in enumerate(grid):
-                line_str = "|"
-                for ix, symbol in enumerate(row):
-                    color_pair = grid_colors[iy][ix]
-                    if color_pair > 0:
-                        try:
-                            self.stdscr.addstr(map_start_y + 1 + iy, ix + 1, symbol, curses.color_pair(color_pair))
-                        except:
-                            self.stdscr.addstr(map_start_y + 1 + iy, ix + 1, symbol)
-                    else:
-                        try:
-                            self.stdscr.addstr(map_start_y + 1 + iy, ix + 1, symbol)
-                        except:
-                            pass
-                self.stdscr.addstr(map_start_y + 1 + iy, visible_width + 1, "|")
-            
-            # Stats - calcul de position securise
-            stats_y = min(map_start_y + visible_height + 2, term_height - 2)
-            gen1 = armies[0].general.__class__.__name__
-            gen2 = armies[1].general.__class__.__name__
-            alive1 = self._count_alive(armies[0])
-            total1 = getattr(armies[0], 'initial_count', len(armies[0].units))
-            pct1 = (alive1 / total1 * 100) if total1 > 0 else 0
-            alive2 = self._count_alive(armies[1])
-            total2 = getattr(armies[1], 'initial_count', len(armies[1].units))
-            pct2 = (alive2 / total2 * 100) if total2 > 0 else 0
-            
-            stats = f"[{gen1}]: {alive1}/{total1} ({pct1:.0f}%) | [{gen2}]: {alive2}/{total2} ({pct2:.0f}%)"
-            if stats_y < term_height:
-                self.stdscr.addstr(stats_y, 0, stats[:term_width-1])
-            
-            # Messages persistants
-            msg_y = stats_y + 1
-            for msg, _ in self.message_queue:
-                if msg_y < term_height - 1:
+            self.draw_map()
+            self.draw_units(armies)
+            self.draw_ui(armies, time_elapsed, paused, speed_multiplier)
+            self.flip()
+        except Exception as e:
+            pass  # Silencieusement ignorer les erreurs de rendu curses
+
+    def draw_map(self):
+        """Efface l'ecran, recalcule la zone visible et dessine la grille (obstacles)."""
+        self.stdscr.clear()
+        term_height, term_width = self.stdscr.getmaxyx()
+
+        # Adapter dynamiquement les dimensions d'affichage a la taille du terminal
+        # Reserver: header(1) + controles(1) + position(1) + bordure_haut(1) + bordure_bas(1) + stats(2) + marge(1) = 8 lignes
+        reserved_lines = 8
+        available_height = max(5, term_height - reserved_lines)
+        available_width = max(20, term_width - 4)  # -4 pour les bordures
+
+        # Limiter les dimensions d'affichage
+        self.max_display_width = min(available_width, self.width)
+        self.max_display_height = min(available_height, self.height)
+
+        # Corriger le scroll si nécessaire (après redimensionnement)
+        self.scroll_x = max(0, min(self.scroll_x, self.width - self.max_display_width))
+        self.scroll_y = max(0, min(self.scroll_y, self.height - self.max_display_height))
+
+        # Calculer les dimensions visibles pour ce frame
+        visible_width = min(self.max_display_width, self.width - self.scroll_x)
+        visible_height = min(self.max_display_height, self.height - self.scroll_y)
+
+        map_start_y = 4
+        # Partage avec draw_units / draw_ui pour ce frame
+        self._frame = (term_height, term_width, visible_width, visible_height, map_start_y)
+
+        # Afficher la grille
+        grid = [[self.SYMBOL_EMPTY for _ in range(visible_width)] for _ in range(visible_height)]
+        grid_colors = [[0 for _ in range(visible_width)] for _ in range(visible_height)]  # 0 = aucune couleur
+
+        # Obstacles
+        for type_name, x, y in self.map.obstacles:
+            ix, iy = int(x) - self.scroll_x, int(y) - self.scroll_y
+            if 0 <= ix < visible_width and 0 <= iy < visible_height:
+                if type_name == "Tree":
+                    grid[iy][ix] = self.SYMBOL_TREE
+                    grid_colors[iy][ix] = 3  # Couleur verte
+                elif type_name == "Rock":
+                    grid[iy][ix] = self.SYMBOL_ROCK
+                    grid_colors[iy][ix] = 4  # Couleur grise
+
+        # Afficher la bordure et la grille
+        self.stdscr.addstr(map_start_y, 0, "+" + "-" * visible_width + "+")
+        for iy, row in enumerate(grid):
+            for ix, symbol in enumerate(row):
+                color_pair = grid_colors[iy][ix]
+                if color_pair > 0:
                     try:
-                        msg_str = str(msg)
-                        msg_display = msg_str[:term_width-1] if len(msg_str) <= term_width-1 else msg_str[:term_width-2]
-                        self.stdscr.addstr(msg_y, 0, msg_display)
+                        self.stdscr.addstr(map_start_y + 1 + iy, ix + 1, symbol, curses.color_pair(color_pair))
+                    except:
+                        self.stdscr.addstr(map_start_y + 1 + iy, ix + 1, symbol)
+                else:
+                    try:
+                        self.stdscr.addstr(map_start_y + 1 + iy, ix + 1, symbol)
                     except:
                         pass
-                    msg_y += 1
-            
-            self.stdscr.refresh()
-        except Exception as e:
-            pass  # Silencieusement ignorer les erreurs de rendu curses
-    
+            self.stdscr.addstr(map_start_y + 1 + iy, visible_width + 1, "|")
+
+    def draw_units(self, armies: list[Army]):
+        """Dessine les unites visibles par-dessus la grille de draw_map."""
+        _, _, visible_width, visible_height, map_start_y = self._frame
+        for army in armies:
+            color_pair = 1 if army.army_id == 0 else 2  # Bleu ou Rouge
+            for unit in army.units:
+                if not unit.is_alive:
+                    continue
+                ix = int(unit.pos[0]) - self.scroll_x
+                iy = int(unit.pos[1]) - self.scroll_y
+                if 0 <= ix < visible_width and 0 <= iy < visible_height:
+                    symbol = self._get_unit_symbol(unit)
+                    try:
+                        self.stdscr.addstr(map_start_y + 1 + iy, ix + 1, symbol, curses.color_pair(color_pair))
+                    except:
+                        self.stdscr.addstr(map_start_y + 1 + iy, ix + 1, symbol)
+
+    def draw_ui(self, armies: list[Army], time_elapsed: float, paused: bool, speed_multiplier: float):
+        """En-tete, controles, stats des armees et messages persistants."""
+        term_height, term_width, _, visible_height, map_start_y = self._frame
+
+        # Ligne 0: Header
+        status = "PAUSE" if paused else "EN COURS"
+        header = f"=== TEMPS {time_elapsed:.1f}s === [{status}] === x{speed_multiplier:.1f} ==="
+        self.stdscr.addstr(0, 0, header[:term_width-1], curses.A_BOLD)
+
+        # Ligne 1: Controles
+        controls = "[P/ESPACE] Pause | [TAB] Infos | [ZQSD] Scroll | [Esc] Quitter"
+        self.stdscr.addstr(1, 0, controls[:term_width-1])
+
+        # Ligne 2: Position et dimensions
+        pos_info = f"Position: ({self.scroll_x}, {self.scroll_y}) | Affichage: {self.max_display_width}x{self.max_display_height}"
+        self.stdscr.addstr(2, 0, pos_info[:term_width-1])
+
+        # Stats - calcul de position securise
+        stats_y = min(map_start_y + visible_height + 2, term_height - 2)
+        gen1 = armies[0].general.__class__.__name__
+        gen2 = armies[1].general.__class__.__name__
+        alive1 = self._count_alive(armies[0])
+        total1 = getattr(armies[0], 'initial_count', len(armies[0].units))
+        pct1 = (alive1 / total1 * 100) if total1 > 0 else 0
+        alive2 = self._count_alive(armies[1])
+        total2 = getattr(armies[1], 'initial_count', len(armies[1].units))
+        pct2 = (alive2 / total2 * 100) if total2 > 0 else 0
+
+        stats = f"[{gen1}]: {alive1}/{total1} ({pct1:.0f}%) | [{gen2}]: {alive2}/{total2} ({pct2:.0f}%)"
+        if stats_y < term_height:
+            self.stdscr.addstr(stats_y, 0, stats[:term_width-1])
+
+        # Messages persistants
+        msg_y = stats_y + 1
+        for msg, _ in self.message_queue:
+            if msg_y < term_height - 1:
+                try:
+                    msg_str = str(msg)
+                    msg_display = msg_str[:term_width-1] if len(msg_str) <= term_width-1 else msg_str[:term_width-2]
+                    self.stdscr.addstr(msg_y, 0, msg_display)
+                except:
+                    pass
+                msg_y += 1
+
+    def flip(self):
+        """Envoie le frame au terminal."""
+        self.stdscr.refresh()
+
     def _render_fallback(self, armies: list[Army], time_elapsed: float, paused: bool, speed_multiplier: float):
         """Fallback vers le rendu ANSI si curses indisponible."""
         os.system('cls' if os.name == 'nt' else 'clear')